@@ -0,0 +1,93 @@
+"""
+Compare the size and read times of prepared gridadmin datasets per layout.
+
+Writes 2M elements of id, s1, kcu and a (4, n) coords array with every
+layout of ``admin.utils.get_dataset_layout`` and times a full read of all
+datasets and 200 id-range reads of 1000 elements.
+
+Usage::
+
+    python benchmarks/dataset_layout.py [n_elements]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+from threedigrid.admin import constants
+from threedigrid.admin.utils import create_dataset
+
+N_RANGE_READS = 200
+RANGE_LENGTH = 1000
+
+
+def make_data(count):
+    rng = np.random.default_rng(0)
+    return {
+        "id": np.arange(count, dtype=np.int32),
+        "s1": rng.normal(size=count),
+        "kcu": rng.integers(0, 10, count).astype(np.int32),
+        "coords": np.cumsum(rng.normal(size=(4, count)), axis=1),
+    }
+
+
+def write(path, data, compression):
+    with h5py.File(path, "w") as h5:
+        for name, values in data.items():
+            create_dataset(h5, name, data=values, compression=compression)
+
+
+def time_reads(path, count):
+    starts = np.random.default_rng(1).integers(0, count - RANGE_LENGTH, N_RANGE_READS)
+    with h5py.File(path, "r") as h5:
+        datasets = list(h5.values())
+        t0 = time.perf_counter()
+        for dataset in datasets:
+            dataset[...]
+        full = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for start in starts:
+            for dataset in datasets:
+                dataset[..., start : start + RANGE_LENGTH]
+        ranges = time.perf_counter() - t0
+    return full, ranges
+
+
+def main(count):
+    data = make_data(count)
+    layouts = [
+        ("contiguous", None, constants.DATASET_CHUNK_BYTES),
+        ("chunked, gzip 1", "gzip", constants.DATASET_CHUNK_BYTES),
+        ("chunked, lzf", "lzf", constants.DATASET_CHUNK_BYTES),
+        ("1 MiB chunks, gzip 1", "gzip", 2**20),
+    ]
+    chunk_bytes = constants.DATASET_CHUNK_BYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compression, layout_chunk_bytes in layouts:
+            path = os.path.join(tmp, "gridadmin.h5")
+            constants.DATASET_CHUNK_BYTES = layout_chunk_bytes
+            try:
+                write(path, data, compression)
+            finally:
+                constants.DATASET_CHUNK_BYTES = chunk_bytes
+            full, ranges = time_reads(path, count)
+            print(
+                "{:<22} {:6.1f} MB, full read {:5.0f} ms, "
+                "{} range reads {:5.0f} ms".format(
+                    label + ":",
+                    os.path.getsize(path) / 1e6,
+                    full * 1000,
+                    N_RANGE_READS,
+                    ranges * 1000,
+                )
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2 * 10**6)
@@ -0,0 +1,88 @@
+"""
+Compare Model.to_list with the implementation it replaced.
+
+Writes a gridadmin file with n lines (id, kcu, dpumax and the 2D ``line``
+field) and times the old and the current ``to_list`` on id, kcu and
+dpumax. The current implementation is also timed with the ``line`` field
+added, which the old one could not combine with the 1D fields.
+
+Usage::
+
+    python benchmarks/to_list.py [n_lines]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+from threedigrid.admin.gridadmin import GridH5Admin
+
+N_RUNS = 3
+
+
+def old_to_list(model):
+    """Model.to_list before it built the records per column"""
+    selection = model.to_dict()
+    if len(list(selection.values())) > 1:
+        array = np.array(list(selection.values()))
+    else:
+        array = list(selection.values())[0]
+
+    def optional_zip(array_to_zip):
+        array_as_list = array_to_zip.tolist()
+        if len(array_to_zip.shape) > 1:
+            array_as_list = zip(*array_as_list)
+        return array_as_list
+
+    data = zip(*[optional_zip(x) for x in array])
+    return [dict(zip(list(selection.keys()), x)) for x in data]
+
+
+def write(path, count):
+    rng = np.random.default_rng(0)
+    with h5py.File(path, "w") as h5:
+        h5.attrs["epsg_code"] = "28992"
+        h5.attrs["has_1d"] = 1
+        h5.attrs["has_2d"] = 1
+        h5.create_group("meta")
+        lines = h5.create_group("lines")
+        lines.create_dataset("id", data=np.arange(count, dtype=np.int32))
+        lines.create_dataset("kcu", data=rng.integers(0, 10, count))
+        lines.create_dataset("dpumax", data=rng.normal(size=count))
+        lines.create_dataset("line", data=rng.integers(0, count, (2, count)))
+
+
+def best_of(func):
+    timings = []
+    for _ in range(N_RUNS):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gridadmin.h5")
+        write(path, count)
+        with GridH5Admin(path) as ga:
+            lines = ga.lines.only("id", "kcu", "dpumax")
+            assert old_to_list(lines) == lines.to_list()
+            benchmarks = [
+                ("old to_list", lambda: old_to_list(lines)),
+                ("new to_list", lines.to_list),
+                (
+                    "new to_list + line",
+                    ga.lines.only("id", "kcu", "dpumax", "line").to_list,
+                ),
+            ]
+            for label, func in benchmarks:
+                print("{:<20} {:6.2f} s".format(label + ":", best_of(func)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
@@ -4,6 +4,7 @@ from itertools import count
 from unittest import mock
 
 import h5py
+import numpy as np
 import pytest
 
 from threedigrid.admin.constants import TYPE_CODE_MAP
@@ -115,3 +116,194 @@ def h5py_file_mapper(mocked_id_map, h5py_file, threedi_datasource):
     mocked_id_map.return_value = id_map
     IdMapper.prepare_mapper(h5py_file, threedi_datasource)
     return h5py_file, threedi_datasource
+
+
+@pytest.fixture
+def synthetic_gridadmin_path(tmpdir):
+    """Create a small gridadmin file with 2D cells and 1D lines
+
+    The cells form a 4x4 lattice of 10m cells (refinement level 1) with one
+    20m cell (refinement level 2) in the upper right corner. Element 0 is the
+    trash element, like in real gridadmin files.
+    """
+    file_name = str(tmpdir.join("synthetic_gridadmin.h5"))
+    # (nodk, nodm, nodn) of the 2D cells
+    cells = [(1, m, n) for n in range(1, 5) for m in range(1, 5) if m < 3 or n < 3]
+    cells.append((2, 2, 2))
+    n2dtot = len(cells)
+    nodk, nodm, nodn = (np.array([0] + list(x), dtype=np.int32) for x in zip(*cells))
+    size = 4 * 2 ** np.maximum(nodk - 1, 0)  # in pixels of 2.5 m
+    pixel_coords = np.array(
+        [(nodm - 1) * size, (nodn - 1) * size, nodm * size, nodn * size],
+        dtype=np.int32,
+    )
+    pixel_coords[:, 0] = -9999
+    cell_coords = pixel_coords * 2.5 + np.array([[1000.0], [2000.0]] * 2)
+    cell_coords[:, 0] = -9999.0
+    coordinates = np.array(
+        [
+            (cell_coords[0] + cell_coords[2]) / 2,
+            (cell_coords[1] + cell_coords[3]) / 2,
+        ]
+    )
+
+    line_count = 6
+    line_coords = np.array(
+        [np.arange(line_count) * 10.0 + x for x in (1000, 2000, 1005, 2005)]
+    )
+    line_geometries = np.empty(line_count, dtype=object)
+    for i in range(line_count):
+        n_vertices = i % 3 + 2
+        line_geometries[i] = np.concatenate(
+            [np.arange(n_vertices) + 1000.0 + i, np.arange(n_vertices) + 2000.0 + i]
+        )
+    with h5py.File(file_name, "w") as h5:
+        h5.attrs["epsg_code"] = "28992"
+        h5.attrs["model_name"] = "synthetic"
+        h5.attrs["model_slug"] = "synthetic-1"
+        h5.attrs["revision_nr"] = 1
+        h5.attrs["revision_hash"] = "abc"
+        h5.attrs["has_1d"] = 1
+        h5.attrs["has_2d"] = 1
+        meta = h5.create_group("meta")
+        meta.create_dataset("n2dtot", data=n2dtot)
+        nodes = h5.create_group("nodes")
+        nodes.create_dataset("id", data=np.arange(n2dtot + 1, dtype=np.int32))
+        nodes.create_dataset("node_type", data=np.array([-9999] + [1] * n2dtot))
+        nodes.create_dataset("pixel_coords", data=pixel_coords)
+        nodes.create_dataset("pixel_width", data=np.append(0, size[1:]))
+        nodes.create_dataset("cell_coords", data=cell_coords)
+        nodes.create_dataset("coordinates", data=coordinates)
+        grid = h5.create_group("grid_coordinate_attributes")
+        grid.create_dataset("nodk", data=nodk)
+        grid.create_dataset("nodm", data=nodm)
+        grid.create_dataset("nodn", data=nodn)
+        grid.create_dataset("dx", data=np.array([10.0, 20.0]))
+        grid.create_dataset("dxp", data=2.5)
+        grid.create_dataset("x0p", data=1000.0)
+        grid.create_dataset("y0p", data=2000.0)
+        lines = h5.create_group("lines")
+        lines.create_dataset("id", data=np.arange(line_count, dtype=np.int32))
+        lines.create_dataset("kcu", data=np.array([-9999, 1, 1, 2, 100, 101]))
+        lines.create_dataset("dpumax", data=np.linspace(0.0, 1.0, line_count))
+        lines.create_dataset(
+            "content_type",
+            data=np.array([b"", b"v2_channel", b"v2_pipe", b"v2_weir", b"", b""]),
+        )
+        lines.create_dataset("content_pk", data=np.array([0, 1, 1, 2, 0, 0]))
+        lines.create_dataset(
+            "line", data=np.array([[0, 1, 2, 3, 1, 5], [0, 2, 3, 4, 5, 9]])
+        )
+        lines.create_dataset("line_coords", data=line_coords)
+        lines.create_dataset(
+            "line_geometries",
+            data=line_geometries,
+            dtype=h5py.vlen_dtype(np.dtype("float64")),
+        )
+    return file_name
+
+
+@pytest.fixture
+def synthetic_ga(synthetic_gridadmin_path):
+    with GridH5Admin(synthetic_gridadmin_path) as ga:
+        yield ga
+
+
+@pytest.fixture
+def synthetic_results_path(synthetic_gridadmin_path, tmpdir):
+    """Create a result file with 2D node timeseries for the synthetic gridadmin
+
+    The results are stored in reversed node order, s1 of node n at timestep t
+    is t + n / 100.
+    """
+    file_name = str(tmpdir.join("synthetic_results.nc"))
+    with h5py.File(synthetic_gridadmin_path, "r") as h5:
+        n2dtot = int(h5["meta"]["n2dtot"][()])
+    time = np.arange(25) * 60.0
+    node_ids = np.arange(n2dtot, 0, -1, dtype=np.int32)
+    with h5py.File(file_name, "w") as nc:
+        nc.create_dataset("time", data=time)
+        nc.create_dataset("Mesh2DNode_id", data=node_ids)
+        nc.create_dataset("Mesh2D_s1", data=np.arange(25)[:, None] + node_ids / 100)
+        nc.create_dataset("Mesh2D_vol", data=np.ones((25, n2dtot)))
+    return file_name
+
+
+@pytest.fixture
+def synthetic_gr(synthetic_gridadmin_path, synthetic_results_path):
+    with GridH5ResultAdmin(synthetic_gridadmin_path, synthetic_results_path) as gr:
+        yield gr
+
+
+def _to_char_array(values, length=32):
+    """Space padded (Fortran) character array"""
+    return (
+        np.array([list(x.ljust(length).encode()) for x in values], dtype=np.uint8)
+        .view("S1")
+        .reshape(len(values), length)
+    )
+
+
+@pytest.fixture
+def synthetic_structure_control_path(tmpdir):
+    """Create a structure control actions file for the synthetic gridadmin
+
+    The table controls act on a weir (line 3) and a pump (grid_id 2), the
+    memory control acts on the pipe (line 2) and there are no timed controls.
+    """
+    file_name = str(tmpdir.join("structure_control_actions_3di.nc"))
+    controls = {
+        "table_control": [
+            ("weir_b", 3, 0.0, "set_crest_level", 1.0, 0.0, 1),
+            ("pump_a", 2, 0.0, "set_pump_capacity", 0.5, 0.0, 1),
+            ("weir_b", 3, 60.0, "set_crest_level", -0.5, 0.0, 0),
+            ("pump_a", 2, 120.0, "set_pump_capacity", 0.0, 0.0, 1),
+        ],
+        "memory_control": [("pipe", 2, 30.0, "set_discharge_coefficients", 1, 2, 1)],
+        "timed_control": [],
+    }
+    with h5py.File(file_name, "w") as nc:
+        for control_type, rows in controls.items():
+            columns = list(zip(*rows)) or [[]] * 7
+            nc.create_dataset(f"{control_type}_id", data=_to_char_array(columns[0]))
+            nc.create_dataset(
+                f"{control_type}_grid_id", data=np.array(columns[1], dtype=np.int32)
+            )
+            nc.create_dataset(f"{control_type}_time", data=np.array(columns[2]))
+            nc.create_dataset(
+                f"{control_type}_action_type", data=_to_char_array(columns[3])
+            )
+            nc.create_dataset(
+                f"{control_type}_action_value_1", data=np.array(columns[4], dtype=float)
+            )
+            nc.create_dataset(
+                f"{control_type}_action_value_2", data=np.array(columns[5], dtype=float)
+            )
+            nc.create_dataset(
+                f"{control_type}_is_active", data=np.array(columns[6], dtype=np.int32)
+            )
+    return file_name
+
+
+@pytest.fixture
+def synthetic_water_quality_path(synthetic_gridadmin_path, tmpdir):
+    """Create a water quality result file for the synthetic gridadmin
+
+    The nodes are stored in reversed order, the concentration of substance s
+    at node n and timestep t is s * 1000 + t + n / 100.
+    """
+    file_name = str(tmpdir.join("water_quality_results_3di.nc"))
+    with h5py.File(synthetic_gridadmin_path, "r") as h5:
+        n2dtot = int(h5["meta"]["n2dtot"][()])
+    node_ids = np.arange(n2dtot, 0, -1, dtype=np.int32)
+    with h5py.File(file_name, "w") as nc:
+        nc.create_dataset("time", data=np.arange(25) * 60.0)
+        nc.create_dataset("Mesh2DNode_id", data=node_ids)
+        for substance in (1, 2, 10):
+            dataset = nc.create_dataset(
+                f"substance{substance}_2D",
+                data=substance * 1000 + np.arange(25)[:, None] + node_ids / 100,
+            )
+            dataset.attrs["substance_name"] = f"test{substance}".encode()
+            dataset.attrs["units"] = b"kg/m3"
+    return file_name
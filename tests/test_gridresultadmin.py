@@ -229,3 +229,31 @@ def test_gr_chain_filter(gr):
 #     assert hasattr(gr.nodes, 'vol')
 #     assert gr.nodes.s1.shape[0] > 0
 #     assert gr.nodes.vol.shape[0] > 0
+
+
+def test_get_timeseries_stats(synthetic_gr: GridH5ResultAdmin):
+    nodes = synthetic_gr.nodes
+    stats = nodes.get_timeseries_stats(
+        {"s1_max": ("s1", "max"), "s1_mean": ("s1", "mean"), "vol_sum": ("vol", "sum")},
+        chunk_size=7,
+    )
+    assert list(stats) == ["s1_max", "s1_mean", "vol_sum"]
+    s1 = synthetic_gr.netcdf_file["Mesh2D_s1"][:]
+    # results are stored in reversed node order
+    np.testing.assert_allclose(stats["s1_max"][1:], s1.max(axis=0)[::-1])
+    np.testing.assert_allclose(stats["s1_mean"][1:], s1.mean(axis=0)[::-1])
+    np.testing.assert_allclose(stats["vol_sum"][1:], 25.0)
+
+
+def test_get_timeseries_stats_filtered(synthetic_gr: GridH5ResultAdmin):
+    nodes = synthetic_gr.nodes.filter(id__in=[1, 3]).timeseries(
+        start_time=60, end_time=300
+    )
+    stats = nodes.get_timeseries_stats({"min": ("s1", "min"), "max": ("s1", "max")})
+    np.testing.assert_allclose(stats["min"], [1.01, 1.03])
+    np.testing.assert_allclose(stats["max"], [5.01, 5.03])
+
+
+def test_get_timeseries_stats_unknown_statistic(synthetic_gr: GridH5ResultAdmin):
+    with pytest.raises(ValueError):
+        synthetic_gr.nodes.get_timeseries_stats({"s1_p90": ("s1", "p90")})
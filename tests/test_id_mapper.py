@@ -1,5 +1,8 @@
 from unittest import mock
 
+import numpy as np
+import pytest
+
 from threedigrid.admin.constants import TYPE_CODE_MAP
 from threedigrid.admin.idmapper import IdMapper
 
@@ -24,3 +27,21 @@ def test_init_idMapper(mocked_id_map, h5py_file, threedi_datasource):
     mapper = IdMapper(h5py_file["mappings"]["id_map"])
     assert mapper.get_by_code(TYPE_CODE_MAP["v2_channel"]).size == NODE_LENGTH
     assert mapper.get_by_name("v2_channel").size == NODE_LENGTH
+
+
+def test_id_mapper_get_pks_and_seq_ids():
+    id_mapping = np.array(
+        [(2, 21, 3), (1, 10, 2), (2, 20, 1), (1, 11, 1)],
+        dtype=[("obj_code", "i4"), ("pk", "i4"), ("seq_id", "i4")],
+    )
+    mapper = IdMapper(id_mapping)
+
+    assert mapper.obj_slices == {1: slice(0, 2), 2: slice(2, 4)}
+    np.testing.assert_array_equal(mapper.get_pks("v2_channel", [3, 1, 5]), [21, 20, 0])
+    np.testing.assert_array_equal(
+        mapper.get_seq_ids("v2_pipe", [10, 11, 12], fill_value=-1), [2, 1, -1]
+    )
+    np.testing.assert_array_equal(mapper.get_pks("v2_weir", [1, 2]), [0, 0])
+    assert mapper.get_pk("v2_pipe", 2) == 10
+    with pytest.raises(IndexError):
+        mapper.get_pk("v2_pipe", 3)
@@ -0,0 +1,277 @@
+import numpy as np
+import pytest
+
+from threedigrid.admin import h5py_datasource
+from threedigrid.admin.gridadmin import GridH5Admin
+from threedigrid.admin.nodes.models import create_nodgrid
+from threedigrid.geo_utils import transform_xys
+from threedigrid.orm.models import Model
+
+
+def test_to_list(synthetic_ga):
+    records = synthetic_ga.lines.only("id", "kcu", "line_coords").to_list()
+    assert len(records) == 6
+    assert records[1] == {
+        "id": 1,
+        "kcu": 1,
+        "line_coords": (1010.0, 2010.0, 1015.0, 2015.0),
+    }
+
+
+def test_to_list_single_field(synthetic_ga):
+    records = synthetic_ga.lines.only("kcu").to_list()
+    assert [x["kcu"] for x in records] == [-9999, 1, 1, 2, 100, 101]
+
+
+def test_to_list_keeps_dtypes(synthetic_ga):
+    records = synthetic_ga.lines.only("id", "dpumax", "content_type").to_list()
+    assert isinstance(records[2]["id"], int)
+    assert isinstance(records[2]["dpumax"], float)
+    assert records[2]["content_type"] == b"v2_pipe"
+
+
+def test_to_list_filtered(synthetic_ga):
+    records = synthetic_ga.lines.filter(kcu__in=[100, 101]).only("id", "kcu").to_list()
+    assert records == [{"id": 4, "kcu": 100}, {"id": 5, "kcu": 101}]
+
+
+def test_iter_records_chunks(synthetic_ga):
+    lines = synthetic_ga.lines.only("id", "line_coords", "line_geometries")
+    records = list(lines.iter_records(chunk_size=4))
+    assert [x["id"] for x in records] == list(range(6))
+    for record, expected in zip(records, lines.to_list()):
+        assert record["line_coords"] == expected["line_coords"]
+        np.testing.assert_array_equal(
+            record["line_geometries"], expected["line_geometries"]
+        )
+
+
+def test_to_structured_array_as_records(synthetic_ga):
+    lines = synthetic_ga.lines.only("id", "kcu", "line_coords", "content_type")
+    records = lines.to_structured_array(as_records=True)
+    assert records.shape == (6,)
+    assert set(records.dtype.names) == {
+        "content_type",
+        "id",
+        "kcu",
+        "line_coords_x1",
+        "line_coords_y1",
+        "line_coords_x2",
+        "line_coords_y2",
+    }
+    data = lines.data
+    np.testing.assert_array_equal(records["kcu"], data["kcu"])
+    np.testing.assert_array_equal(records["line_coords_y2"], data["line_coords"][3])
+    assert records[2]["content_type"] == b"v2_pipe"
+
+
+def test_to_structured_array_as_records_empty(synthetic_ga, tmpdir):
+    file_name = str(tmpdir.join("lines.npy"))
+    fields = ("id", "kcu", "line_coords", "line")
+    lines = synthetic_ga.lines.filter(id=-5).only(*fields)
+    records = lines.to_structured_array(as_records=True, file_name=file_name)
+    expected = synthetic_ga.lines.only(*fields).to_structured_array(as_records=True)
+    assert records.shape == (0,)
+    assert records.dtype == expected.dtype
+    assert records["id"].size == 0
+    assert np.load(file_name, mmap_mode="r").dtype == expected.dtype
+
+
+def test_to_structured_array_as_records_subarray(synthetic_ga):
+    lines = synthetic_ga.lines.only("id", "line")
+    records = lines.to_structured_array(as_records=True)
+    assert records.dtype["line"].shape == (2,)
+    np.testing.assert_array_equal(records["line"], lines.line.T)
+
+
+def test_to_structured_array_as_records_memmap(synthetic_ga, tmpdir):
+    file_name = str(tmpdir.join("cells.npy"))
+    cells = synthetic_ga.cells.only("id", "coordinates")
+    records = cells.to_structured_array(as_records=True, file_name=file_name)
+    shared = np.load(file_name, mmap_mode="r")
+    assert isinstance(shared, np.memmap)
+    np.testing.assert_array_equal(shared, records)
+    np.testing.assert_array_equal(shared["coordinates_x"], cells.coordinates[0])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 100])
+def test_iter_chunks(synthetic_ga, chunk_size):
+    lines = synthetic_ga.lines
+    chunks = list(lines.iter_chunks(chunk_size))
+    assert len(chunks) == -(-lines.count // chunk_size)
+    for name in ("id", "line_coords", "line_geometries"):
+        values = [getattr(chunk, name) for chunk in chunks]
+        if name == "line_geometries":
+            for value, expected in zip(np.concatenate(values), getattr(lines, name)):
+                np.testing.assert_array_equal(value, expected)
+        else:
+            np.testing.assert_array_equal(
+                np.concatenate(values, axis=-1), getattr(lines, name)
+            )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_iter_chunks_filtered(synthetic_ga, chunk_size):
+    lines = synthetic_ga.lines.filter(kcu__in=[1, 100])
+    chunks = list(lines.iter_chunks(chunk_size))
+    np.testing.assert_array_equal(
+        np.concatenate([chunk.id for chunk in chunks]), lines.id
+    )
+    np.testing.assert_array_equal(
+        np.concatenate([chunk.line for chunk in chunks], axis=-1), lines.line
+    )
+    assert sum(chunk.count for chunk in chunks) == lines.count
+
+
+def test_iter_chunks_sliced(synthetic_ga):
+    nodes = synthetic_ga.nodes.slice(2, 9)
+    chunks = list(nodes.iter_chunks(3))
+    assert [chunk.count for chunk in chunks] == [3, 3, 1]
+    np.testing.assert_array_equal(
+        np.concatenate([chunk.coordinates for chunk in chunks], axis=-1),
+        nodes.coordinates,
+    )
+
+
+@pytest.mark.parametrize("order", [None, "morton"])
+def test_cells_iter_by_tile(synthetic_ga, order):
+    cells = synthetic_ga.cells.subset("2D_ALL")
+    tiles = list(cells.iter_by_tile(8, 8, order=order))
+    bboxes = [x[0] for x in tiles]
+    if order is None:
+        assert bboxes == [(0, 0, 8, 8), (0, 8, 8, 16), (8, 0, 16, 8), (8, 8, 16, 16)]
+    else:
+        assert bboxes == [(0, 0, 8, 8), (8, 0, 16, 8), (0, 8, 8, 16), (8, 8, 16, 16)]
+    for bbox, tile_cells in tiles:
+        x1, y1, x2, y2 = bbox
+        expected = cells.filter(
+            pixel_coords__intersects_bbox=(x1 + 1, y1 + 1, x2 - 1, y2 - 1)
+        )
+        np.testing.assert_array_equal(tile_cells.id, expected.id)
+    assert sum(x[1].count for x in tiles) == cells.count
+
+
+def test_cells_get_ids_from_xys(synthetic_ga):
+    cells = synthetic_ga.cells
+    xs = np.array([1001.0, 1035.0, 1010.0, 1040.0, 1050.0])
+    ys = np.array([2001.0, 2035.0, 2005.0, 2040.0, 2000.0])
+    ids = cells.get_ids_from_xys(xs, ys)
+    # on the edge between two cells the cell with the larger x is used, the
+    # upper right corner of the model is in the large cell
+    assert ids.tolist() == [1, 13, 2, 13, 0]
+    for x, y, id in zip(xs[:2], ys[:2], ids):
+        assert cells.get_id_from_xy(x, y) == [id]
+
+
+def test_reprojection_is_cached(synthetic_ga, monkeypatch):
+    h5py_datasource.clear_reprojection_cache()
+    nodes = synthetic_ga.nodes.reproject_to("4326")
+    coordinates = nodes.filter(id__in=[2, 5]).coordinates
+    raw = synthetic_ga.nodes.filter(id__in=[2, 5]).coordinates
+    np.testing.assert_allclose(
+        coordinates, transform_xys(raw[0], raw[1], "28992", "4326")
+    )
+    coordinates[:] = 0  # results are not views on the cache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("not cached")
+
+    # other instances and filters reuse the cached reprojection
+    monkeypatch.setattr(Model, "_do_reproject_value", fail)
+    np.testing.assert_allclose(
+        synthetic_ga.nodes.reproject_to("4326").filter(id__in=[5, 2]).coordinates,
+        transform_xys(raw[0], raw[1], "28992", "4326"),
+    )
+    with pytest.raises(AssertionError):
+        synthetic_ga.nodes.reproject_to("3857").coordinates
+
+
+def test_reprojection_not_cached_for_writable_files(synthetic_gridadmin_path):
+    h5py_datasource.clear_reprojection_cache()
+    with GridH5Admin(synthetic_gridadmin_path, file_modus="r+") as ga:
+        ga.lines.reproject_to("4326").line_geometries
+    assert len(h5py_datasource._reprojection_cache) == 0
+
+
+def _nodgrid_loop(pixel_coords, ids, width, height, offset_i, offset_j):
+    """Reference: burn the cells one by one, the last cell wins"""
+    grid_arr = np.zeros((height, width), dtype=np.int32)
+    for id in ids:
+        i0 = max(pixel_coords[0, id], offset_i) - offset_i
+        i1 = min(pixel_coords[2, id], offset_i + width) - offset_i
+        j0 = max(pixel_coords[1, id], offset_j) - offset_j
+        j1 = min(pixel_coords[3, id], offset_j + height) - offset_j
+        if i1 > i0 and j1 > j0:
+            grid_arr[j0:j1, i0:i1] = id
+    return grid_arr
+
+
+def _pixel_map_loop(grid, dem_pixelsize, dem_shape):
+    """Reference: the per cell slice loop of Grid.get_pixel_map"""
+    grid_arr = np.zeros(dem_shape, dtype=np.int64)
+    _k = grid.nodk[0 : grid.n2dtot + 1] - 1
+    _m = grid.nodm[0 : grid.n2dtot + 1] - 1
+    _n = grid.nodn[0 : grid.n2dtot + 1] - 1
+    _size = grid.dx[_k] / dem_pixelsize
+    for idx in range(grid.n2dtot + 1):
+        n0, n1 = int(_n[idx] * _size[idx]), int(_n[idx] * _size[idx] + _size[idx])
+        m0, m1 = int(_m[idx] * _size[idx]), int(_m[idx] * _size[idx] + _size[idx])
+        grid_arr[max(n0, 0) : max(n1, 0), max(m0, 0) : max(m1, 0)] = idx
+    return grid_arr[::-1, ::]
+
+
+@pytest.mark.parametrize(
+    # width, height, offset_i, offset_j
+    "window",
+    [(16, 16, 0, 0), (20, 14, -3, -5), (8, 4, 5, 7), (4, 4, 16, 16)],
+)
+def test_create_nodgrid_matches_loop(synthetic_ga, window):
+    pixel_coords = synthetic_ga.cells.pixel_coords
+    count = pixel_coords.shape[1]
+    # add boxes that overlap the cells, of other sizes and off their lattice
+    pixel_coords = np.concatenate(
+        [
+            pixel_coords,
+            pixel_coords[:, 1:] + np.array([[2], [3], [2], [3]]),
+            np.array([[1, 6, 0], [2, 1, 5], [9, 7, 16], [6, 15, 9]]),
+        ],
+        axis=1,
+    )
+    ids = np.random.default_rng(0).permutation(pixel_coords.shape[1])
+    assert ids.size > 2 * count
+
+    expected = _nodgrid_loop(pixel_coords, ids, *window)
+    np.testing.assert_array_equal(create_nodgrid(pixel_coords, ids, *window), expected)
+    out = np.full((window[1], window[0]), 99, dtype=np.int32)
+    assert create_nodgrid(pixel_coords, ids, *window, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+
+
+@pytest.mark.parametrize("pix_bbox", [(0, 0, 16, 16), (-4, 2, 12, 20), (4, 4, 8, 8)])
+def test_cells_get_nodgrid_matches_loop(synthetic_ga, pix_bbox):
+    cells = synthetic_ga.cells
+    ids = cells.get_ids_from_pix_bbox(pix_bbox)
+    width, height = pix_bbox[2] - pix_bbox[0], pix_bbox[3] - pix_bbox[1]
+    expected = _nodgrid_loop(
+        cells.pixel_coords, ids, width, height, pix_bbox[0], pix_bbox[1]
+    )[::-1]
+    assert expected.any()
+    np.testing.assert_array_equal(cells.get_nodgrid(pix_bbox), expected)
+    out = np.full((height, width), 99, dtype=np.int32)
+    np.testing.assert_array_equal(cells.get_nodgrid(pix_bbox, out=out), expected)
+
+
+@pytest.mark.parametrize(
+    "dem_pixelsize,dem_shape",
+    [(2.5, (16, 16)), (5.0, (8, 8)), (1.25, (40, 24)), (3.0, (10, 7)), (2.5, (9, 20))],
+)
+def test_get_pixel_map_matches_loop(synthetic_ga, dem_pixelsize, dem_shape):
+    grid = synthetic_ga.grid
+    expected = _pixel_map_loop(grid, dem_pixelsize, dem_shape)
+    assert expected.any()
+    result = grid.get_pixel_map(dem_pixelsize, dem_shape)
+    np.testing.assert_array_equal(result, expected)
+    out = np.full(dem_shape, 99, dtype=np.uint8)
+    result = grid.get_pixel_map(dem_pixelsize, dem_shape, out=out)
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(out[::-1], expected)
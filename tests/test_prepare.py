@@ -1,7 +1,15 @@
 import os
+from types import SimpleNamespace
 from unittest import mock
 
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString
+
+from threedigrid.admin.breaches.prepare import PrepareBreaches
 from threedigrid.admin.idmapper import IdMapper
+from threedigrid.admin.lines.prepare import PrepareLines
 from threedigrid.admin.prepare import GridAdminH5Prepare, is_prepared
 
 from .conftest import simple_id_map
@@ -100,3 +108,201 @@ def test_prepare(mocked_id_map, h5py_file, threedi_datasource):
     assert is_prepared(h5py_file, "pumps", "prepared")
     assert is_prepared(h5py_file, "levees", "prepared")
     assert is_prepared(h5py_file, "breaches", "prepared")
+
+
+CUT_GEOMETRY = LineString([(0, 0), (10, 0), (10, 10), (20, 10)])
+
+
+@pytest.mark.parametrize(
+    "start_x,start_y,end_x,end_y,kcu,expected",
+    [
+        # pieces starting on a vertex and snapped (kcu 0) onto the geometry
+        (
+            [0, 4, 10],
+            [0, 1, 5],
+            [4, 10.5, 20],
+            [0, 5, 10],
+            [1, 0, 1],
+            [[0, 4, 0, 0], [4, 10, 10, 0, 0, 5], [10, 10, 20, 5, 10, 10]],
+        ),
+        # no additional calc points
+        ([0], [0], [20], [10], [1], [[0, 10, 10, 20, 0, 0, 10, 10]]),
+        # drawing direction opposite to the calc lines
+        (
+            [20, 10],
+            [10, 5],
+            [10, 0],
+            [5, 0],
+            [1, 1],
+            [[20, 10, 10, 10, 10, 5], [0, 10, 10, 0, 0, 5]],
+        ),
+        # end point beyond the end of the geometry
+        (
+            [-1, 4],
+            [0, 0],
+            [4, 21],
+            [0, 10],
+            [2, 2],
+            [[0, 4, 0, 0], [4, 10, 10, 21, 0, 0, 10, 10]],
+        ),
+    ],
+)
+def test_cut_geometries(start_x, start_y, end_x, end_y, kcu, expected):
+    result = PrepareLines._cut_geometries(
+        CUT_GEOMETRY,
+        np.array(start_x, dtype=float),
+        np.array(start_y, dtype=float),
+        np.array(end_x, dtype=float),
+        np.array(end_y, dtype=float),
+        np.array(kcu),
+    )
+    assert len(result) == len(expected)
+    for geometry, expected_geometry in zip(result, expected):
+        np.testing.assert_array_equal(geometry, expected_geometry)
+
+
+def test_make_line_geometries():
+    def db_object(pk, geom):
+        return SimpleNamespace(pk=pk, the_geom=SimpleNamespace(wkt=geom.wkt))
+
+    other_geometry = LineString([(0, 20), (30, 20)])
+    threedi_datasource = SimpleNamespace(
+        v2_channels=[db_object(1, CUT_GEOMETRY), db_object(2, other_geometry)],
+        v2_culverts=[db_object(1, other_geometry)],
+    )
+    datasource = {
+        "lik": np.arange(7),
+        "kcu": np.array([-9999, 1, 0, 1, 0, 1, 100]),
+        "content_type": np.array(
+            [
+                "",
+                "v2_channel",
+                "v2_channel",
+                "v2_channel",
+                "v2_channel",
+                "v2_culvert",
+                "",
+            ]
+        ),
+        "content_pk": np.array([0, 1, 2, 1, 2, 1, 0]),
+        "line_coords": np.array(
+            [
+                [0, 0, 30, 4, 12, 0, 5],
+                [0, 0, 20, 0, 21, 20, 5],
+                [0, 4, 12, 20, 0, 30, 6],
+                [0, 0, 20, 10, 20, 20, 6],
+            ],
+            dtype=float,
+        ),
+    }
+    line_geometries = PrepareLines.make_line_geometries(datasource, threedi_datasource)
+    expected = [
+        [0, 0, 0, 0],
+        [0, 4, 0, 0],
+        [30, 12, 20, 20],
+        [4, 10, 10, 20, 0, 0, 10, 10],
+        # start and end are swapped after the reversed piece of channel 2
+        [0, 12, 20, 20],
+        [0, 30, 20, 20],
+        [5, 6, 5, 6],
+    ]
+    for geometry, expected_geometry in zip(line_geometries, expected):
+        np.testing.assert_array_equal(geometry, expected_geometry)
+
+
+def test_breaches_get_coordinates():
+    coords = np.empty(4, dtype=object)
+    coords[:] = [
+        np.array([]),  # dummy element
+        np.array([0.0, 10.0, 5.0, 5.0]),  # horizontal levee at y=5
+        np.array([0.0, 10.0, 6.0, 6.0]),  # horizontal levee at y=6
+        np.array([20.0, 20.0, 0.0, 10.0]),  # vertical levee at x=20
+    ]
+    levees = SimpleNamespace(coords=coords)
+    line_coords = np.array(
+        [
+            [0.0, 2.0, 20.0, 15.0, 30.0],
+            [0.0, 0.0, 5.5, 0.0, 0.0],
+            [0.0, 2.0, 0.0, 25.0, 30.0],
+            [0.0, 10.0, 5.5, 0.0, 10.0],
+        ]
+    )
+    levl = np.array([0, 1, 2, 3, 4, 1])
+
+    result = PrepareBreaches.get_coordinates(levees, line_coords, levl)
+
+    # line 1 crosses both horizontal levees, the first levee is used,
+    # line 2 starts on levee 3, line 3 crosses it and line 4 misses all levees
+    np.testing.assert_array_equal(result, [[0, 2, 20, 20, 0, 2], [0, 5, 5.5, 0, 0, 5]])
+
+
+@pytest.mark.parametrize("shapely_version", ["1.8.5", None])
+def test_breaches_get_coordinates_multipoint(monkeypatch, shapely_version):
+    if shapely_version is not None:
+        monkeypatch.setattr(shapely, "__version__", shapely_version)
+    coords = np.empty(2, dtype=object)
+    coords[:] = [
+        np.array([]),  # dummy element
+        np.array([0.0, 10.0, 0.0, 0.0, 5.0, 10.0]),  # levee with a bend
+    ]
+    levees = SimpleNamespace(coords=coords)
+    line_coords = np.array([[0.0, 5.0], [0.0, -1.0], [0.0, 5.0], [0.0, 11.0]])
+    levl = np.array([0, 1])
+
+    result = PrepareBreaches.get_coordinates(levees, line_coords, levl)
+
+    # the line crosses the levee twice, the first point of the intersection
+    # is used
+    np.testing.assert_array_equal(result, [[0, 5], [0, 7.5]])
+
+
+def test_get_1d_object_info():
+    id_mapping = np.array(
+        [(1, 10, 1), (1, 11, 3), (2, 20, 2), (5, 50, 3), (7, 70, 4)],
+        dtype=[("obj_code", "i4"), ("pk", "i4"), ("seq_id", "i4")],
+    )
+    datasource = {
+        "kcu": np.array([-1, 0, 1, 2, 3, 100, 4]),
+        "lik": np.array([0, 1, 2, 3, 4, 1, 5]),
+    }
+
+    content_pk, content_type = PrepareLines.get_1d_object_info(
+        datasource, IdMapper(id_mapping)
+    )
+
+    # the weir overrides the pipe with the same seq_id, the pumpstation and
+    # unknown seq_ids are ignored, as are non-1d lines
+    np.testing.assert_array_equal(content_pk, [0, 10, 20, 50, 0, 0, 0])
+    np.testing.assert_array_equal(
+        content_type, ["", "v2_pipe", "v2_channel", "v2_weir", "", "", ""]
+    )
+
+
+def test_prepare_get_stages():
+    assert GridAdminH5Prepare.get_stages(["breaches"]) == [
+        ("id_mapper", "prepare_id_mapper"),
+        ("nodes", "prepare_nodes"),
+        ("lines", "prepare_lines"),
+        ("levees", "prepare_levees"),
+        ("breaches", "prepare_breaches"),
+    ]
+    assert len(GridAdminH5Prepare.get_stages()) == len(
+        GridAdminH5Prepare.PREPARE_STAGES
+    )
+    with pytest.raises(ValueError):
+        GridAdminH5Prepare.get_stages(["unknown"])
+
+
+def test_prepare_stages():
+    calls = []
+    with mock.patch.multiple(
+        GridAdminH5Prepare,
+        **{
+            method_name: mock.Mock(
+                side_effect=lambda *args, name=name: calls.append(name)
+            )
+            for name, method_name, _ in GridAdminH5Prepare.PREPARE_STAGES
+        }
+    ):
+        GridAdminH5Prepare.prepare(mock.Mock(), None, stages=["pumps"])
+    assert calls == ["id_mapper", "nodes", "pumps"]
@@ -1,8 +1,16 @@
+import sqlite3
+from types import SimpleNamespace
+
 import numpy as np
 import pytest
+from shapely.geometry import Point
+from shapely.wkb import loads as wkb_loads
 
 from threedigrid.admin import prepare_utils
-from threedigrid.admin.prepare_utils import add_or_update_datasets
+from threedigrid.admin.prepare_utils import (
+    add_or_update_datasets,
+    db_objects_to_numpy_array_dict,
+)
 
 
 @pytest.fixture(
@@ -48,3 +56,48 @@ def test_add_or_update_datasets_existing_data(empty_hdf5_file, np_array_dict):
     assert list(h5py_group.keys()) == ["mydataset"]
     assert h5py_group["mydataset"].dtype == np_array_dict["mydataset"].dtype
     assert all(h5py_group["mydataset"][:] == np_array_dict["mydataset"])
+
+
+def test_db_objects_to_numpy_array_dict(monkeypatch):
+    monkeypatch.setattr(prepare_utils, "DEFAULT_NULL_VALUE", -9999)
+    db_objects = [
+        SimpleNamespace(pk=1, code="a", width=1.5, sewerage=True, child=None),
+        SimpleNamespace(pk=2, code=None, width=None, sewerage=None, child=None),
+        SimpleNamespace(pk=3, code="\u00e9", width=2, sewerage=False, child=None),
+    ]
+    for db_object, value in zip(db_objects, [4, None, 5]):
+        db_object.child = SimpleNamespace(value=value)
+
+    result = db_objects_to_numpy_array_dict(
+        db_objects, ["pk", "code", "width", "sewerage", "child__value"]
+    )
+    np.testing.assert_array_equal(result["pk"], [1, 2, 3])
+    np.testing.assert_array_equal(result["code"], [b"a", b"-9999", b"\xc3\xa9"])
+    assert result["code"].dtype == "S5"
+    np.testing.assert_array_equal(result["width"], [1.5, -9999.0, 2.0])
+    np.testing.assert_array_equal(result["sewerage"], [1, -9999, 0])
+    np.testing.assert_array_equal(result["child__value"], [4, -9999, 5])
+
+
+def test_db_objects_to_numpy_array_dict_geometries(monkeypatch):
+    monkeypatch.setattr(prepare_utils, "DEFAULT_NULL_VALUE", -9999)
+    db_objects = [SimpleNamespace(the_geom=Point(1, 2)), SimpleNamespace(the_geom=None)]
+    result = db_objects_to_numpy_array_dict(db_objects, ["the_geom"])
+    assert wkb_loads(result["the_geom"][0].tobytes()).wkt == "POINT (1 2)"
+    assert result["the_geom"][1] == -9999
+
+
+def test_db_objects_to_numpy_array_dict_columns_and_cursor(monkeypatch):
+    monkeypatch.setattr(prepare_utils, "DEFAULT_NULL_VALUE", -9999)
+    result = db_objects_to_numpy_array_dict(
+        {"pk": [1, 2], "code": ["a", None]}, ["pk", "code"]
+    )
+    np.testing.assert_array_equal(result["pk"], [1, 2])
+    np.testing.assert_array_equal(result["code"], [b"a", b"-9999"])
+
+    cursor = sqlite3.connect(":memory:").execute(
+        "SELECT 1 AS pk, 'a' AS code UNION ALL SELECT 2, NULL"
+    )
+    cursor_result = db_objects_to_numpy_array_dict(cursor, ["pk", "code"])
+    np.testing.assert_array_equal(cursor_result["pk"], result["pk"])
+    np.testing.assert_array_equal(cursor_result["code"], result["code"])
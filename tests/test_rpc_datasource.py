@@ -0,0 +1,272 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("asyncio_rpc")
+
+from asyncio_rpc.client import RPCClient  # noqa: E402
+from asyncio_rpc.commlayers.base import AbstractRPCCommLayer  # noqa: E402
+from asyncio_rpc.models import RPCResult  # noqa: E402
+
+from threedigrid.admin import rpc_datasource  # noqa: E402
+from threedigrid.admin.gridadmin import GridH5Admin  # noqa: E402
+from threedigrid.admin.gridresultadmin import GridH5ResultAdmin  # noqa: E402
+from threedigrid.admin.rpc_datasource import (  # noqa: E402
+    FutureResult,
+    RPCClientPool,
+    RPCFile,
+    resolve_all,
+)
+
+
+class InProcessCommLayer(AbstractRPCCommLayer):
+    """Comm layer that answers every RPCStack with handler(stack)"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.events = []
+        self._callback = None
+        self._stopped = None
+
+    async def publish(self, rpc_instance, channel=None):
+        self.events.append("publish")
+        asyncio.ensure_future(self._respond(rpc_instance))
+        return 1
+
+    async def _respond(self, rpc_stack):
+        while self._callback is None:
+            await asyncio.sleep(0)
+        self.events.append("result")
+        result = RPCResult(rpc_stack.uid, rpc_stack.namespace, self.handler(rpc_stack))
+        await self._callback(result, b"channel")
+
+    async def do_subscribe(self):
+        pass
+
+    async def subscribe(self, on_rpc_event_callback):
+        self._stopped = asyncio.Event()
+        self._callback = on_rpc_event_callback
+        await self._stopped.wait()
+
+    async def unsubscribe(self):
+        self._callback = None
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def close(self):
+        await self.unsubscribe()
+
+
+def stack_to_str(rpc_stack):
+    return ".".join(x.func_name for x in rpc_stack.stack)
+
+
+@pytest.fixture
+def rpc_ga():
+    ga = GridH5Admin("rpc://localhost/test-channel")
+    comm = InProcessCommLayer(stack_to_str)
+    ga.h5py_file._client = RPCClient(comm)
+    return ga, comm
+
+
+def test_resolve_all_pipelines_calls(rpc_ga):
+    ga, comm = rpc_ga
+    fields = ["id", "coordinates", "node_type", "content_pk"]
+
+    async def run():
+        results = await resolve_all(*[getattr(ga.nodes, x) for x in fields])
+        await ga.h5py_file._client.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results == ["nodes.{}".format(x) for x in fields]
+    # all calls are published before the first result comes back
+    assert comm.events == ["publish"] * 4 + ["result"] * 4
+
+
+def test_set_props_in_one_round_trip(rpc_ga):
+    ga, comm = rpc_ga
+    comm.handler = lambda rpc_stack: rpc_stack.stack[-1].func_args[0] != "has_2d"
+
+    async def run():
+        await ga._set_props()
+        await ga.h5py_file._client.close()
+
+    asyncio.run(run())
+    assert (ga.has_1d, ga.has_2d, ga.has_breaches, ga.has_pumpstations) == (
+        True,
+        False,
+        True,
+        True,
+    )
+    assert comm.events == ["publish"] * 4 + ["result"] * 4
+
+
+def test_calls_are_cached_and_coalesced(rpc_ga):
+    ga, comm = rpc_ga
+
+    async def run():
+        # identical calls in flight are published once
+        first = await resolve_all(ga.nodes.id, ga.nodes.id, ga.lines.id)
+        second = await ga.nodes.id.resolve()
+        await ga.h5py_file._client.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ["nodes.id", "nodes.id", "lines.id"]
+    assert second == "nodes.id"
+    assert comm.events == ["publish"] * 2 + ["result"] * 2
+
+
+def test_cached_results_are_read_only(rpc_ga):
+    ga, comm = rpc_ga
+    comm.handler = lambda rpc_stack: {"id": np.arange(3), "names": [np.ones(2)]}
+
+    async def run():
+        result = await ga.nodes.id.resolve()
+        with pytest.raises(ValueError):
+            result["id"][0] = 10
+        with pytest.raises(ValueError):
+            result["names"][0][0] = 10
+        second = await ga.nodes.id.resolve()
+        await ga.h5py_file._client.close()
+        return second
+
+    np.testing.assert_array_equal(asyncio.run(run())["id"], [0, 1, 2])
+
+
+@pytest.mark.parametrize("ttl,publishes", [(60, 1), (0, 2)])
+def test_result_cache_ttl(rpc_ga, monkeypatch, ttl, publishes):
+    ga, comm = rpc_ga
+    monkeypatch.setattr(rpc_datasource, "RESULT_CACHE_TTL", ttl)
+    future = FutureResult(ga.h5py_file, ga.nodes.id.rpc_stack)
+
+    async def run():
+        await future.resolve()
+        await future.resolve()
+        await ga.h5py_file._client.close()
+
+    asyncio.run(run())
+    assert comm.events.count("publish") == publishes
+
+
+def test_failed_calls_are_not_cached(rpc_ga):
+    ga, comm = rpc_ga
+
+    async def failing_call():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    async def run():
+        client = await ga.h5py_file.client
+        original = client.rpc_call
+        client.rpc_call = lambda rpc_stack: failing_call()
+        with pytest.raises(ValueError):
+            await ga.nodes.id.resolve()
+        client.rpc_call = original
+        result = await ga.nodes.id.resolve()
+        await client.close()
+        return result
+
+    assert asyncio.run(run()) == "nodes.id"
+    assert comm.events == ["publish", "result"]
+
+
+def test_result_admin_caches_static_fields(monkeypatch):
+    monkeypatch.setattr(rpc_datasource, "RESULT_CACHE_TTL", 0)
+    gr = GridH5ResultAdmin("rpc://localhost/test-channel", "")
+    comm = InProcessCommLayer(stack_to_str)
+    gr.h5py_file._client = RPCClient(comm)
+
+    async def run():
+        # static grid fields are cached, result fields expire
+        for _ in range(2):
+            await resolve_all(gr.nodes.coordinates, gr.lines.id, gr.nodes.s1)
+        await gr.h5py_file._client.close()
+
+    asyncio.run(run())
+    assert comm.events.count("publish") == 4
+    assert isinstance(gr.nodes.s1, FutureResult)
+    assert not isinstance(gr.nodes.coordinates, FutureResult)
+
+
+def test_rpc_file_path():
+    rpc_file = RPCFile("rpc://redis:6380/simulation-1", "r")
+    assert (rpc_file._redis_host, rpc_file._redis_port) == ("redis", 6380)
+    assert rpc_file.pubchannel == "simulation-1"
+    assert RPCFile("rpc://redis/simulation-1", "r")._redis_port == 6379
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    comms = []
+
+    async def create(subchannel, pubchannel, host, port, serialization):
+        comms.append(InProcessCommLayer(stack_to_str))
+        comms[-1].host = host
+        return comms[-1]
+
+    monkeypatch.setattr(rpc_datasource.RPCRedisCommLayer, "create", create)
+    pool = RPCClientPool(max_concurrent_calls=1)
+    pool.comms = comms
+    return pool
+
+
+def test_client_pool_shares_clients(pool):
+    admins = [GridH5Admin("rpc://localhost:6380/channel") for _ in range(3)]
+    for ga in admins:
+        ga.h5py_file.pool = pool
+
+    async def run():
+        results = await resolve_all(*[ga.nodes.id for ga in admins[1:]])
+        results.append(await admins[0].lines.id.resolve())
+        await pool.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["nodes.id", "nodes.id", "lines.id"]
+    assert len(pool.comms) == 1
+    assert pool.comms[0].host == "localhost:6380"
+    # the calls are limited to one at a time
+    assert pool.comms[0].events == ["publish", "result"] * 3
+    assert pool._clients == {}
+
+
+def test_client_pool_per_event_loop(pool):
+    async def get():
+        return await pool.get("localhost", 6379, "channel", rpc_datasource.msgpack)
+
+    async def run():
+        first, second = await asyncio.gather(get(), get())
+        assert first is second and first.healthy
+        await pool.aclose()
+        assert not first.healthy
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert len(pool.comms) == 2
+
+
+def test_client_pool_evicts_clients(pool):
+    pool.max_size = 2
+
+    async def get(channel):
+        return await pool.get("localhost", 6379, channel, rpc_datasource.msgpack)
+
+    async def run():
+        first = await get("a")
+        second = await get("b")
+        first.active = 1
+        # the least recently used client is closed, unless it is busy
+        third = await get("c")
+        assert first.healthy and not second.healthy and third.healthy
+        first.active = 0
+        third.last_used -= rpc_datasource.CLIENT_IDLE_TIMEOUT + 1
+        # idle clients are closed
+        assert await get("a") is first
+        assert not third.healthy
+        assert [x[3] for x in pool._clients] == ["a"]
+        await pool.aclose()
+
+    asyncio.run(run())
+    assert len(pool.comms) == 3
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("asyncio_rpc")
+
+from asyncio_rpc.models import SERIALIZABLE_MODELS, RPCResult  # noqa: E402
+from asyncio_rpc.serialization import msgpack as rpc_msgpack  # noqa: E402
+
+from threedigrid.admin.rpc_serialization import NumpySerialization  # noqa: E402
+
+for model in SERIALIZABLE_MODELS:
+    rpc_msgpack.register(model)
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(10, dtype=np.int32),
+        np.linspace(0, 1, 12).reshape(3, 4),
+        np.asfortranarray(np.arange(6.0).reshape(2, 3)),
+        np.arange(4, dtype=">i8"),
+        np.array([b"v2_pipe", b""]),
+        np.array([(1, 2.5)], dtype=[("pk", "i4"), ("value", "f8")]),
+        np.array([], dtype=np.float64),
+    ],
+)
+@pytest.mark.parametrize("compression", [None, "lz4"])
+def test_numpy_serialization_round_trip(array, compression):
+    serialization = NumpySerialization(compression=compression)
+    result = serialization.loadb(serialization.dumpb(RPCResult("uid", "ns", array)))
+    assert isinstance(result, RPCResult)
+    assert result.data.dtype == array.dtype.newbyteorder("=")
+    np.testing.assert_array_equal(result.data, array)
+
+
+def test_numpy_serialization_float32():
+    serialization = NumpySerialization(float32=True)
+    data = {"s1": np.linspace(0, 1, 5), "id": np.arange(5)}
+    result = serialization.loadb(serialization.dumpb(data))
+    assert result["s1"].dtype == np.float32
+    assert result["id"].dtype == data["id"].dtype
+    np.testing.assert_allclose(result["s1"], data["s1"], rtol=1e-6)
+
+
+def test_numpy_serialization_reads_default_serialization():
+    data = RPCResult("uid", "ns", {"ids": np.arange(5), "when": slice(1, 2)})
+    result = NumpySerialization().loadb(rpc_msgpack.dumpb(data))
+    np.testing.assert_array_equal(result.data["ids"], np.arange(5))
+    assert result.data["when"] == slice(1, 2)
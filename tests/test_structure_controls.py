@@ -1,6 +1,7 @@
 import os
 from typing import List
 
+import numpy as np
 import pytest
 from numpy.testing import assert_array_equal
 
@@ -124,3 +125,71 @@ def test_get_source_type_2(gsc: GridH5StructureControl):
     assert gsc.get_source_type("set_crest_level") == StructureControlSourceTypes.LINES
     with pytest.raises(NotImplementedError):
         gsc.get_source_type("this_action_most_likely_does_not_exist")
+
+
+@pytest.fixture()
+def synthetic_gsc(synthetic_gridadmin_path, synthetic_structure_control_path):
+    gsc = GridH5StructureControl(
+        synthetic_gridadmin_path, synthetic_structure_control_path
+    )
+    yield gsc
+    gsc.close()
+
+
+def test_columns_are_read_once(synthetic_gsc):
+    table_control = synthetic_gsc.table_control
+    assert table_control is synthetic_gsc.table_control
+    assert table_control.id.tolist() == ["weir_b", "pump_a", "weir_b", "pump_a"]
+    assert table_control.action_type[1] == "set_pump_capacity"
+    assert table_control.time is table_control.time
+    assert not table_control.time.flags.writeable
+    assert_array_equal(table_control.table["offsets"], [0, 2, 4])
+
+
+def test_group_by_id_synthetic(synthetic_gsc):
+    struct_cntrl = synthetic_gsc.table_control.group_by_id("weir_b")
+    assert struct_cntrl.id == "weir_b"
+    assert struct_cntrl.grid_id == 3
+    assert (struct_cntrl.source_table, struct_cntrl.source_table_id) == ("v2_weir", 2)
+    assert struct_cntrl.source_type == StructureControlSourceTypes.LINES
+    assert_array_equal(struct_cntrl.time, [0.0, 60.0])
+    assert_array_equal(struct_cntrl.action_value_1, [1.0, -0.5])
+    assert_array_equal(struct_cntrl.is_active, [1, 0])
+    assert synthetic_gsc.table_control.group_by_id("weir_c") is None
+    assert synthetic_gsc.table_control.group_by_id("zzz") is None
+
+
+def test_group_by_synthetic(synthetic_gsc):
+    struct_cntrls = synthetic_gsc.table_control.group_by_time(50, 200)
+    assert [x.id for x in struct_cntrls] == ["pump_a", "weir_b"]
+    pump = struct_cntrls[0]
+    assert (pump.source_table, pump.source_table_id) == ("v2_pumpstation", 2)
+    assert_array_equal(pump.time, [0.0, 120.0])
+    assert synthetic_gsc.table_control.group_by_is_active(0)[0].id == "weir_b"
+    assert synthetic_gsc.table_control.group_by_grid_id(4) == []
+    assert synthetic_gsc.table_control._group_by("unknown", 1) == []
+    assert synthetic_gsc.timed_control.group_by_time(0, 1000) == []
+
+
+def test_get_source_tables(synthetic_gsc):
+    source_table, source_table_id = synthetic_gsc.get_source_tables(
+        np.array(["set_crest_level", "set_pump_capacity", "set_gate_level"]),
+        np.array([3, 7, 1]),
+    )
+    assert source_table.tolist() == ["v2_weir", "v2_pumpstation", "v2_channel"]
+    assert source_table_id.tolist() == [2, 7, 1]
+
+
+def test_export_synthetic(synthetic_gsc, tmp_path):
+    csv_path = os.path.join(tmp_path, "actions.csv")
+    structure_control_actions_to_csv(synthetic_gsc, csv_path)
+    with open(csv_path) as f:
+        lines = f.read().splitlines()
+    assert lines[0].startswith("control_type,id,source_table,source_table_id,time")
+    assert lines[1:] == [
+        "table_control,weir_b,v2_weir,2,0.0,set_crest_level,1.0,0.0,1",
+        "table_control,pump_a,v2_pumpstation,2,0.0,set_pump_capacity,0.5,0.0,1",
+        "table_control,weir_b,v2_weir,2,60.0,set_crest_level,-0.5,0.0,0",
+        "table_control,pump_a,v2_pumpstation,2,120.0,set_pump_capacity,0.0,0.0,1",
+        "memory_control,pipe,v2_pipe,1,30.0,set_discharge_coefficients,1.0,2.0,1",
+    ]
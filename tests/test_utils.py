@@ -1,10 +1,21 @@
 import numpy as np
 import pytest
+from shapely.wkb import loads as wkb_loads
 
 from threedigrid import numpy_utils
+from threedigrid.admin import constants
 from threedigrid.admin.constants import LONLAT_DIGITS
-from threedigrid.admin.utils import _get_storage_area, PKMapper
-from threedigrid.geo_utils import transform_bbox
+from threedigrid.admin.utils import (
+    _get_storage_area,
+    create_dataset,
+    get_dataset_layout,
+    PKMapper,
+)
+from threedigrid.geo_utils import (
+    get_transformer,
+    transform_bbox,
+    transform_ragged_coords,
+)
 from threedigrid.numpy_utils import get_smallest_uint_dtype
 from threedigrid.orm.base.utils import _flatten_dict_values
 
@@ -121,3 +132,152 @@ def test_transform_bbox_all_coords():
     target_epsg = "4326"
     transformed_bbox = transform_bbox(bbox, source_epsg, target_epsg, all_coords=True)
     assert transformed_bbox.shape == (8,)
+
+
+def test_flatten_ragged_coords():
+    geometries = np.empty(3, dtype=object)
+    geometries[:] = [np.array([0.0, 1.0, 5.0, 6.0]), np.array([]), np.array([2, 7])]
+    x, y, offsets = numpy_utils.flatten_ragged_coords(geometries)
+    np.testing.assert_array_equal(x, [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(y, [5.0, 6.0, 7.0])
+    np.testing.assert_array_equal(offsets, [0, 2, 2, 3])
+
+
+def test_split_ragged_coords():
+    result = numpy_utils.split_ragged_coords(
+        np.array([0.0, 1.0, 2.0, 3.0]), np.array([5.0, 6.0, 7.0, 8.0]), [0, 2, 2, 4]
+    )
+    assert result.shape == (3,)
+    np.testing.assert_array_equal(result[0], [0.0, 1.0, 5.0, 6.0])
+    assert result[1].size == 0
+    np.testing.assert_array_equal(result[2], [2.0, 3.0, 7.0, 8.0])
+
+
+def test_transform_ragged_coords():
+    geometries = np.empty(3, dtype=object)
+    geometries[:] = [
+        np.array([106314.0, 106474.0, 517472.0, 517632.0]),
+        np.array([100000.0, 100100.0, 100200.0, 500000.0, 500100.0, 500200.0]),
+        np.array([]),
+    ]
+    result = transform_ragged_coords(geometries, "28992", "4326")
+    transformer = get_transformer("28992", "4326")
+    for coords, expected in zip(result, geometries):
+        x, y = expected.reshape(2, -1)
+        np.testing.assert_array_equal(coords, np.ravel(transformer.transform(x, y)))
+
+
+def test_points_to_wkb_array():
+    points = np.array([[1.0, 3.0], [2.0, 0.0]])
+    wkbs = numpy_utils.points_to_wkb_array(points)
+    assert [wkb_loads(x).wkt for x in wkbs] == ["POINT (1 2)", "POINT (3 0)"]
+
+
+def test_lines_to_wkb_array():
+    lines = np.array([[1, 2], [3, 4], [5, 6], [7, 8]])
+    wkbs = numpy_utils.lines_to_wkb_array(lines)
+    assert [wkb_loads(x).wkt for x in wkbs] == [
+        "LINESTRING (1 3, 5 7)",
+        "LINESTRING (2 4, 6 8)",
+    ]
+
+
+def test_bboxes_to_wkb_array():
+    bboxes = np.array([[0.0], [1.0], [2.0], [3.0]])
+    wkbs = numpy_utils.bboxes_to_wkb_array(bboxes)
+    assert wkb_loads(wkbs[0]).wkt == "POLYGON ((0 1, 2 1, 2 3, 0 3, 0 1))"
+
+
+def test_multilines_to_wkb_array():
+    geometries = np.empty(2, dtype=object)
+    geometries[:] = [np.array([0.0, 1.0, 5.0, 6.0]), np.array([2.0, 3, 4, 7, 8, 9])]
+    wkbs = numpy_utils.multilines_to_wkb_array(geometries)
+    assert [wkb_loads(x).wkt for x in wkbs] == [
+        "LINESTRING (0 5, 1 6)",
+        "LINESTRING (2 7, 3 8, 4 9)",
+    ]
+
+
+def test_polygons_to_wkb_array():
+    geometries = [np.array([0.0, 1, 1, 0, 0, 0, 0, 1, 1, 0])]
+    wkbs = numpy_utils.polygons_to_wkb_array(geometries)
+    assert wkb_loads(wkbs[0]).wkt == "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))"
+
+
+def test_to_wkb_array_empty():
+    assert numpy_utils.points_to_wkb_array(np.array([])).size == 0
+    assert numpy_utils.multilines_to_wkb_array([]).size == 0
+
+
+def test_get_dataset_layout_small():
+    assert get_dataset_layout((100,), "f8") == {"track_order": False}
+    assert "chunks" not in get_dataset_layout((10**6,), np.dtype(object))
+
+
+def test_get_dataset_layout_compression_opt_in(monkeypatch):
+    # uncompressed datasets are stored contiguous
+    assert get_dataset_layout((10**6,), "f8") == {"track_order": False}
+    monkeypatch.setattr(constants, "DATASET_COMPRESSION", "lzf")
+    assert get_dataset_layout((10**6,), "f8")["compression"] == "lzf"
+
+
+def test_get_dataset_layout_chunked():
+    layout = get_dataset_layout((4, 10**6), "f8", compression="gzip")
+    assert layout["chunks"] == (4, 8192)
+    assert layout["compression"] == "gzip"
+    assert layout["shuffle"]
+    assert "chunks" not in get_dataset_layout((10**6,), "i4", compression=None)
+
+
+def test_create_dataset(empty_hdf5_file):
+    data = np.arange(4 * 10**5).reshape(4, -1)
+    dataset = create_dataset(empty_hdf5_file, "coords", data=data)
+    assert dataset.chunks is None
+    dataset = create_dataset(empty_hdf5_file, "lzf", data=data, compression="lzf")
+    assert dataset.chunks == (4, 8192)
+    np.testing.assert_array_equal(dataset[:, 10:20], data[:, 10:20])
+
+    dataset = create_dataset(empty_hdf5_file, "code", dtype="S4", data=[b"a", b"bc"])
+    assert dataset.chunks is None
+    assert dataset.dtype == "S4"
+
+
+def test_rasterize_boxes():
+    boxes = np.array(
+        [
+            [0, 2, 2, 0, 1],  # i0
+            [0, 0, 2, 2, 1],  # j0
+            [2, 4, 4, 2, 3],  # i1
+            [2, 2, 4, 4, 2],  # j1
+        ]
+    )
+    values = np.array([1, 2, 3, 4, 5])
+    result = numpy_utils.rasterize_boxes(boxes, values, (3, 4), offset=(0, 1))
+    # box 5 is burned last and overlaps boxes 1 and 2
+    np.testing.assert_array_equal(result, [[1, 5, 5, 2], [4, 4, 3, 3], [4, 4, 3, 3]])
+
+
+def test_rasterize_boxes_in_blocks(monkeypatch):
+    boxes = np.array([[0, 2, 0, 1], [0, 0, 2, 1], [2, 4, 4, 3], [2, 2, 4, 3]])
+    expected = numpy_utils.rasterize_boxes(boxes, [1, 2, 3, 4], (5, 4))
+    monkeypatch.setattr(numpy_utils, "RASTERIZE_BLOCK_SIZE", 6)
+    result = numpy_utils.rasterize_boxes(boxes, [1, 2, 3, 4], (5, 4))
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(result[1], [1, 4, 4, 2])
+
+
+def test_rasterize_boxes_out():
+    out = np.full((2, 2), 7, dtype=np.int32)
+    result = numpy_utils.rasterize_boxes(
+        np.array([[0], [0], [1], [1]]), [3], (2, 2), out=out
+    )
+    assert result is out
+    np.testing.assert_array_equal(out, [[3, 0], [0, 0]])
+
+
+def test_get_boxes_at_points():
+    boxes = np.array([[0, 2, 0], [0, 0, 2], [2, 4, 4], [2, 2, 4]])
+    i = np.array([0.5, 2.0, 3.5, 4.0, 1.0, 5.0])
+    j = np.array([0.5, 1.0, 3.0, 2.0, 4.0, 1.0])
+    result = numpy_utils.get_boxes_at_points(boxes, i, j)
+    np.testing.assert_array_equal(result, [0, 1, 2, 2, 2, -1])
@@ -1,5 +1,6 @@
 from os.path import join
 
+import h5py
 import numpy as np
 import pytest
 from numpy.testing import assert_array_equal
@@ -137,3 +138,96 @@ def test_concentration_values_customized(cwqa: CustomizedWaterQualityResultAdmin
         cwqa.area2.substance3.concentration[:, 1:],
         np.take(cwqa.netcdf_file["substance3_1D"][:30], [1, 3, 4], axis=1),
     )
+
+
+@pytest.fixture
+def synthetic_wqa(synthetic_gridadmin_path, synthetic_water_quality_path):
+    wqa = GridH5WaterQualityResultAdmin(
+        synthetic_gridadmin_path, synthetic_water_quality_path
+    )
+    yield wqa
+    wqa.close()
+
+
+def test_concentrations(synthetic_wqa):
+    result = synthetic_wqa.concentrations()
+    # without timeseries filter the timeseries chunk size is used
+    assert result.shape == (3, 10, 14)
+    for i, substance in enumerate(["substance1", "substance2", "substance10"]):
+        assert_array_equal(result[i], getattr(synthetic_wqa, substance).concentration)
+    # aligned to the gridadmin nodes
+    assert_array_equal(result[2, 3, 1:], 10003 + np.arange(1, 14) / 100)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"start_time": 120, "end_time": 600},
+        {"indexes": [3, 5, 6]},
+        {"indexes": slice(2, 20, 3)},
+        {"start_time": 5000},
+    ],
+)
+def test_concentrations_timeseries(synthetic_wqa, kwargs):
+    result = synthetic_wqa.concentrations(["substance2", "substance1"], **kwargs)
+    for i, substance in enumerate(["substance2", "substance1"]):
+        expected = getattr(synthetic_wqa, substance).timeseries(**kwargs).concentration
+        if expected.size == 0:
+            assert result[i].size == 0
+        else:
+            assert_array_equal(result[i], expected)
+
+
+def test_substances_are_created_on_access(synthetic_wqa):
+    assert sorted(synthetic_wqa.substances) == [
+        "substance1",
+        "substance10",
+        "substance2",
+    ]
+    assert "substance2" not in synthetic_wqa.__dict__
+    synthetic_wqa.set_timeseries_chunk_size(5)
+    substance2 = synthetic_wqa.substance2
+    assert substance2 is synthetic_wqa.substance2
+    assert (substance2.name, substance2.units) == ("test2", "kg/m3")
+    assert substance2.concentration.shape == (5, 14)
+    synthetic_wqa.set_timeseries_chunk_size(7)
+    assert substance2.concentration.shape == (7, 14)
+    with pytest.raises(AttributeError):
+        synthetic_wqa.substance3
+
+
+@pytest.fixture
+def synthetic_cwqa(synthetic_gridadmin_path, tmpdir):
+    file_name = str(tmpdir.join("customized_water_quality_results_3di.nc"))
+    with h5py.File(file_name, "w") as nc:
+        nc.create_dataset("time", data=np.arange(25) * 60.0)
+        nc.create_dataset("Mesh2DNode_id", data=np.array([1, 3, 5, 7]))
+        nc.create_dataset("Mesh2DNode_id_area1", data=np.array([2, 3]))
+        nc["Mesh2DNode_id_area1"].attrs["area_name"] = "test 1"
+        nc.create_dataset("Mesh2DNode_id_area2", data=np.array([1, 4]))
+        for substance in ("substance1", "substance2"):
+            dataset = nc.create_dataset(
+                f"{substance}_2D", data=np.arange(100.0).reshape(25, 4)
+            )
+            dataset.attrs["substance_name"] = substance.replace("substance", "test")
+    cwqa = CustomizedWaterQualityResultAdmin(synthetic_gridadmin_path, file_name)
+    yield cwqa
+    cwqa.close()
+
+
+def test_customized_areas_are_created_on_access(synthetic_cwqa):
+    assert synthetic_cwqa.substances == ["substance1", "substance2"]
+    assert synthetic_cwqa.areas == ["area1", "area2"]
+    assert "area1" not in synthetic_cwqa.__dict__
+    area1 = synthetic_cwqa.area1
+    assert area1 is synthetic_cwqa.area1
+    assert (area1.name, synthetic_cwqa.area2.name) == ("test 1", "area2")
+    assert "substance2" not in area1.__dict__
+    assert area1.substance2.name == "test2"
+    expected = synthetic_cwqa._build_substance_result_group("substance2", "_area1")
+    assert_array_equal(area1.substance2.id, expected.id)
+    assert_array_equal(area1.substance2.concentration, expected.concentration)
+    synthetic_cwqa.set_timeseries_chunk_size(3)
+    assert area1.substance2.concentration.shape[0] == 3
+    with pytest.raises(AttributeError):
+        area1.substance3
@@ -32,7 +32,7 @@ except ImportError:
 from threedigrid.admin import exporter_constants as const
 from threedigrid.admin.utils import KCUDescriptor
 from threedigrid.geo_utils import get_spatial_reference
-from threedigrid.numpy_utils import reshape_flat_array
+from threedigrid.numpy_utils import points_to_wkb_array, reshape_flat_array
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 logger = logging.getLogger(__name__)
@@ -62,7 +62,6 @@ class BreachesOgrExporter(BaseOgrExporter):
         :param kwargs: does not take extra kwargs
         """
         assert self.driver is not None
-        selection = breach_data
         kcu_dict = KCUDescriptor()
         geomtype = 0
         sr = get_spatial_reference(target_epsg_code)
@@ -82,26 +81,28 @@ class BreachesOgrExporter(BaseOgrExporter):
                 ogr.FieldDefn(str(field_name), const.OGR_FIELD_TYPE_MAP[field_type])
             )
         _definition = layer.GetLayerDefn()
-        points = reshape_flat_array(selection["coordinates"]).T
+        chunk_size = kwargs.get("chunk_size")
+        for selection in self.iter_data(
+            data_source, self._breaches, breach_data, chunk_size
+        ):
+            points = points_to_wkb_array(reshape_flat_array(selection["coordinates"]))
 
-        for i in range(selection["id"].size):
-            if selection["id"][i] == 0:
-                continue  # skip the dummy element
-            feature = ogr.Feature(_definition)
-            point = ogr.Geometry(ogr.wkbPoint)
-            point.AddPoint(points[i][0], points[i][1])
-            feature.SetGeometry(point)
-            self.set_field(feature, "link_id", "int", selection["levl"][i])
-            try:
-                kcu = selection["kcu"][i]
-            except IndexError:
-                kcu = 55  # by definition, a breach has kcu 55
-            self.set_field(feature, "kcu", "int", kcu)
-            kcu_descr = ""
-            try:
-                kcu_descr = kcu_dict[kcu]
-            except KeyError:
-                pass
-            self.set_field(feature, "kcu_descr", "str", kcu_descr)
-            self.set_field(feature, "cont_pk", "int", selection["content_pk"][i])
-            layer.CreateFeature(feature)
+            for i in range(selection["id"].size):
+                if selection["id"][i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(points[i]))
+                self.set_field(feature, "link_id", "int", selection["levl"][i])
+                try:
+                    kcu = selection["kcu"][i]
+                except IndexError:
+                    kcu = 55  # by definition, a breach has kcu 55
+                self.set_field(feature, "kcu", "int", kcu)
+                kcu_descr = ""
+                try:
+                    kcu_descr = kcu_dict[kcu]
+                except KeyError:
+                    pass
+                self.set_field(feature, "kcu_descr", "str", kcu_descr)
+                self.set_field(feature, "cont_pk", "int", selection["content_pk"][i])
+                layer.CreateFeature(feature)
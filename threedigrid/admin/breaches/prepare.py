@@ -1,14 +1,16 @@
 # (c) Nelen & Schuurmans.  GPL licensed, see LICENSE.rst.
 
 try:
-    from osgeo import ogr
+    import shapely
+    from shapely.geometry import LineString
+    from shapely.strtree import STRtree
 except ImportError:
-    ogr = None
+    shapely = None
 
 import numpy as np
 
-from threedigrid.admin import constants
 from threedigrid.geo_utils import raise_import_exception
+from threedigrid.numpy_utils import flatten_ragged_coords
 
 
 def as_numpy_array(array):
@@ -23,29 +25,76 @@ class PrepareBreaches:
     """
 
     def __init__(self):
-        if ogr is None:
-            raise_import_exception("ogr")
+        if shapely is None:
+            raise_import_exception("shapely")
 
     @staticmethod
     def get_coordinates(levees, line_coords, levl):
+        """
+        :return: the coordinates where the lines of the breaches (levl)
+            intersect the first levee they intersect, (0, 0) if they do not
+            intersect any levee
+        """
+        if shapely is None:
+            raise_import_exception("shapely")
+
         breaches_x = np.zeros(levl.shape, dtype="f8")
         breaches_y = np.zeros(levl.shape, dtype="f8")
 
-        for i, line_id in enumerate(levl):
-            if i == 0:
-                continue
-            line = ogr.Geometry(ogr.wkbLineString)
-
-            line.AddPoint(line_coords[0][line_id], line_coords[1][line_id])
-            line.AddPoint(line_coords[2][line_id], line_coords[3][line_id])
-
-            for levee_geom in levees.geoms:
-                if not levee_geom.Intersect(line):
-                    continue
-                intersection = levee_geom.Intersection(line)
-                breaches_x[i] = intersection.GetX()
-                breaches_y[i] = intersection.GetY()
-                break
+        # skip the dummy element
+        line_ids = levl[1:]
+        line_points = np.array(
+            [
+                [line_coords[0][line_ids], line_coords[1][line_ids]],
+                [line_coords[2][line_ids], line_coords[3][line_ids]],
+            ]
+        ).transpose(2, 0, 1)
+
+        # levee geometries with at least two vertices, levee_idx holds their
+        # index in the levees
+        x, y, offsets = flatten_ragged_coords(levees.coords)
+        levee_idx = np.flatnonzero(np.diff(offsets) >= 2)
+        levee_geoms = [
+            LineString(
+                np.column_stack(
+                    [x[offsets[i] : offsets[i + 1]], y[offsets[i] : offsets[i + 1]]]
+                )
+            )
+            for i in levee_idx
+        ]
+        if not levee_geoms or line_ids.size == 0:
+            return np.array([breaches_x, breaches_y])
+
+        if shapely.__version__.startswith("1."):
+            for i, points in enumerate(line_points, start=1):
+                line = LineString(points)
+                for levee_geom in levee_geoms:
+                    if not levee_geom.intersects(line):
+                        continue
+                    intersection = levee_geom.intersection(line)
+                    # the first point of a MultiPoint intersection
+                    point = getattr(intersection, "geoms", [intersection])[0]
+                    breaches_x[i], breaches_y[i] = point.coords[0][:2]
+                    break
+            return np.array([breaches_x, breaches_y])
+
+        lines = shapely.linestrings(line_points)
+        levee_geoms = np.array(levee_geoms, dtype=object)
+        line_index, tree_index = STRtree(levee_geoms).query(
+            lines, predicate="intersects"
+        )
+
+        # use the first intersecting levee (in order of the levees) per line
+        order = np.lexsort((tree_index, line_index))
+        line_index, first = np.unique(line_index[order], return_index=True)
+        tree_index = tree_index[order][first]
+
+        intersections = shapely.intersection(levee_geoms[tree_index], lines[line_index])
+        # the first coordinate of every intersection
+        coords, geom_index = shapely.get_coordinates(intersections, return_index=True)
+        geom_index, first = np.unique(geom_index, return_index=True)
+        breaches_x[line_index[geom_index] + 1] = coords[first, 0]
+        breaches_y[line_index[geom_index] + 1] = coords[first, 1]
 
         return np.array([breaches_x, breaches_y])
 
@@ -67,17 +116,9 @@ class PrepareBreaches:
         if "seq_ids" not in list(datasource.keys()):
             datasource.set("seq_ids", np.arange(0, datasource["levl"].size))
         if "content_pk" not in list(datasource.keys()):
-            content_pk = np.zeros(datasource["levl"].shape, dtype="i4")
-            type_code = constants.TYPE_CODE_MAP["v2_breach"]
-            id_mapping = id_mapper.id_mapping
-            src = id_mapper.obj_slices[type_code]
-            sort_by = as_numpy_array(datasource["seq_ids"])
-            sort_idx = np.argsort(sort_by)
-            idx = sort_idx[
-                np.searchsorted(sort_by, id_mapping[src]["seq_id"], sorter=sort_idx)
-            ]
-
-            content_pk[idx] = id_mapping[src]["pk"]
+            content_pk = id_mapper.get_pks(
+                "v2_breach", as_numpy_array(datasource["seq_ids"])
+            )
             datasource.set("content_pk", content_pk)
 
         levl = as_numpy_array(datasource["levl"])
@@ -52,6 +52,17 @@ GROUP_MAPPINGS = "mappings"
 DSET_GEOMS = "geoms"
 GROUP_LEVEE = "levees"
 
+# ------------------ HDF5 DATASET LAYOUT ------------------ #
+# Datasets written by the prepare step are stored contiguous, unless they are
+# compressed: compressed datasets larger than DATASET_MIN_CHUNKED_BYTES are
+# chunked along the element (last) axis in chunks of about DATASET_CHUNK_BYTES.
+DATASET_MIN_CHUNKED_BYTES = 64 * 1024
+DATASET_CHUNK_BYTES = 256 * 1024
+# None, "gzip", "lzf" or (with hdf5plugin installed) "lz4" or "zstd".
+# Compression is opt-in: it makes files smaller, but reads slower.
+DATASET_COMPRESSION = None
+DATASET_COMPRESSION_OPTS = 1
+
 ###############################################################################
 # HDF5 ATTRIBUTE NAMES
 EXTENT_1D_KEY = "extent_1d"
@@ -281,3 +292,6 @@ NO_DATA_VALUE = -9999.0
 
 # the default slice for result timeseries
 DEFAULT_CHUNK_TIMESERIES = slice(0, 10)
+
+# the number of reprojected (static) coordinate datasets kept in memory
+REPROJECTION_CACHE_SIZE = 16
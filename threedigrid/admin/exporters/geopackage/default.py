@@ -37,7 +37,7 @@ class GeopackageExporter:
         self.start = 0
         self.total_items = 0
 
-    def export(self, progress_func=None):
+    def export(self, progress_func=None, chunk_size=None):
         """
         progress_func should be in format:
 
@@ -45,6 +45,9 @@ class GeopackageExporter:
                 # count = current processed features
                 # total = total feature
                 pass
+
+        chunk_size (optional) limits the number of features read and
+        written at once for every layer.
         """
         from threedigrid.admin.gridadmin import GridH5Admin
 
@@ -92,21 +95,33 @@ class GeopackageExporter:
             internal_func = internal_progress_func if progress_func else None
 
             # pumps and pumps_linestring layers
-            pumps.to_gpkg(self.gpkg_filename, progress_func=internal_func)
+            pumps.to_gpkg(
+                self.gpkg_filename, progress_func=internal_func, chunk_size=chunk_size
+            )
             pumps_linestring.to_gpkg(
                 self.gpkg_filename,
                 "pump_linestring",
                 PUMPS_LINESTRING_FIELD_DEFINITIONS,
                 progress_func=internal_func,
+                chunk_size=chunk_size,
             )
 
             # Other layers
             lines.to_gpkg(
-                self.gpkg_filename, layer_name="flowline", progress_func=internal_func
+                self.gpkg_filename,
+                layer_name="flowline",
+                progress_func=internal_func,
+                chunk_size=chunk_size,
+            )
+            nodes.to_gpkg(
+                self.gpkg_filename, progress_func=internal_func, chunk_size=chunk_size
+            )
+            cells.to_gpkg(
+                self.gpkg_filename, progress_func=internal_func, chunk_size=chunk_size
+            )
+            fragments.to_gpkg(
+                self.gpkg_filename, progress_func=internal_func, chunk_size=chunk_size
             )
-            nodes.to_gpkg(self.gpkg_filename, progress_func=internal_func)
-            cells.to_gpkg(self.gpkg_filename, progress_func=internal_func)
-            fragments.to_gpkg(self.gpkg_filename, progress_func=internal_func)
 
             if obstacles_count > 0:
                 # override the value for 'cross_pixel_coords'
@@ -119,6 +134,7 @@ class GeopackageExporter:
                     "obstacle",
                     OBSTACLES_FIELD_DEFINITIONS,
                     progress_func=internal_func,
+                    chunk_size=chunk_size,
                     cross_pix_coords__transformed=cross_pix_coords__transformed,
                 )
 
@@ -13,50 +13,39 @@ except ImportError:
 
 from threedigrid.admin import exporter_constants as const
 from threedigrid.geo_utils import get_spatial_reference
-from threedigrid.numpy_utils import reshape_flat_array
+from threedigrid.numpy_utils import (
+    bboxes_to_wkb_array,
+    lines_to_wkb_array,
+    multilines_to_wkb_array,
+    points_to_wkb_array,
+    polygons_to_wkb_array,
+)
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 logger = logging.getLogger(__name__)
 
 
-def get_geometry(field_name, field_type, data, index, **kwargs):
-    geom = ogr.Geometry(const.OGR_GEOM_TYPE_MAP[field_type])
+WKB_ARRAY_FUNC_MAP = {
+    "point": points_to_wkb_array,
+    "line": lines_to_wkb_array,
+    "multiline": multilines_to_wkb_array,
+    "bbox": bboxes_to_wkb_array,
+    "polygon": polygons_to_wkb_array,
+}
 
+
+def get_geometries(field_name, field_type, data, **kwargs):
+    """
+    Returns: object array with the geometries of field_name in data
+             encoded as WKB
+    """
     if "__" in field_name:
         data[field_name] = kwargs.get(field_name, np.array([]))
 
-    if field_type == "point":
-        geom.AddPoint(data[field_name][0][index], data[field_name][1][index])
-    elif field_type == "bbox":
-        ring = ogr.Geometry(ogr.wkbLinearRing)
-        ring.AddPoint(data[field_name][0][index], data[field_name][1][index])
-        ring.AddPoint(data[field_name][2][index], data[field_name][1][index])
-
-        ring.AddPoint(data[field_name][2][index], data[field_name][3][index])
-
-        ring.AddPoint(data[field_name][0][index], data[field_name][3][index])
-
-        ring.AddPoint(data[field_name][0][index], data[field_name][1][index])
-
-        # Create polygon from ring
-        geom.AddGeometry(ring)
-    elif field_type == "polygon":
-        ring = ogr.Geometry(ogr.wkbLinearRing)
-        polygon_points = reshape_flat_array(data[field_name][index]).T
-        for x in polygon_points:
-            ring.AddPoint(x[0], x[1])
-        geom.AddGeometry(ring)
-    elif field_type == "line":
-        view = data[field_name].astype("float64")
-        # print(data[field_name][:, index], data[field_name][:, index].dtype)
-        geom.AddPoint(view[0][index], view[1][index])
-        geom.AddPoint(view[2][index], view[3][index])
-    elif field_type == "multiline":
-        for x, y in data[field_name][index].reshape(2, -1).T:
-            geom.AddPoint_2D(x, y)
-    else:
+    if field_type not in WKB_ARRAY_FUNC_MAP:
         raise Exception("Unknown field_type %s", field_type)
-    return geom
+
+    return WKB_ARRAY_FUNC_MAP[field_type](data[field_name])
 
 
 def get_field_type(model, field_name):
@@ -65,6 +54,19 @@ def get_field_type(model, field_name):
     return model._get_field(field_name).type
 
 
+def get_chunk_kwargs(kwargs, total, offset, size):
+    """
+    Returns: kwargs with the arrays holding a value per element (of the
+             total elements) sliced to the chunk at offset
+    """
+    chunk_kwargs = {}
+    for key, value in kwargs.items():
+        if isinstance(value, np.ndarray) and value.shape and value.shape[-1] == total:
+            value = value[..., offset : offset + size]
+        chunk_kwargs[key] = value
+    return chunk_kwargs
+
+
 class GpkgExporter(BaseOgrExporter):
     def __init__(self, model):
         """
@@ -124,19 +126,44 @@ class GpkgExporter(BaseOgrExporter):
         data_source = None
 
     def save(
-        self, file_name, layer_name, field_definitions, progress_func=None, **kwargs
+        self,
+        file_name,
+        layer_name,
+        field_definitions,
+        progress_func=None,
+        chunk_size=None,
+        stats=None,
+        **kwargs,
     ):
         """
         save to file format specified by the driver, e.g. shapefile
 
         :param file_name: name of the outputfile
+        :param chunk_size: if given, the model is read and written in chunks
+            of chunk_size elements (each in its own transaction) to bound
+            the memory usage for large models
+        :param stats: dict with extra float columns {name: values}, with
+            a value per element of the model, e.g. timeseries statistics
 
         :param kwargs: allows to override what's is used as values, see default.py for an example
         """
         field_map = field_definitions
-        data = self.model.data
+        stats = stats or {}
+
+        # Only read the fields that are exported
+        model = self.model
+        if not model.only_fields:
+            field_names = ["id"] + [x.split("__")[0] for x in field_map]
+            model = model.only(
+                *[x for x in dict.fromkeys(field_names) if x in model._field_names]
+            )
+
+        if chunk_size is None:
+            chunks = [model]
+        else:
+            chunks = model.iter_chunks(chunk_size)
 
-        total = data["id"].size
+        total = self.model.count
 
         if progress_func:
             progress_func(0, total)
@@ -179,54 +206,68 @@ class GpkgExporter(BaseOgrExporter):
                     "Could not find type for %s with type %s", field_name, field_type
                 )
 
+        for name in stats:
+            layer.CreateField(ogr.FieldDefn(name, const.OGR_FIELD_TYPE_MAP[float]))
+
         _definition = layer.GetLayerDefn()
 
-        data_source.StartTransaction()
+        geom_fields = [x for x in field_map if field_map[x] == "the_geom"]
 
-        geom_def = [(x, field_map[x]) for x in field_map if field_map[x] == "the_geom"]
+        offset = 0
+        for chunk in chunks:
+            data = chunk.data
+            size = data["id"].size
+            chunk_kwargs = get_chunk_kwargs(kwargs, total, offset, size)
 
-        if geom_def:
-            geom_def = geom_def[0]
-        else:
-            geom_def = None
-
-        for i in range(total):
-            if data["id"][i] == 0:
-                continue  # skip the dummy element
-
-            feature = ogr.Feature(_definition)
-
-            if geom_def:
-                field_name, ogr_field_name = geom_def
-                field_type = get_field_type(self.model, field_name)
-                geom = get_geometry(field_name, field_type, data, i, **kwargs)
-                feature.SetGeometry(geom)
-
-            for field_name, ogr_field_name in field_map.items():
-                field_type = get_field_type(self.model, field_name)
-
-                if ogr_field_name == "the_geom":
-                    continue
-
-                if "__" in field_name:
-                    field_name_split, attribute = field_name.split("__")
-
-                    try:
-                        raw_value = data[field_name_split][:, i][int(attribute)]
-                    except (IndexError, ValueError):
-                        raw_value = kwargs.get(field_name, None)
-                else:
-                    try:
-                        raw_value = data[field_name][i]
-                    except IndexError:
-                        # Try kwargs else None
-                        raw_value = kwargs.get(field_name, None)
-                self.set_field(feature, ogr_field_name, field_type, raw_value)
-
-            layer.CreateFeature(feature)
-            feature = None
-            if progress_func:
-                progress_func(i + 1, total)
+            data_source.StartTransaction()
+
+            # Encode all geometries at once, instead of building them per feature
+            geometries = None
+            if geom_fields:
+                field_type = get_field_type(self.model, geom_fields[0])
+                geometries = get_geometries(
+                    geom_fields[0], field_type, data, **chunk_kwargs
+                )
+
+            for i in range(size):
+                if data["id"][i] == 0:
+                    continue  # skip the dummy element
+
+                feature = ogr.Feature(_definition)
+
+                if geometries is not None:
+                    feature.SetGeometry(ogr.CreateGeometryFromWkb(geometries[i]))
+
+                for field_name, ogr_field_name in field_map.items():
+                    field_type = get_field_type(self.model, field_name)
+
+                    if ogr_field_name == "the_geom":
+                        continue
+
+                    if "__" in field_name:
+                        field_name_split, attribute = field_name.split("__")
+
+                        try:
+                            raw_value = data[field_name_split][:, i][int(attribute)]
+                        except (IndexError, ValueError):
+                            raw_value = chunk_kwargs.get(field_name, None)
+                    else:
+                        try:
+                            raw_value = data[field_name][i]
+                        except IndexError:
+                            # Try kwargs else None
+                            raw_value = chunk_kwargs.get(field_name, None)
+                    self.set_field(feature, ogr_field_name, field_type, raw_value)
+
+                for name, values in stats.items():
+                    self.set_field(feature, name, float, values[offset + i])
+
+                layer.CreateFeature(feature)
+                feature = None
+                if progress_func:
+                    progress_func(offset + i + 1, total)
+
+            data_source.CommitTransaction()
+            offset += size
 
-        data_source.CommitTransaction()
         data_source = None
@@ -10,7 +10,7 @@ except ImportError:
 
 from threedigrid.admin import exporter_constants as const
 from threedigrid.geo_utils import get_spatial_reference
-from threedigrid.numpy_utils import reshape_flat_array
+from threedigrid.numpy_utils import polygons_to_wkb_array
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 
@@ -32,7 +32,7 @@ class FragmentsOgrExporter(BaseOgrExporter):
         }
         self.driver = None
 
-    def save(self, file_name, layer_name, target_epsg_code, **kwargs):
+    def save(self, file_name, fragment_data, target_epsg_code, **kwargs):
         """
         save to file format specified by the driver, e.g. shapefile
 
@@ -65,18 +65,21 @@ class FragmentsOgrExporter(BaseOgrExporter):
             )
         _definition = layer.GetLayerDefn()
 
-        for i in range(len(self._fragments.coords)):
-            if self._fragments.id[i] == 0:
-                continue  # skip the dummy element
-            feature = ogr.Feature(_definition)
-            ring = ogr.Geometry(ogr.wkbLinearRing)
-            polygon_points = reshape_flat_array(self._fragments.coords[i]).T
-            for x in polygon_points:
-                ring.AddPoint(x[0], x[1])
-            polygon = ogr.Geometry(ogr.wkbPolygon)
-            polygon.AddGeometry(ring)
-            feature.SetGeometry(polygon)
-            self.set_field(feature, "id", "int", self._fragments.id[i])
-            self.set_field(feature, "node_id", "int", self._fragments.node_id[i])
-            layer.CreateFeature(feature)
-            feature.Destroy()
+        chunk_size = kwargs.get("chunk_size")
+        for fragment_data in self.iter_data(
+            data_source, self._fragments, fragment_data, chunk_size
+        ):
+            # Read the fields once, instead of per fragment
+            ids = fragment_data["id"]
+            node_ids = fragment_data["node_id"]
+            polygons = polygons_to_wkb_array(fragment_data["coords"])
+
+            for i in range(len(polygons)):
+                if ids[i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(polygons[i]))
+                self.set_field(feature, "id", "int", ids[i])
+                self.set_field(feature, "node_id", "int", node_ids[i])
+                layer.CreateFeature(feature)
+                feature.Destroy()
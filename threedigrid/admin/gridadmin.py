@@ -281,11 +281,10 @@ class GridH5Admin:
                         )
                         pass
         else:
-            from threedigrid.admin.rpc_datasource import _set_property
+            from threedigrid.admin.rpc_datasource import _set_properties
 
             properties = ["has_1d", "has_2d", "has_breaches", "has_pumpstations"]
-            futures = [_set_property(self, prop) for prop in properties]
-            return asyncio.gather(*futures)
+            return asyncio.ensure_future(_set_properties(self, properties))
 
     def get_from_meta(self, prop_name):
         if prop_name not in list(self.h5py_file["meta"].keys()):
@@ -335,17 +335,29 @@ class GridH5StructureControl(GridH5Admin):
     @property
     def table_control(self) -> "_GridH5NestedStructureControl":
         """Get the table control actions as ``_GridH5NestedStructureControl`` object"""
-        return _GridH5NestedStructureControl(self, StructureControlTypes.table_control)
+        return self._get_nested(StructureControlTypes.table_control)
 
     @property
     def memory_control(self) -> "_GridH5NestedStructureControl":
         """Get the memory control actions as ``_GridH5NestedStructureControl`` object"""
-        return _GridH5NestedStructureControl(self, StructureControlTypes.memory_control)
+        return self._get_nested(StructureControlTypes.memory_control)
 
     @property
     def timed_control(self) -> "_GridH5NestedStructureControl":
         """Get the timed control actions as ``_GridH5NestedStructureControl`` object"""
-        return _GridH5NestedStructureControl(self, StructureControlTypes.timed_control)
+        return self._get_nested(StructureControlTypes.timed_control)
+
+    def _get_nested(
+        self, control_type: StructureControlTypes
+    ) -> "_GridH5NestedStructureControl":
+        # Keep the nested objects, they cache the columns they read
+        if not hasattr(self, "_nested"):
+            self._nested = {}
+        if control_type not in self._nested:
+            self._nested[control_type] = _GridH5NestedStructureControl(
+                self, control_type
+            )
+        return self._nested[control_type]
 
     def get_source_table(self, action_type, grid_id):
         """Get source_table and source_table_id based on action_type and grid_id"""
@@ -358,6 +370,32 @@ class GridH5StructureControl(GridH5Admin):
 
         return source_table, source_table_id
 
+    def get_source_tables(self, action_type, grid_id):
+        """
+        Vectorized ``get_source_table``, the line content types and pks are
+        read once.
+
+        :param action_type: array of action types
+        :param grid_id: array of grid ids (of the same length)
+        :return: tuple of source_table (object array) and source_table_id
+        """
+        action_type = np.asarray(action_type)
+        grid_id = np.asarray(grid_id)
+        if not hasattr(self, "_line_sources"):
+            self._line_sources = (
+                _decode_char_array(self.lines.content_type),
+                self.lines.content_pk,
+            )
+        content_type, content_pk = self._line_sources
+
+        is_pump = action_type == "set_pump_capacity"
+        source_table = np.full(grid_id.shape, "v2_pumpstation", dtype=object)
+        source_table_id = grid_id.astype(content_pk.dtype)
+        line_id = grid_id[~is_pump]
+        source_table[~is_pump] = content_type[line_id]
+        source_table_id[~is_pump] = content_pk[line_id]
+        return source_table, source_table_id
+
     def get_source_type(self, action_type):
         """Indicates whether the action is applied on a line, pump (or node) feature"""
         if action_type == "set_pump_capacity":
@@ -372,7 +410,96 @@ class GridH5StructureControl(GridH5Admin):
             raise NotImplementedError
 
 
+def _index_netcdf_keys(keys) -> dict:
+    """
+    Index the variables of a (customized) result file in one pass
+
+    :return: dict of (kind, area, substance) to a list of variable names, the
+        keys are in the order they are found. kind is "substance" (area is
+        None) for ``substance1_2D`` etc. and "area" (substance is None) for
+        ``Mesh2DNode_id_area1`` etc.
+    """
+    index = {}
+    for key in keys:
+        match = re.search(r"substance\d+", key)
+        if match:
+            index.setdefault(("substance", None, match.group()), []).append(key)
+        match = re.search(r"Mesh(1|2)D(Node|Line|Pump)_id_(area\d+)", key)
+        if match:
+            index.setdefault(("area", match.group(3), None), []).append(key)
+    return index
+
+
+def _set_substance_attrs(result_group: Nodes, dataset) -> None:
+    """Set the substance name and units of the dataset on the result group"""
+    attrs_map = [("name", "substance_name"), ("units", "units")]
+    for attr, name in attrs_map:
+        value = dataset.attrs.get(name)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        elif isinstance(value, h5py.Empty):
+            value = ""
+        setattr(result_group, attr, value)
+
+
+def _get_time_hyperslab(timeseries_filter):
+    """
+    Plan the read of a timeseries filter (a slice, boolean mask or index
+    array) on the time axis of a dataset.
+
+    :return: tuple of the selection to read from the dataset and the index
+        to apply on the values read (or None)
+    """
+    if timeseries_filter is None:
+        return slice(None), None
+    if isinstance(timeseries_filter, slice):
+        return timeseries_filter, None
+    indexes = np.asarray(timeseries_filter)
+    if indexes.dtype == bool:
+        indexes = np.flatnonzero(indexes)
+    if indexes.size == 0:
+        return slice(0, 0), None
+    start, stop = indexes.min(), indexes.max() + 1
+    if indexes.size == stop - start and np.all(np.diff(indexes) == 1):
+        return slice(start, stop), None
+    # read the range once and select the timesteps from it
+    return slice(start, stop), indexes - start
+
+
+def _decode_char_array(values: np.ndarray, return_inverse: bool = False):
+    """
+    Decode (Fortran) character arrays to an object array of stripped strings
+
+    :param values: bytes array, or 2D array of single characters
+    :param return_inverse: return the sorted unique strings (a str array) and
+        the indices to reconstruct the strings from them instead
+    """
+    values = np.asarray(values)
+    if values.ndim == 2:
+        # one row of characters per string
+        values = np.ascontiguousarray(values.astype("S1"))
+        values = values.view("S{}".format(max(values.shape[1], 1)))
+        values = values.reshape(values.shape[0])
+    # Decode the unique values only, sorting utf-8 bytes sorts the strings
+    unique, inverse = np.unique(np.char.strip(values), return_inverse=True)
+    unique = np.char.decode(unique, "utf-8")
+    inverse = inverse.reshape(-1)
+    if return_inverse:
+        return unique, inverse
+    return unique.astype(object)[inverse]
+
+
 class _GridH5NestedStructureControl:
+    COLUMNS = (
+        "id",
+        "grid_id",
+        "time",
+        "action_type",
+        "action_value_1",
+        "action_value_2",
+        "is_active",
+    )
+
     def __init__(
         self,
         structure_control: GridH5StructureControl,
@@ -383,6 +510,8 @@ class _GridH5NestedStructureControl:
         Calling the ``GridH5StructureControl`` properties ``table_control``, ``memory_control``,
         or ``timed_control`` returns a ``_GridH5NestedStructureControl`` instance.
 
+        The columns are read once, the control actions are grouped by id.
+
         :param structure_control: GridH5StructureControl(GridH5ResultAdmin)
         :param control_type: str [table_control, memory_control, timed_control]
         :param h5_file_path: path to the hdf5 gridadmin file
@@ -395,57 +524,75 @@ class _GridH5NestedStructureControl:
 
         self.struct_control = structure_control
         self.control_type: str = control_type.value
+        self._table = None
+
+    @property
+    def table(self) -> dict:
+        """
+        Get the (read-only) columns, together with:
+
+        - ``unique_ids``: the sorted unique ids (a str array)
+        - ``group``: index into ``unique_ids`` per control action
+        - ``order``: the control actions sorted (stable) by id
+        - ``offsets``: the control actions of ``unique_ids[i]`` are
+          ``order[offsets[i]:offsets[i + 1]]``
+        """
+        if self._table is None:
+            netcdf_file = self.struct_control.netcdf_file
+            table = {
+                name: netcdf_file[f"{self.control_type}_{name}"][:]
+                for name in self.COLUMNS
+            }
+            # binary character arrays from Netcdf Fortran to numpy object arrays
+            unique_ids, group = _decode_char_array(table["id"], return_inverse=True)
+            table["id"] = unique_ids.astype(object)[group]
+            table["action_type"] = _decode_char_array(table["action_type"])
+
+            table["unique_ids"] = unique_ids
+            table["group"] = group
+            table["order"] = np.argsort(group, kind="stable")
+            table["offsets"] = np.concatenate(
+                [[0], np.cumsum(np.bincount(group, minlength=len(unique_ids)))]
+            )
+            for values in table.values():
+                values.flags.writeable = False
+            self._table = table
+        return self._table
 
     @property
     def action_type(self) -> np.ndarray:
         """Get the action types"""
-        # binary character arrays from Netcdf Fortran to numpy object arrays
-        return np.array(
-            [
-                action_type.tobytes().decode("utf-8").strip()
-                for action_type in self.struct_control.netcdf_file[
-                    f"{self.control_type}_action_type"
-                ][:]
-            ],
-            dtype=object,
-        )
+        return self.table["action_type"]
 
     @property
     def action_value_1(self) -> np.ndarray:
         """Get the action values"""
-        return self.struct_control.netcdf_file[f"{self.control_type}_action_value_1"][:]
+        return self.table["action_value_1"]
 
     @property
     def action_value_2(self) -> np.ndarray:
         """Get the second action values (negative discharge for ``action_type == 'set_discharge_coefficients'``)"""
-        return self.struct_control.netcdf_file[f"{self.control_type}_action_value_2"][:]
+        return self.table["action_value_2"]
 
     @property
     def grid_id(self) -> np.ndarray:
         """Get the grid ID's, i.e. the ID of the Node or Line upon which the structure control action acts"""
-        return self.struct_control.netcdf_file[f"{self.control_type}_grid_id"][:]
+        return self.table["grid_id"]
 
     @property
     def id(self) -> np.ndarray:
         """Get the ID's of the structure control action"""
-        # binary character arrays from Netcdf Fortran to numpy object arrays"
-        return np.array(
-            [
-                id.tobytes().decode("utf-8").strip()
-                for id in self.struct_control.netcdf_file[f"{self.control_type}_id"][:]
-            ],
-            dtype=object,
-        )
+        return self.table["id"]
 
     @property
     def is_active(self) -> np.ndarray:
         """Get the boolean values indicating if the structure control action is active"""
-        return self.struct_control.netcdf_file[f"{self.control_type}_is_active"][:]
+        return self.table["is_active"]
 
     @property
     def time(self) -> np.ndarray:
         """Get the times (in s since start of simulation) at which the structure controls acted"""
-        return self.struct_control.netcdf_file[f"{self.control_type}_time"][:]
+        return self.table["time"]
 
     def group_by_id(self, id: str) -> Optional[StructureControl]:
         """
@@ -454,29 +601,12 @@ class _GridH5NestedStructureControl:
         ID is unique. Get content_type and content_pk from gridadmin. All controls are
         on lines except set_pump_capacity
         """
-        mask = np.isin(self.id, id)
-        if np.all(~mask):
+        unique_ids = self.table["unique_ids"]
+        group = np.searchsorted(unique_ids, id)
+        if group >= len(unique_ids) or unique_ids[group] != id:
             return
 
-        grid_id = self.grid_id[mask][0]
-        action_type = self.action_type[mask][0]
-        source_table, source_table_id = self.struct_control.get_source_table(
-            action_type, grid_id
-        )
-        source_type = self.struct_control.get_source_type(action_type)
-
-        return StructureControl(
-            id=id,
-            grid_id=grid_id,
-            source_table=source_table,
-            source_table_id=source_table_id,
-            source_type=source_type,
-            time=self.time[mask],
-            action_type=action_type,
-            action_value_1=self.action_value_1[mask],
-            action_value_2=self.action_value_2[mask],
-            is_active=self.is_active[mask],
-        )
+        return self._get_structure_controls(np.array([group]))[0]
 
     def group_by_grid_id(self, value: int) -> List[StructureControl]:
         """
@@ -508,6 +638,38 @@ class _GridH5NestedStructureControl:
         """Get all structure control actions where ``min <= action_value_2 <= max``"""
         return self._group_by_in_between("action_value_2", min, max)
 
+    def _get_structure_controls(self, groups: np.ndarray) -> List[StructureControl]:
+        """Get the StructureControl's of the given groups (indices in unique_ids)"""
+        table = self.table
+        starts = table["offsets"][groups]
+        stops = table["offsets"][groups + 1]
+        # The id, grid_id and action_type of the first action of each group
+        first = table["order"][starts]
+        action_types = table["action_type"][first]
+        grid_ids = table["grid_id"][first]
+        source_tables, source_table_ids = self.struct_control.get_source_tables(
+            action_types, grid_ids
+        )
+
+        result = []
+        for i, (start, stop) in enumerate(zip(starts, stops)):
+            rows = table["order"][start:stop]
+            result.append(
+                StructureControl(
+                    id=str(table["unique_ids"][groups[i]]),
+                    grid_id=grid_ids[i],
+                    source_table=source_tables[i],
+                    source_table_id=source_table_ids[i],
+                    source_type=self.struct_control.get_source_type(action_types[i]),
+                    time=table["time"][rows],
+                    action_type=action_types[i],
+                    action_value_1=table["action_value_1"][rows],
+                    action_value_2=table["action_value_2"][rows],
+                    is_active=table["is_active"][rows],
+                )
+            )
+        return result
+
     def _group_by(
         self, type: str, value: Union[int, float, str]
     ) -> List[StructureControl]:
@@ -520,13 +682,11 @@ class _GridH5NestedStructureControl:
         Returns:
             List[StructureControl]: unique structures found from type, value combination
         """
-        if not hasattr(self, type):
+        if type not in self.COLUMNS:
             return []
 
-        values = getattr(self, type)
-        mask = np.isin(values, value)
-        ids = np.unique(self.id[mask])
-        return [self.group_by_id(id) for id in ids]
+        mask = np.isin(self.table[type], value)
+        return self._get_structure_controls(np.unique(self.table["group"][mask]))
 
     def _group_by_in_between(
         self, type: str, min: Union[int, float], max: Union[int, float]
@@ -540,13 +700,12 @@ class _GridH5NestedStructureControl:
         Returns:
             List[StructureControl]: unique structures found from type, value combination
         """
-        if not hasattr(self, type):
+        if type not in self.COLUMNS:
             return []
 
-        values = getattr(self, type)
+        values = self.table[type]
         mask = (values >= min) & (values <= max)
-        ids = np.unique(self.id[mask])
-        return [self.group_by_id(id) for id in ids]
+        return self._get_structure_controls(np.unique(self.table["group"][mask]))
 
 
 class GridH5WaterQualityResultAdmin(GridH5Admin):
@@ -574,35 +733,98 @@ class GridH5WaterQualityResultAdmin(GridH5Admin):
 
         self.set_timeseries_chunk_size(DEFAULT_CHUNK_TIMESERIES.stop)
 
-        # Set substances as attributes
-        substances = set()
-        for key in self.netcdf_file.keys():
-            regex_match = re.search(r"substance\d+", key)
-            if regex_match:
-                substance = regex_match.group()
-                if substance not in substances:
-                    substances.add(substance)
-                    self.__setattr__(
-                        substance,
-                        Nodes(
-                            H5pyResultGroup(self.h5py_file, "nodes", self.netcdf_file),
-                            **dict(
-                                self._grid_kwargs,
-                                **{"mixin": get_substance_result_mixin(substance)},
-                            ),
-                        ),
-                    )
+        # Substances are set as attributes on first access (see __getattr__)
+        self._netcdf_key_index = _index_netcdf_keys(self.netcdf_file.keys())
+        self.substances = [
+            substance
+            for kind, _, substance in self._netcdf_key_index
+            if kind == "substance"
+        ]
+
+    def __getattr__(self, name):
+        substances = self.__dict__.get("substances", ())
+        if name not in substances:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        result_group = Nodes(
+            H5pyResultGroup(self.h5py_file, "nodes", self.netcdf_file),
+            **dict(
+                self._grid_kwargs,
+                **{"mixin": get_substance_result_mixin(name)},
+            ),
+        )
+        # Set substance attributes on Nodes object
+        dataset_name = self._netcdf_key_index[("substance", None, name)][0]
+        _set_substance_attrs(result_group, self.netcdf_file[dataset_name])
+        setattr(self, name, result_group)
+        return result_group
 
-                    # Set substance attributes on Nodes object
-                    attrs_map = [("name", "substance_name"), ("units", "units")]
-                    for attr, name in attrs_map:
-                        value = self.netcdf_file[key].attrs.get(name)
-                        if isinstance(value, bytes):
-                            value = value.decode("utf-8")
-                        elif isinstance(value, h5py.Empty):
-                            value = ""
-                        self.__getattribute__(substance).__setattr__(attr, value)
-        self.substances = list(substances)
+    def concentrations(
+        self,
+        substances: Optional[List[str]] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        indexes=None,
+    ) -> np.ndarray:
+        """
+        Read the concentrations of several substances at once.
+
+        The substances share one lookup index and one timeseries mask, every
+        substance dataset is read with the same hyperslab::
+
+            >>> wqa.concentrations(["substance1", "substance2"], end_time=3600)
+
+        :param substances: the substances to read, defaults to all
+            substances (in natural order: substance1, substance2, ...)
+        :param start_time, end_time, indexes: timeseries filter, see
+            ``timeseries()``. Without a filter the timeseries chunk size is
+            used, like for ``concentration``
+        :return: array with shape (substance, time, node), the nodes are
+            ordered like ``substance1.concentration``
+        """
+        if substances is None:
+            substances = sorted(
+                self.substances, key=lambda x: int(re.sub(r"\D", "", x) or 0)
+            )
+        if len(substances) == 0:
+            return np.empty((0, 0, 0))
+
+        model = getattr(self, substances[0])
+        if not (start_time is None and end_time is None and indexes is None):
+            model = model.timeseries(start_time, end_time, indexes)
+        selection, post_selection = _get_time_hyperslab(
+            model.get_timeseries_mask_filter()
+        )
+        lookup_index = model._meta._get_lookup_index()
+
+        # The 2D and 1D datasets are stacked after the trash element
+        source_names = [
+            [f"{substance}_{x}" for x in ("2D", "1D")] for substance in substances
+        ]
+        source_names = [
+            [x for x in names if x in self.netcdf_file] for names in source_names
+        ]
+        sizes = [self.netcdf_file[x].shape[1] for x in source_names[0]]
+        offsets = np.cumsum([1] + sizes)
+
+        result = None
+        for i, names in enumerate(source_names):
+            for name, start, stop in zip(names, offsets[:-1], offsets[1:]):
+                values = self.netcdf_file[name][selection]
+                if post_selection is not None:
+                    values = values[post_selection]
+                if result is None:
+                    result = np.zeros(
+                        (len(substances), values.shape[0], offsets[-1]),
+                        dtype=values.dtype,
+                    )
+                result[i, :, start:stop] = values
+        if result is None:
+            return np.empty((len(substances), 0, 0))
+        if lookup_index is not None:
+            result = result[..., lookup_index]
+        return result
 
     def get_model_instance_by_field_name(self, field_name):
         """
@@ -611,7 +833,7 @@ class GridH5WaterQualityResultAdmin(GridH5Admin):
         :raises AttributeError if the model instance cannot be found
         """
         try:
-            model_instance = self.__getattribute__(field_name)
+            model_instance = getattr(self, field_name)
             return model_instance
         except AttributeError:
             raise AttributeError(
@@ -632,6 +854,13 @@ class GridH5WaterQualityResultAdmin(GridH5Admin):
         logger.info("New chunk for timeseries size has been set to %d", new_chunk_size)
         self._grid_kwargs.update({"timeseries_chunk_size": self._timeseries_chunk_size})
 
+        # Update the substances that have been created already
+        for substance in self.__dict__.get("substances", ()):
+            if substance in self.__dict__:
+                self.__dict__[substance].class_kwargs.update(
+                    {"timeseries_chunk_size": self._timeseries_chunk_size}
+                )
+
     def close(self) -> None:
         super().close()
         self.netcdf_file.close()
@@ -679,19 +908,23 @@ class CustomizedResultAdmin(GridH5Admin):
         self.set_timeseries_chunk_size(DEFAULT_CHUNK_TIMESERIES.stop)
         self.netcdf_keys = self.netcdf_file.keys()
 
-        self.areas = []
-        for key in self.netcdf_keys:
-            regex_match = re.search(r"Mesh(1|2)D(Node|Line|Pump)_id_area\d+", key)
-            if regex_match:
-                # Set area as attribute and create area result admin
-                dataset_name = regex_match.group().split("_")[-1]
-                area_name = self.netcdf_file[key].attrs.get("area_name", dataset_name)
-                if not hasattr(self, dataset_name):
-                    self.areas += [dataset_name]
-                    self.__setattr__(
-                        dataset_name,
-                        _CustomizedAreaResultAdmin(self, dataset_name, area_name),
-                    )
+        # Areas are set as attributes on first access (see __getattr__)
+        self._netcdf_key_index = _index_netcdf_keys(self.netcdf_keys)
+        self.areas = [
+            area for kind, area, _ in self._netcdf_key_index if kind == "area"
+        ]
+
+    def __getattr__(self, name):
+        areas = self.__dict__.get("areas", ())
+        if name not in areas:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        key = self._netcdf_key_index[("area", name, None)][0]
+        area_name = self.netcdf_file[key].attrs.get("area_name", name)
+        area = _CustomizedAreaResultAdmin(self, name, area_name)
+        setattr(self, name, area)
+        return area
 
     def close(self) -> None:
         super().close()
@@ -911,20 +1144,38 @@ class CustomizedWaterQualityResultAdmin(GridH5Admin):
         self._timeseries_chunk_size = slice(0, DEFAULT_CHUNK_TIMESERIES.stop)
         self._grid_kwargs.update({"timeseries_chunk_size": self._timeseries_chunk_size})
 
-        # Get substances, sets substances as attributes: cwqa.substance1
-        self.substances = []
-        for key in self.netcdf_keys:
-            regex_match = re.search(r"substance\d+", key)
-            if regex_match:
-                substance = regex_match.group()
-                self.substances.append(substance)
-                result_group = self._build_substance_result_group(substance, "")
-                self.__setattr__(substance, result_group)
-                self._set_substance_attributes_on_result_group(result_group, substance)
-
-        # Get areas, sets areas as attributes: cwqa.area1
-        self.areas = []
-        self._add_area_groups()
+        # Substances (cwqa.substance1) and areas (cwqa.area1) are set as
+        # attributes on first access (see __getattr__)
+        self._netcdf_key_index = _index_netcdf_keys(self.netcdf_keys)
+        self.substances = [
+            substance
+            for kind, _, substance in self._netcdf_key_index
+            if kind == "substance"
+        ]
+        self.areas = [
+            area
+            for (kind, area, _), names in self._netcdf_key_index.items()
+            if kind == "area" and any("DNode_id_" in x for x in names)
+        ]
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("substances", ()):
+            value = self._build_substance_result_group(name, "")
+            self._set_substance_attributes_on_result_group(value, name)
+        elif name in self.__dict__.get("areas", ()):
+            key = [
+                x
+                for x in self._netcdf_key_index[("area", name, None)]
+                if "DNode_id_" in x
+            ][0]
+            area_name = self.netcdf_file[key].attrs.get("area_name", name)
+            value = _CustomizedWaterQualityAreaResultAdmin(self, name, area_name)
+        else:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        setattr(self, name, value)
+        return value
 
     def get_model_instance_by_field_name(self, field_name):
         """
@@ -933,7 +1184,7 @@ class CustomizedWaterQualityResultAdmin(GridH5Admin):
         :raises AttributeError if the model instance cannot be found
         """
         try:
-            model_instance = self.__getattribute__(field_name)
+            model_instance = getattr(self, field_name)
             return model_instance
         except AttributeError:
             raise AttributeError(
@@ -954,17 +1205,16 @@ class CustomizedWaterQualityResultAdmin(GridH5Admin):
         logger.info("New chunk for timeseries size has been set to %d", new_chunk_size)
         self._grid_kwargs.update({"timeseries_chunk_size": self._timeseries_chunk_size})
 
-        # Update timeseries chunk size for all substances
-        for substance in self.substances:
-            result_group = self.__getattribute__(substance)
-            result_group.class_kwargs.update(
-                {"timeseries_chunk_size": self._timeseries_chunk_size}
-            )
-
-        # Update timeseries chunk size for all substances per area
+        # Update timeseries chunk size for all substances (per area) that have
+        # been created already
+        result_groups = [self.__dict__.get(x) for x in self.substances]
         for area in self.areas:
-            for substance in self.substances:
-                result_group = self.__getattribute__(area).__getattribute__(substance)
+            if area in self.__dict__:
+                result_groups += [
+                    self.__dict__[area].__dict__.get(x) for x in self.substances
+                ]
+        for result_group in result_groups:
+            if result_group is not None:
                 result_group.class_kwargs.update(
                     {"timeseries_chunk_size": self._timeseries_chunk_size}
                 )
@@ -985,35 +1235,13 @@ class CustomizedWaterQualityResultAdmin(GridH5Admin):
     def _set_substance_attributes_on_result_group(
         self, result_group: Nodes, substance: str
     ) -> None:
-        for key in self.netcdf_keys:
-            regex_match = re.search(rf"{substance}_(1|2)D", key)
-            if regex_match:
-                dataset = regex_match.group()
-                attrs_map = [("name", "substance_name"), ("units", "units")]
-                for attr, name in attrs_map:
-                    value = self.netcdf_file[dataset].attrs.get(name)
-                    if isinstance(value, bytes):
-                        value = value.decode("utf-8")
-                    elif isinstance(value, h5py.Empty):
-                        value = ""
-
-                    result_group.__setattr__(attr, value)
-
-    def _add_area_groups(self) -> None:
-        for key in self.netcdf_keys:
-            regex_match = re.search(r"Mesh\d{1,2}DNode_id_area\d+", key)
-            if regex_match:
-                # Set area as attribute and create area result admin
-                dataset_name = regex_match.group().split("_")[-1]
-                area_name = self.netcdf_file[key].attrs.get("area_name", dataset_name)
-                if not hasattr(self, dataset_name):
-                    self.areas += [dataset_name]
-                    self.__setattr__(
-                        dataset_name,
-                        _CustomizedWaterQualityAreaResultAdmin(
-                            self, dataset_name, area_name
-                        ),
-                    )
+        datasets = [
+            x
+            for x in self._netcdf_key_index[("substance", None, substance)]
+            if re.search(rf"{substance}_(1|2)D", x)
+        ]
+        if datasets:
+            _set_substance_attrs(result_group, self.netcdf_file[datasets[-1]])
 
     def close(self) -> None:
         super().close()
@@ -1063,18 +1291,23 @@ class _CustomizedWaterQualityAreaResultAdmin:
         area_name: str,
     ) -> None:
         self.cwqra = customized_result_admin
+        self.dataset_name = dataset_name
         self.name = area_name
         self._timeseries_chunk_size = customized_result_admin._timeseries_chunk_size
         self._grid_kwargs = customized_result_admin._grid_kwargs
 
-        for substance in self.cwqra.substances:
-            result_group = self.cwqra._build_substance_result_group(
-                substance, f"_{dataset_name}"
-            )
-            self.__setattr__(substance, result_group)
-            self.cwqra._set_substance_attributes_on_result_group(
-                result_group, substance
+    def __getattr__(self, name):
+        # Substances are set as attributes on first access
+        if "cwqra" not in self.__dict__ or name not in self.cwqra.substances:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
             )
+        result_group = self.cwqra._build_substance_result_group(
+            name, f"_{self.dataset_name}"
+        )
+        self.cwqra._set_substance_attributes_on_result_group(result_group, name)
+        setattr(self, name, result_group)
+        return result_group
 
 
 class GridH5DebugResultAdmin(GridH5ResultAdmin):
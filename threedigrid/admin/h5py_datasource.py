@@ -1,16 +1,97 @@
 # (c) Nelen & Schuurmans.  GPL licensed, see LICENSE.rst.
 
 import logging
+import os
 from collections import OrderedDict
 
 import numpy as np
 from h5py import Dataset
 
+from threedigrid.admin import constants
 from threedigrid.admin.h5py_swmr import H5SwmrFile
+from threedigrid.admin.utils import create_dataset
 from threedigrid.orm.base.datasource import DataSource
 
 logger = logging.getLogger(__name__)
 
+# (file revision, dataset name, source epsg, target epsg) -> reprojected values
+_reprojection_cache = OrderedDict()
+
+
+def read_dataset_range(dataset, index_filter):
+    """
+    Read the part of the dataset that is needed to apply index_filter on
+    its last axis.
+
+    Slices (with a positive step) and sorted index arrays only read their
+    index range from H5, for boolean masks all data is loaded (which
+    is WAY much faster than letting h5py apply the mask).
+
+    :return: the values read and the index_filter to apply on them
+    """
+    if isinstance(index_filter, slice):
+        if index_filter.step is None or index_filter.step > 0:
+            prefix = (slice(None),) * (len(dataset.shape) - 1)
+            return dataset[prefix + (index_filter,)], slice(None)
+    elif (
+        isinstance(index_filter, np.ndarray)
+        and index_filter.dtype != bool
+        and index_filter.size > 0
+    ):
+        start, stop = index_filter[0], index_filter[-1] + 1
+        prefix = (slice(None),) * (len(dataset.shape) - 1)
+        return dataset[prefix + (slice(start, stop),)], index_filter - start
+    return dataset[:], index_filter
+
+
+def get_file_revision(h5py_file):
+    """
+    :return: a key that identifies the contents of a read-only file, None
+        for writable files (or files that are not on disk)
+    """
+    try:
+        if h5py_file.mode != "r":
+            return None
+        stat = os.stat(h5py_file.filename)
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+    return os.path.realpath(h5py_file.filename), stat.st_mtime_ns, stat.st_size
+
+
+def get_reprojected_dataset(model, field_name, dataset):
+    """
+    Reproject all values of a static coordinate dataset (of a read-only
+    gridadmin file) once. The result is shared by all model instances and
+    filters and kept for the last REPROJECTION_CACHE_SIZE datasets.
+
+    :return: the reprojected values (read-only) or None if the dataset
+        cannot be cached
+    """
+    revision = get_file_revision(dataset.file)
+    if revision is None:
+        return None
+    key = (revision, dataset.name, str(model.epsg_code), str(model.reproject_to_epsg))
+    values = _reprojection_cache.get(key)
+    if values is not None:
+        _reprojection_cache.move_to_end(key)
+        return values
+
+    values = model._do_reproject_value(dataset[:], field_name, model.reproject_to_epsg)
+    values = np.asarray(values)
+    values.flags.writeable = False
+    if values.dtype == object:
+        for geometry in values:
+            if isinstance(geometry, np.ndarray):
+                geometry.flags.writeable = False
+    _reprojection_cache[key] = values
+    while len(_reprojection_cache) > constants.REPROJECTION_CACHE_SIZE:
+        _reprojection_cache.popitem(last=False)
+    return values
+
+
+def clear_reprojection_cache():
+    _reprojection_cache.clear()
+
 
 class H5pyGroup(DataSource):
     """
@@ -82,25 +163,42 @@ class H5pyGroup(DataSource):
             lookup_index = model._meta._get_lookup_index(reset=True)
 
         _filter = [slice(None)] * (len(value.shape) - 1) + [model.boolean_mask_filter]
-        if lookup_index is not None and isinstance(_filter[-1], np.ndarray):
+        if (
+            lookup_index is not None
+            and isinstance(_filter[-1], np.ndarray)
+            and _filter[-1].dtype == bool
+        ):
             if len(lookup_index) != len(_filter[-1]):
                 # slice the filter to match the length of the lookup index
                 _filter[-1] = np.array(_filter[-1][lookup_index])
 
-        # By default load all data from H5,
-        # this is WAY much faster
-        if isinstance(value, Dataset):
-            value = value[:]
+        reprojected = None
+        needs_reproject = (
+            model.reproject_to_epsg
+            and model._is_coords(field_name)
+            and str(model.reproject_to_epsg) != str(model.epsg_code)
+        )
+        if needs_reproject and isinstance(value, Dataset):
+            # Static coordinates: filter the cached reprojected values
+            reprojected = get_reprojected_dataset(model, field_name, value)
+
+        if reprojected is not None:
+            value = reprojected[tuple(_filter)]
+            if np.may_share_memory(value, reprojected):
+                value = value.copy()
+        else:
+            if isinstance(value, Dataset):
+                value, _filter[-1] = read_dataset_range(value, _filter[-1])
 
-        # Perform slicing by applying the mask
-        value = value[tuple(_filter)]
+            # Perform slicing by applying the mask
+            value = value[tuple(_filter)]
 
-        # Reproject any coordinates if a reproject_to_epsg is set and
-        # there are coordinatefields in the selection
-        if model.reproject_to_epsg and model._is_coords(field_name):
-            value = model._do_reproject_value(
-                value, field_name, model.reproject_to_epsg
-            )
+            # Reproject any coordinates if a reproject_to_epsg is set and
+            # there are coordinatefields in the selection
+            if needs_reproject:
+                value = model._do_reproject_value(
+                    value, field_name, model.reproject_to_epsg
+                )
 
         if isinstance(value, np.ma.core.MaskedArray):
             # Always return the data of a masked array
@@ -197,7 +295,7 @@ class H5pyGroup(DataSource):
             self._source[name][:] = values
         else:
             # Create
-            self._source.create_dataset(name, data=values)
+            create_dataset(self._source, name, data=values)
 
     def getattr(self, name):
         attr = self._h5py_file.attrs[name]
@@ -5,7 +5,7 @@ import logging
 import numpy as np
 
 from threedigrid.admin.constants import TYPE_CODE_MAP
-from threedigrid.admin.utils import get_or_create_group
+from threedigrid.admin.utils import create_dataset, get_or_create_group
 
 from . import constants
 
@@ -40,13 +40,18 @@ class IdMapper:
     ]
 
     def __init__(self, id_mapping):
-        self._id_mapping = id_mapping
+        # Hold the mapping in memory once, sorted by (obj_code, seq_id),
+        # so every object type is a contiguous slice that can be searched
+        id_mapping = id_mapping[:]
+        order = np.lexsort((id_mapping["seq_id"], id_mapping["obj_code"]))
+        self._id_mapping = id_mapping[order]
+        self._pk_sorters = {}
         self.obj_slices = None
         self._define_id_obj_slices()
 
     @property
     def id_mapping(self):
-        return self._id_mapping[:]
+        return self._id_mapping
 
     def get_by_name(self, obj_name):
         """
@@ -81,16 +86,71 @@ class IdMapper:
         return self.id_mapping[idx]
 
     def get_pk(self, obj_name, seq_id):
+        pks = self.get_pks(obj_name, [seq_id], fill_value=None)
+        if pks[0] is None:
+            raise IndexError("No {} with seq_id {}".format(obj_name, seq_id))
+        return pks[0]
+
+    def get_pks(self, obj_name, seq_ids, fill_value=0):
+        """
+        Get the pks of several objects of one type at once
+
+        :param obj_name: name of a given object, for example v2_channel
+        :param seq_ids: array of seq_ids to look up
+        :param fill_value: the pk for seq_ids that are not in the mapping
+
+        :return: array of pks with the same length as seq_ids
+        """
+        mapping = self._get_mapping(obj_name)
+        return self._lookup(mapping["seq_id"], mapping["pk"], seq_ids, None, fill_value)
+
+    def get_seq_ids(self, obj_name, pks, fill_value=0):
+        """
+        Get the seq_ids of several objects of one type at once
+
+        :param obj_name: name of a given object, for example v2_channel
+        :param pks: array of pks to look up
+        :param fill_value: the seq_id for pks that are not in the mapping
+
+        :return: array of seq_ids with the same length as pks
+        """
+        mapping = self._get_mapping(obj_name)
+        if obj_name not in self._pk_sorters:
+            self._pk_sorters[obj_name] = np.argsort(mapping["pk"], kind="stable")
+        return self._lookup(
+            mapping["pk"],
+            mapping["seq_id"],
+            pks,
+            self._pk_sorters[obj_name],
+            fill_value,
+        )
+
+    def _get_mapping(self, obj_name):
         obj_code = constants.TYPE_CODE_MAP[obj_name]
-        sl = self.obj_slices[obj_code]
-        return self.id_mapping[sl]["pk"][
-            np.where(self.id_mapping[sl]["seq_id"] == seq_id)
-        ][0]
+        return self.id_mapping[self.obj_slices.get(obj_code, slice(0, 0))]
+
+    @staticmethod
+    def _lookup(keys, values, to_find, sorter, fill_value):
+        to_find = np.asarray(to_find)
+        result_dtype = values.dtype if fill_value is not None else object
+        result = np.full(to_find.shape, fill_value, dtype=result_dtype)
+        if keys.size == 0 or to_find.size == 0:
+            return result
+
+        idx = np.searchsorted(keys, to_find, sorter=sorter)
+        idx[idx == keys.size] = 0
+        if sorter is not None:
+            idx = sorter[idx]
+        found = keys[idx] == to_find
+        result[found] = values[idx[found]]
+        return result
 
     def _define_id_obj_slices(self):
-        obj_codes = np.unique(self.id_mapping["obj_code"])
+        obj_codes, starts = np.unique(self.id_mapping["obj_code"], return_index=True)
+        ends = np.append(starts[1:], self.id_mapping.size)
         self.obj_slices = {
-            n: np.where(self.id_mapping["obj_code"] == n) for n in obj_codes
+            n: slice(start, end)
+            for n, start, end in zip(obj_codes.tolist(), starts, ends)
         }
 
     @staticmethod
@@ -117,10 +177,11 @@ class IdMapper:
             gr = get_or_create_group(h5py_file, constants.GROUP_MAPPINGS)
             dset = gr.get(constants.DSET_ID_MAPPING, None)
             if not dset:
-                gr.create_dataset(
+                create_dataset(
+                    gr,
                     constants.DSET_ID_MAPPING,
                     id_mapping.shape,
-                    dtype=dtype_dict,
+                    dtype=id_mapping.dtype,
                     data=id_mapping,
                 )
             logger.info("[+] Successfully added {} id mapping data to grid admin file")
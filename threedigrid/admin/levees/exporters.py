@@ -12,7 +12,7 @@ except ImportError:
 
 from threedigrid.admin import exporter_constants as const
 from threedigrid.geo_utils import get_spatial_reference
-from threedigrid.numpy_utils import reshape_flat_array
+from threedigrid.numpy_utils import multilines_to_wkb_array
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 logger = logging.getLogger(__name__)
@@ -68,26 +68,29 @@ class LeveeOgrExporter(BaseOgrExporter):
                 ogr.FieldDefn(field_name, const.OGR_FIELD_TYPE_MAP[field_type])
             )
         _definition = layer.GetLayerDefn()
-
-        for i in range(len(self._levees.geoms)):
-            if levee_data["id"][i] == 0:
-                continue  # skip the dummy element
-            line = ogr.Geometry(ogr.wkbLineString)
-            feature = ogr.Feature(_definition)
-            linepoints = reshape_flat_array(levee_data["coords"][i]).T
-            for x in linepoints:
-                line.AddPoint(x[0], x[1])
-            feature.SetGeometry(line)
-            # for field_name, field_type in fields.iteritems():
-            #     raw_value = levee_data[field_name][i]
-            #     print("raw_value  ", raw_value)
-            #     value = TYPE_FUNC_MAP[field_type](raw_value)
-            #     print("value  ", value)
-
-            self.set_field(feature, "id", "int", levee_data["id"][i])
-            self.set_field(feature, "cr_level", "float", levee_data["crest_level"][i])
-            self.set_field(
-                feature, "mx_depth", "float", levee_data["max_breach_depth"][i]
-            )
-            layer.CreateFeature(feature)
-            feature.Destroy()
+        chunk_size = kwargs.get("chunk_size")
+        for levee_data in self.iter_data(
+            data_source, self._levees, levee_data, chunk_size
+        ):
+            lines = multilines_to_wkb_array(levee_data["coords"])
+
+            for i in range(len(lines)):
+                if levee_data["id"][i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(lines[i]))
+                # for field_name, field_type in fields.iteritems():
+                #     raw_value = levee_data[field_name][i]
+                #     print("raw_value  ", raw_value)
+                #     value = TYPE_FUNC_MAP[field_type](raw_value)
+                #     print("value  ", value)
+
+                self.set_field(feature, "id", "int", levee_data["id"][i])
+                self.set_field(
+                    feature, "cr_level", "float", levee_data["crest_level"][i]
+                )
+                self.set_field(
+                    feature, "mx_depth", "float", levee_data["max_breach_depth"][i]
+                )
+                layer.CreateFeature(feature)
+                feature.Destroy()
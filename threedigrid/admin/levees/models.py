@@ -13,7 +13,7 @@ except ImportError:
 
 from threedigrid.admin.levees import exporters
 from threedigrid.geo_utils import raise_import_exception
-from threedigrid.numpy_utils import reshape_flat_array
+from threedigrid.numpy_utils import multilines_to_wkb_array
 from threedigrid.orm.fields import ArrayField, MultiLineArrayField
 from threedigrid.orm.models import Model
 
@@ -50,9 +50,5 @@ class Levees(Model):
 
         if self._geoms:
             return
-        for line_coords in self.coords:
-            line = ogr.Geometry(ogr.wkbLineString)
-            linepoints = reshape_flat_array(line_coords).T
-            for x in linepoints:
-                line.AddPoint(x[0], x[1])
-            self._geoms.append(line)
+        for wkb in multilines_to_wkb_array(self.coords):
+            self._geoms.append(ogr.CreateGeometryFromWkb(wkb))
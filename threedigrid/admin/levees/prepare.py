@@ -3,6 +3,8 @@
 import h5py
 import numpy as np
 
+from threedigrid.admin.utils import create_dataset
+
 DT_VARIABLE = h5py.special_dtype(vlen=np.dtype("float64"))
 
 
@@ -19,13 +21,13 @@ class PrepareLevees:
         dset_coords = gr.create_dataset(
             "coords", (len(v2_levee_instances),), dtype=DT_VARIABLE
         )
-        dset_clevel = gr.create_dataset(
-            "crest_level", (len(v2_levee_instances),), dtype="f8"
+        dset_clevel = create_dataset(
+            gr, "crest_level", (len(v2_levee_instances),), dtype="f8"
         )
-        dset_mbreach_depth = gr.create_dataset(
-            "max_breach_depth", (len(v2_levee_instances),), dtype="f8"
+        dset_mbreach_depth = create_dataset(
+            gr, "max_breach_depth", (len(v2_levee_instances),), dtype="f8"
         )
-        dset_id = gr.create_dataset("id", (len(v2_levee_instances),), dtype="i4")
+        dset_id = create_dataset(gr, "id", (len(v2_levee_instances),), dtype="i4")
         for i, levee in enumerate(v2_levee_instances):
             # "F" means to flatten in column-major (Fortran- style) order
             dset_coords[i] = np.array(levee.the_geom.coords).flatten("F")
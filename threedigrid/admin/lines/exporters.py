@@ -12,16 +12,12 @@ try:
 except ImportError:
     ogr = None
 
-try:
-    from shapely import geometry as shapely_geom
-except ImportError:
-    shapely_geom = None
-
 
 from threedigrid.admin import exporter_constants as const
 from threedigrid.admin.constants import LINE_BASE_FIELDS_ALL, LINE_FIELD_NAME_MAP
 from threedigrid.admin.utils import KCUDescriptor
-from threedigrid.geo_utils import get_spatial_reference, raise_import_exception
+from threedigrid.geo_utils import get_spatial_reference
+from threedigrid.numpy_utils import lines_to_wkb_array, multilines_to_wkb_array
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 logger = logging.getLogger(__name__)
@@ -65,10 +61,6 @@ class LinesOgrExporter(BaseOgrExporter):
         if "geom" in kwargs:
             geom_source = kwargs["geom"]
 
-        # shapely is needed for the LineString creation, check if installed
-        if geom_source == "from_spatialite" and shapely_geom is None:
-            raise_import_exception("shapely")
-
         self.del_datasource(file_name)
         data_source = self.driver.CreateDataSource(file_name)
         layer = data_source.CreateLayer(str(os.path.basename(file_name)), sr, geomtype)
@@ -79,47 +71,41 @@ class LinesOgrExporter(BaseOgrExporter):
             )
         _definition = layer.GetLayerDefn()
 
-        node_a = line_data["line"][0]
-        node_b = line_data["line"][1]
-        for i in range(node_a.size):
-            if line_data["id"][i] == 0:
-                continue  # skip the dummy element
+        chunk_size = kwargs.get("chunk_size")
+        for line_data in self.iter_data(
+            data_source, self._lines, line_data, chunk_size
+        ):
+            node_a = line_data["line"][0]
+            node_b = line_data["line"][1]
             if geom_source == "from_threedicore":
-                line = ogr.Geometry(ogr.wkbLineString)
-                line.AddPoint(
-                    line_data["line_coords"][0][i], line_data["line_coords"][1][i]
-                )
-                line.AddPoint(
-                    line_data["line_coords"][2][i], line_data["line_coords"][3][i]
-                )
+                geometries = lines_to_wkb_array(line_data["line_coords"])
             elif geom_source == "from_spatialite":
-                linepoints = (
-                    line_data["line_geometries"][i].reshape(2, -1).T.astype("float64")
-                )
-                line_geom = shapely_geom.LineString(linepoints)
-                line = ogr.CreateGeometryFromWkt(line_geom.wkt)
-
-            feature = ogr.Feature(_definition)
-            feature.SetGeometry(line)
-            for field_name, field_type in fields.items():
-                fname = LINE_FIELD_NAME_MAP.get(field_name, field_name)
-                if field_name == "kcu_descr":
-                    raw_value = ""
-                    try:
-                        raw_value = str(kcu_dict[int(line_data["kcu"][i])])
-                    except KeyError:
-                        pass
-                elif field_name == "node_a":
-                    raw_value = node_a[i]
-                elif field_name == "node_b":
-                    raw_value = node_b[i]
-                else:
-                    try:
-                        raw_value = line_data[fname][i]
-                    except IndexError:
-                        raw_value = None
-
-                self.set_field(feature, field_name, field_type, raw_value)
-
-            layer.CreateFeature(feature)
-            feature.Destroy()
+                geometries = multilines_to_wkb_array(line_data["line_geometries"])
+
+            for i in range(node_a.size):
+                if line_data["id"][i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(geometries[i]))
+                for field_name, field_type in fields.items():
+                    fname = LINE_FIELD_NAME_MAP.get(field_name, field_name)
+                    if field_name == "kcu_descr":
+                        raw_value = ""
+                        try:
+                            raw_value = str(kcu_dict[int(line_data["kcu"][i])])
+                        except KeyError:
+                            pass
+                    elif field_name == "node_a":
+                        raw_value = node_a[i]
+                    elif field_name == "node_b":
+                        raw_value = node_b[i]
+                    else:
+                        try:
+                            raw_value = line_data[fname][i]
+                        except IndexError:
+                            raw_value = None
+
+                    self.set_field(feature, field_name, field_type, raw_value)
+
+                layer.CreateFeature(feature)
+                feature.Destroy()
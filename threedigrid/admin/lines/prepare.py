@@ -3,7 +3,6 @@
 import h5py
 import numpy as np
 from shapely import wkt
-from shapely.geometry import MultiPoint, Point
 
 from threedigrid.admin import constants
 from threedigrid.admin.prepare_utils import (
@@ -20,6 +19,90 @@ def as_numpy_array(array):
     return array[:]
 
 
+def _round_distances(distances):
+    """Round distances to mm, exactly like the builtin round()"""
+    return np.array([round(x, 3) for x in distances.tolist()], dtype=np.float64)
+
+
+def _segment_lengths(coords):
+    delta = np.diff(coords, axis=0)
+    return np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+
+def _vertex_measures(coords):
+    """
+    :return: the cumulative distance along the line of every vertex
+    """
+    return np.concatenate([[0.0], np.cumsum(_segment_lengths(coords))])
+
+
+def _project(coords, measures, points):
+    """
+    Vectorized ``LineString.project`` of several points onto a single line
+
+    :return: for every point the distance along the line to the nearest
+        point on the line
+    """
+    p0, p1 = coords[:-1], coords[1:]
+    delta = p1 - p0
+    len2 = delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1]
+    rel = points[:, None, :] - p0[None, :, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (rel[..., 0] * delta[:, 0] + rel[..., 1] * delta[:, 1]) / len2
+    r[:, len2 == 0] = 0.0
+    r[np.all(points[:, None, :] == p1[None, :, :], axis=-1)] = 1.0
+    r[np.all(rel == 0, axis=-1)] = 0.0
+    r = np.clip(r, 0.0, 1.0)
+
+    offset = points[:, None, :] - (p0[None, :, :] + r[..., None] * delta[None, :, :])
+    distance = np.sqrt(
+        offset[..., 0] * offset[..., 0] + offset[..., 1] * offset[..., 1]
+    )
+
+    # the first segment with the minimum distance
+    segment = np.argmin(distance, axis=1)
+    segment_r = r[np.arange(len(points)), segment]
+    return measures[segment] + segment_r * _segment_lengths(coords)[segment]
+
+
+def _interpolate(coords, measures, distances):
+    """
+    Vectorized ``LineString.interpolate`` of several distances along a
+    single line
+
+    :return: the points at the distances along the line
+    """
+    # the first segment that ends beyond the distance
+    segment = np.searchsorted(measures[1:], distances, side="right")
+    beyond_end = segment >= len(coords) - 1
+    segment = np.minimum(segment, len(coords) - 2)
+    p0, p1 = coords[segment], coords[segment + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (distances - measures[segment]) / _segment_lengths(coords)[segment]
+    points = (p1 - p0) * fraction[:, None] + p0
+    points[fraction <= 0.0] = p0[fraction <= 0.0]
+    points[fraction >= 1.0] = p1[fraction >= 1.0]
+    points[distances <= 0.0] = coords[0]
+    points[beyond_end] = coords[-1]
+    return points
+
+
+def _snap_points(coords, measures, points, kcu_array):
+    """
+    Snap the points of calc lines with kcu 0 onto the line
+
+    :return: the (snapped) points and their distance along the line,
+        rounded to mm
+    """
+    points = np.array(points, dtype=np.float64)
+    snap = np.asarray(kcu_array) == 0
+    if np.any(snap):
+        points[snap] = _interpolate(
+            coords, measures, _project(coords, measures, points[snap])
+        )
+    return points, _round_distances(_project(coords, measures, points))
+
+
 class PrepareLines:
     @staticmethod
     def get_1d_object_info(datasource, id_mapper):
@@ -43,24 +126,49 @@ class PrepareLines:
         filter_1d = (_tmp_kcu >= 0) & (_tmp_kcu <= 5)
 
         lik_all = as_numpy_array(datasource["lik"])
-        lik_1d = as_numpy_array(datasource["lik"])[filter_1d]
+        lik_1d = lik_all[filter_1d]
 
         content_pk = np.zeros(lik_all.shape, dtype="i4")
         content_type = np.zeros(lik_all.shape, dtype="U32")
 
-        _content_pk = np.zeros(lik_1d.shape, dtype="i4")
-        _content_type = np.zeros(lik_1d.shape, dtype="U32")
-
-        for line_type in LINE_TYPES:
+        # Collect the (seq_id, pk, line type) of all 1d objects, in the
+        # order of LINE_TYPES so that later entries take precedence
+        id_mapping = id_mapper.id_mapping
+        seq_ids, pks, type_indices = [], [], []
+        for type_index, line_type in enumerate(LINE_TYPES):
             line_code = constants.TYPE_CODE_MAP[line_type]
             mapper_idx = id_mapper.obj_slices.get(line_code)
             if mapper_idx is None:
                 continue
-            seq_ids = id_mapper.id_mapping[mapper_idx]["seq_id"]
-            for i in range(len(seq_ids)):
-                slice1 = np.where(lik_1d == seq_ids[i])
-                _content_pk[slice1] = id_mapper.id_mapping[mapper_idx]["pk"][i]
-                _content_type[slice1] = line_type
+            mapping = id_mapping[mapper_idx]
+            seq_ids.append(mapping["seq_id"])
+            pks.append(mapping["pk"])
+            type_indices.append(np.full(mapping.shape, type_index))
+
+        if not seq_ids or lik_1d.size == 0:
+            return content_pk, content_type
+
+        seq_ids = np.concatenate(seq_ids)
+        pks = np.concatenate(pks)
+        type_indices = np.concatenate(type_indices)
+
+        # Sort on seq_id and keep the last entry for every seq_id
+        order = np.argsort(seq_ids, kind="stable")
+        sorted_seq_ids = seq_ids[order]
+        is_last = np.append(sorted_seq_ids[1:] != sorted_seq_ids[:-1], True)
+        order = order[is_last]
+        sorted_seq_ids = sorted_seq_ids[is_last]
+
+        # Join the 1d lines on seq_id
+        idx = np.searchsorted(sorted_seq_ids, lik_1d)
+        idx[idx == sorted_seq_ids.size] = 0
+        found = sorted_seq_ids[idx] == lik_1d
+        match = order[idx[found]]
+
+        _content_pk = np.zeros(lik_1d.shape, dtype="i4")
+        _content_type = np.zeros(lik_1d.shape, dtype="U32")
+        _content_pk[found] = pks[match]
+        _content_type[found] = np.array(LINE_TYPES, dtype="U32")[type_indices[match]]
 
         content_pk[filter_1d] = _content_pk
         content_type[filter_1d] = _content_type
@@ -94,16 +202,28 @@ class PrepareLines:
         end_x = datasource["line_coords"][2][:]
         end_y = datasource["line_coords"][3][:]
         kcu = datasource["kcu"][:]
-        xys = np.array(list(zip(start_x.T, end_x.T, start_y.T, end_y.T)))
+        content_pk = datasource["content_pk"][:]
+        content_type = datasource["content_type"][:]
+        xys = np.column_stack([start_x, end_x, start_y, end_y])
         for i in range(len(line_geometries)):
-            line_geometries[i] = np.array(xys[i])
+            line_geometries[i] = xys[i]
 
         for line_type, db_objects in line_db_dict.items():
-            for db_object in db_objects:
-                line_idx = np.where(
-                    (datasource["content_pk"][:] == db_object.pk)
-                    & (datasource["content_type"][:] == line_type)
-                )[0]
+            # Group the line indexes of line_type by content_pk with a
+            # single (stable) argsort, the line indexes of a db object are
+            # a contiguous (ascending) range in type_idx
+            type_idx = np.flatnonzero(content_type == line_type)
+            type_idx = type_idx[np.argsort(content_pk[type_idx], kind="stable")]
+            sorted_pk = content_pk[type_idx]
+
+            db_pks = np.array([db_object.pk for db_object in db_objects])
+            starts = np.searchsorted(sorted_pk, db_pks, side="left")
+            ends = np.searchsorted(sorted_pk, db_pks, side="right")
+
+            for db_object, start, end in zip(db_objects, starts, ends):
+                if start == end:
+                    continue
+                line_idx = type_idx[start:end]
                 geom = wkt.loads(db_object.the_geom.wkt)
                 line_geometries[line_idx] = PrepareLines._cut_geometries(
                     geom,
@@ -137,69 +257,83 @@ class PrepareLines:
                 [x1, x2, y1, y2]
             ]
         """
-
         cut_geometries = np.zeros((len(start_x),), dtype=DT_VARIABLE)
-        start_points = MultiPoint(list(zip(start_x, start_y)))
-        end_points = MultiPoint(list(zip(end_x, end_y)))
+        if len(start_x) == 0:
+            return cut_geometries
+
+        # Don't use the z-coordinate
+        coords = np.asarray(geom.coords, dtype=np.float64)[:, :2]
+        measures = _vertex_measures(coords)
+        # distance along the line of every vertex
+        vertex_distances = _round_distances(measures)
+
+        start_pnts, start_dists = _snap_points(
+            coords, measures, np.column_stack([start_x, start_y]), kcu_array
+        )
+        end_pnts, end_dists = _snap_points(
+            coords, measures, np.column_stack([end_x, end_y]), kcu_array
+        )
+
+        # When the drawing direction of a piece does not correspond with its
+        # start and end points, the start and end points of all following
+        # pieces are swapped. So they are swapped for a piece if the last
+        # preceding piece with differing distances had its start distance
+        # beyond its end distance.
+        differs = start_dists != end_dists
+        last_differing = np.maximum.accumulate(
+            np.where(differs, np.arange(len(differs)), -1)
+        )
+        swapped = np.concatenate(
+            [
+                [False],
+                ((last_differing >= 0) & (start_dists > end_dists)[last_differing])[
+                    :-1
+                ],
+            ]
+        )
+        start_pnts, end_pnts = (
+            np.where(swapped[:, None], end_pnts, start_pnts),
+            np.where(swapped[:, None], start_pnts, end_pnts),
+        )
+        start_dists, end_dists = (
+            np.where(swapped, end_dists, start_dists),
+            np.where(swapped, start_dists, end_dists),
+        )
+
+        # no additional calc points
+        no_calc_points = (start_dists <= 0.0) & (end_dists >= measures[-1])
+
+        # should not happen but sometimes drawing direction does not
+        # correspond with start and endpoints, so flip the distances
+        # (but not the points)
+        start_dists, end_dists = (
+            np.minimum(start_dists, end_dists),
+            np.maximum(start_dists, end_dists),
+        )
+
+        # The pieces run from the first vertex at or beyond the start distance
+        # up to the first vertex at or beyond the end distance. The start
+        # point is only added if it does not coincide with that vertex.
+        start_i = np.searchsorted(vertex_distances, start_dists, side="left")
+        end_i = np.searchsorted(vertex_distances, end_dists, side="left")
+        has_end = end_i < len(vertex_distances)
+        start_on_vertex = np.zeros(len(start_i), dtype=bool)
+        start_on_vertex[has_end] = (
+            vertex_distances[start_i[has_end]] == start_dists[has_end]
+        )
 
         for piece in range(len(cut_geometries)):
-            kcu = kcu_array[piece]
-            if kcu == 0:
-                start_pnt = geom.interpolate(geom.project(start_points[piece]))
-                end_pnt = geom.interpolate(geom.project(end_points[piece]))
+            if has_end[piece]:
+                linestring = coords[start_i[piece] : end_i[piece]]
+                if not start_on_vertex[piece]:
+                    linestring = np.vstack([start_pnts[piece], linestring])
+            elif no_calc_points[piece]:
+                linestring = np.vstack([start_pnts[piece], coords[1:-1]])
             else:
-                start_pnt = start_points[piece]
-                end_pnt = end_points[piece]
-            start_distance = round(geom.project(start_pnt), 3)
-            end_distance = round(geom.project(end_pnt), 3)
-
-            # Don't use the z-coordinate
-            if geom.has_z:
-                coords = [(x, y) for x, y, z in geom.coords]
-            else:
-                coords = list(geom.coords)
-            start_set = False
-            # no additional calc points
-            if start_distance <= 0.0 and end_distance >= geom.length:
-                linestring = np.array(
-                    [(start_pnt.x, start_pnt.y)]
-                    + coords[1:-1]
-                    + [(end_pnt.x, end_pnt.y)]
-                )
-                # "F" means to flatten in column-major (Fortran- style) order
-                cut_geometries[piece] = linestring.flatten("F")
-
-            for i, p in enumerate(coords):
-                # dist to vertex
-                pd = round(geom.project(Point(p)), 3)
-
-                # should not happen but sometimes drawing direction does not
-                # correspond with start and endpoints, so flip them
-                if start_distance > end_distance:
-                    # This is not safe!!!!!!
-                    # TODO: check if this actually can happen
-                    start_distance, end_distance = end_distance, start_distance
-                    start_points, end_points = end_points, start_points
-
-                # check for start point
-                if (pd == start_distance) and not start_set:
-                    start_pnt = []
-                    start_i = i
-                    start_set = True
-                # should not happen but in case pd (point) and first vertex
-                # do not have the same position move pd back
-                elif (pd > start_distance) and not start_set:
-                    start_pnt = [(start_pnt.x, start_pnt.y)]
-                    start_i = i
-                    start_set = True
-                if pd >= end_distance:
-                    linestring = np.array(
-                        start_pnt + coords[start_i:i] + [(end_pnt.x, end_pnt.y)]
-                    )
-                    # "F" means to flatten in column-major (Fortran- style)
-                    # order
-                    cut_geometries[piece] = linestring.flatten("F")
-                    break
+                continue
+            linestring = np.vstack([linestring, end_pnts[piece]])
+            # "F" means to flatten in column-major (Fortran- style) order
+            cut_geometries[piece] = linestring.flatten("F")
 
         return cut_geometries
 
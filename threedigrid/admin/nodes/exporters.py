@@ -16,6 +16,7 @@ from threedigrid.admin.constants import (
     NODE_FIELD_NAME_MAP,
 )
 from threedigrid.geo_utils import get_spatial_reference
+from threedigrid.numpy_utils import bboxes_to_wkb_array, points_to_wkb_array
 from threedigrid.orm.base.exporters import BaseOgrExporter
 
 logger = logging.getLogger(__name__)
@@ -60,24 +61,25 @@ class NodesOgrExporter(BaseOgrExporter):
                 ogr.FieldDefn(str(field_name), const.OGR_FIELD_TYPE_MAP[field_type])
             )
         _definition = layer.GetLayerDefn()
-
-        for i in range(node_data["id"].size):
-            if node_data["id"][i] == 0:
-                continue  # skip the dummy element
-            point = ogr.Geometry(ogr.wkbPoint)
-            point.AddPoint(
-                node_data["coordinates"][0][i], node_data["coordinates"][1][i]
-            )
-            feature = ogr.Feature(_definition)
-            feature.SetGeometry(point)
-            for field_name, field_type in fields.items():
-                fname = NODE_FIELD_NAME_MAP[field_name]
-                try:
-                    raw_value = node_data[fname][i]
-                except IndexError:
-                    raw_value = None
-                self.set_field(feature, field_name, field_type, raw_value)
-            layer.CreateFeature(feature)
+        chunk_size = kwargs.get("chunk_size")
+        for node_data in self.iter_data(
+            data_source, self._nodes, node_data, chunk_size
+        ):
+            points = points_to_wkb_array(node_data["coordinates"])
+
+            for i in range(node_data["id"].size):
+                if node_data["id"][i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(points[i]))
+                for field_name, field_type in fields.items():
+                    fname = NODE_FIELD_NAME_MAP[field_name]
+                    try:
+                        raw_value = node_data[fname][i]
+                    except IndexError:
+                        raw_value = None
+                    self.set_field(feature, field_name, field_type, raw_value)
+                layer.CreateFeature(feature)
 
 
 class CellsOgrExporter(BaseOgrExporter):
@@ -124,38 +126,19 @@ class CellsOgrExporter(BaseOgrExporter):
             )
 
         _definition = layer.GetLayerDefn()
-        for i in range(cells_data["id"].size):
-            if cells_data["id"][i] == 0:
-                continue  # skip the dummy element
-            feature = ogr.Feature(_definition)
-            # Create ring
-            ring = ogr.Geometry(ogr.wkbLinearRing)
-            ring.AddPoint(
-                cells_data["cell_coords"][0][i], cells_data["cell_coords"][1][i]
-            )
-
-            ring.AddPoint(
-                cells_data["cell_coords"][2][i], cells_data["cell_coords"][1][i]
-            )
-
-            ring.AddPoint(
-                cells_data["cell_coords"][2][i], cells_data["cell_coords"][3][i]
-            )
-
-            ring.AddPoint(
-                cells_data["cell_coords"][0][i], cells_data["cell_coords"][3][i]
-            )
-
-            ring.AddPoint(
-                cells_data["cell_coords"][0][i], cells_data["cell_coords"][1][i]
-            )
-
-            # Create polygon from ring
-            poly = ogr.Geometry(ogr.wkbPolygon)
-            poly.AddGeometry(ring)
-            feature.SetGeometry(poly)
-            self.set_field(feature, "nod_id", "int", cells_data["id"][i])
-            self.set_field(
-                feature, "bottom_lev", "float", cells_data["z_coordinate"][i]
-            )
-            layer.CreateFeature(feature)
+        chunk_size = kwargs.get("chunk_size")
+        for cells_data in self.iter_data(
+            data_source, self._cells, cells_data, chunk_size
+        ):
+            polygons = bboxes_to_wkb_array(cells_data["cell_coords"])
+
+            for i in range(cells_data["id"].size):
+                if cells_data["id"][i] == 0:
+                    continue  # skip the dummy element
+                feature = ogr.Feature(_definition)
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(polygons[i]))
+                self.set_field(feature, "nod_id", "int", cells_data["id"][i])
+                self.set_field(
+                    feature, "bottom_lev", "float", cells_data["z_coordinate"][i]
+                )
+                layer.CreateFeature(feature)
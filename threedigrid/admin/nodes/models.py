@@ -17,7 +17,11 @@ import numpy as np
 
 from threedigrid.admin.nodes import exporters, subsets
 from threedigrid.geo_utils import transform_xys
-from threedigrid.numpy_utils import get_smallest_uint_dtype
+from threedigrid.numpy_utils import (
+    get_boxes_at_points,
+    get_smallest_uint_dtype,
+    rasterize_boxes,
+)
 from threedigrid.orm.base.fields import BooleanArrayField
 from threedigrid.orm.fields import (
     ArrayField,
@@ -194,6 +198,54 @@ class Cells(Nodes):
         id = inst.filter(cell_coords__contains_point=xy).id
         return id.tolist()
 
+    def get_ids_from_xys(self, xs, ys, xy_epsg_code=None, subset_name=None):
+        """
+        Batch version of get_id_from_xy: get the cell containing each point.
+
+        The points are reprojected in one go and looked up per refinement
+        level on the lattice of the cells, in pixel coordinates. A point on
+        the edge between two cells gets the cell with the larger x (or y).
+
+        :param xs: array with x coordinates in xy_epsg_code
+        :param ys: array with y coordinates in xy_epsg_code
+        :param xy_epsg_code: epsg code of the coordinates, defaults to the
+            epsg code of the model
+        :param subset_name: filter on a subset of cells
+
+        :return: numpy array with per point the cell id, 0 if there is none
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xy_epsg_code and xy_epsg_code != self.epsg_code and xs.size > 0:
+            xs, ys = transform_xys(xs, ys, xy_epsg_code, self.epsg_code)
+
+        inst = self
+        if subset_name:
+            inst = self.subset(subset_name)
+        data = inst.only("id", "pixel_coords", "cell_coords").data
+        pixel_coords, cell_coords = data["pixel_coords"], data["cell_coords"]
+        valid = ~np.any(pixel_coords == -9999, axis=0)
+        result = np.zeros(xs.shape, dtype=data["id"].dtype)
+        if not np.any(valid):
+            return result
+
+        # derive the pixel size and origin from the first valid cell
+        first = np.argmax(valid)
+        pixel_size = (cell_coords[2, first] - cell_coords[0, first]) / (
+            pixel_coords[2, first] - pixel_coords[0, first]
+        )
+        origin_x = cell_coords[0, first] - pixel_coords[0, first] * pixel_size
+        origin_y = cell_coords[1, first] - pixel_coords[1, first] * pixel_size
+
+        index = get_boxes_at_points(
+            pixel_coords[:, valid],
+            (xs - origin_x) / pixel_size,
+            (ys - origin_y) / pixel_size,
+        )
+        found = index != -1
+        result[found] = data["id"][valid][index[found]]
+        return result
+
     def get_ids_from_pix_bbox(self, bbox, subset_name="2D_OPEN_WATER"):
         """
         :param x: the x coordinate in xy_epsg_code
@@ -209,7 +261,7 @@ class Cells(Nodes):
         id = inst.filter(pixel_coords__intersects_bbox=bbox).id
         return id.tolist()
 
-    def get_nodgrid(self, pix_bbox, subset_name="2D_OPEN_WATER"):
+    def get_nodgrid(self, pix_bbox, subset_name="2D_OPEN_WATER", out=None):
         ids = np.array(
             self.get_ids_from_pix_bbox(pix_bbox, subset_name=subset_name),
             dtype=np.int32,
@@ -221,6 +273,7 @@ class Cells(Nodes):
             int(pix_bbox[3] - pix_bbox[1]),
             int(pix_bbox[0]),
             int(pix_bbox[1]),
+            out=out,
         )
         return nodgrid[::-1, ::]
 
@@ -243,18 +296,25 @@ class Cells(Nodes):
         ymax = coords[3].max()
         return xmin, ymin, xmax, ymax
 
-    def iter_by_tile(self, width, height):
+    def iter_by_tile(self, width, height, order=None):
         """Iterate over groups of cells given a tile shape (in pixels).
 
         The tiles are always aligned to pixel (0, 0) so that a single grid cell
         never overlaps with multiple tiles. For the the same reason, the tile
         size should be an integer multiple of the maximum cell size.
 
+        The cells are binned into the tiles once, up front.
+
         :param width: the width of the tile in pixels
         :param height: the height of the tile in pixels
+        :param order: None to iterate column by column (x, then y), or
+            "morton" to iterate the tiles in Z-order
 
         :yield: (xmin, ymin, xmax, ymax), cells
         """
+        if order not in (None, "morton"):
+            raise ValueError("order should be None or 'morton', not {}".format(order))
+
         # determine the width of the largest cell
         cell_size = self.pixel_width.max()
         if width % cell_size != 0 or height % cell_size != 0:
@@ -270,19 +330,37 @@ class Cells(Nodes):
         j1 = int(ymin // height)
         i2 = int(np.ceil(float(xmax) / width))
         j2 = int(np.ceil(float(ymax) / height))
+        tiles_j = j2 - j1
+
+        # bin the cells into tiles, a cell is in the tile of its lower left
+        # corner (cells without pixel coordinates are in no tile)
+        indexes = np.asarray(self._get_indexes())
+        pixel_coords = self.pixel_coords
+        valid = ~np.any(pixel_coords == -9999, axis=0)
+        tile_i = pixel_coords[0][valid] // width - i1
+        tile_j = pixel_coords[1][valid] // height - j1
+        tile_nr = tile_i * tiles_j + tile_j
+        sort_idx = np.argsort(tile_nr, kind="stable")
+        tile_indexes = indexes[valid][sort_idx]
+        bounds = np.searchsorted(tile_nr[sort_idx], np.arange((i2 - i1) * tiles_j + 1))
+
+        tiles = itertools.product(range(i1, i2), range(j1, j2))
+        if order == "morton":
+            tiles = sorted(tiles, key=lambda x: _morton_code(x[0] - i1, x[1] - j1))
 
         # yield the tiles
-        for i, j in itertools.product(range(i1, i2), range(j1, j2)):
+        for i, j in tiles:
             x1, y1, x2, y2 = (
                 i * width,
                 j * height,
                 (i + 1) * width,
                 (j + 1) * height,
             )
-            result = self.filter(
-                pixel_coords__intersects_bbox=(x1 + 1, y1 + 1, x2 - 1, y2 - 1)
+            nr = (i - i1) * tiles_j + (j - j1)
+            yield (
+                (x1, y1, x2, y2),
+                self._select_indexes(tile_indexes[bounds[nr] : bounds[nr + 1]]),
             )
-            yield (x1, y1, x2, y2), result
 
     @property
     def gpkg_field_map(self):
@@ -352,19 +430,19 @@ class Grid(Model):
         origin_y = float(self._datasource["y0p"][()])
         return size, 0.0, origin_x, 0.0, size, origin_y
 
-    def get_pixel_map(self, dem_pixelsize, dem_shape):
+    def get_pixel_map(self, dem_pixelsize, dem_shape, out=None):
         """
         get the node grid to pixel map
 
         :param dem_pixelsize: pixelsize of the geo tiff
         :param dem_shape: shape of the numpy representation of the geo tiff
+        :param out: optional array of dem_shape to write the map into
 
         :return: flipped array of the dem_shape that matches the geotiff
         """
 
         # Convert nod_grid to smallest uint type possible
         dtype = get_smallest_uint_dtype(maxval=self.n2dtot)
-        grid_arr = np.zeros(dem_shape, dtype=dtype)
 
         # applies for for 2D nodes only
         _k = self.nodk[0 : self.n2dtot + 1] - 1
@@ -374,30 +452,41 @@ class Grid(Model):
         # the size in pixels of each grid cell
         _size = self.dx[_k] / dem_pixelsize
         # corresponding node index
-        _ind = np.arange(0, self.n2dtot + 1, dtype="int")
-
-        n_slice_start = np.array(_n * _size, dtype="int")
-        n_slice_end = np.array((_n * _size) + _size, dtype="int")
-        n_slice = list(zip(n_slice_start, n_slice_end))
-        m_slice_start = np.array(_m * _size, dtype="int")
-        m_slice_end = np.array((_m * _size) + _size, dtype="int")
-        m_slice = list(zip(m_slice_start, m_slice_end))
-
-        for ns, ms, idx in zip(n_slice, m_slice, _ind):
-            axis_x = slice(*ns)
-            axis_y = slice(*ms)
-            grid_arr[axis_x, axis_y] = idx
+        _ind = np.arange(0, self.n2dtot + 1, dtype=dtype)
+
+        boxes = np.array(
+            [
+                np.array(_m * _size, dtype="int"),
+                np.array(_n * _size, dtype="int"),
+                np.array((_m * _size) + _size, dtype="int"),
+                np.array((_n * _size) + _size, dtype="int"),
+            ]
+        )
+        if out is None:
+            out = np.zeros(dem_shape, dtype=dtype)
+        grid_arr = rasterize_boxes(boxes, _ind, dem_shape, out=out)
 
         # flip upside-down to match geotiff
         return grid_arr[::-1, ::]
 
 
-def create_nodgrid(pixel_coords, ids, width, height, offset_i, offset_j):
-    grid_arr = np.zeros((height, width), dtype=np.int32)
-    for id in ids:
-        i0 = np.maximum(pixel_coords[0, id], offset_i) - offset_i
-        i1 = np.minimum(pixel_coords[2, id], offset_i + width) - offset_i
-        j0 = np.maximum(pixel_coords[1, id], offset_j) - offset_j
-        j1 = np.minimum(pixel_coords[3, id], offset_j + height) - offset_j
-        grid_arr[j0:j1, i0:i1] = id
-    return grid_arr
+def _morton_code(i, j):
+    """Interleave the bits of i and j (Z-order curve)"""
+    code = 0
+    for bit in range(max(i.bit_length(), j.bit_length())):
+        code |= ((i >> bit) & 1) << (2 * bit) | ((j >> bit) & 1) << (2 * bit + 1)
+    return code
+
+
+def create_nodgrid(pixel_coords, ids, width, height, offset_i, offset_j, out=None):
+    """
+    :param out: optional int32 array of shape (height, width) to write the
+        node grid into, to reuse a buffer when creating several tiles
+    :return: array with the cell id of every pixel, 0 where there is no cell
+    """
+    ids = np.asarray(ids)
+    if out is None:
+        out = np.zeros((height, width), dtype=np.int32)
+    return rasterize_boxes(
+        pixel_coords[:, ids], ids, (height, width), (offset_i, offset_j), out=out
+    )
@@ -2,12 +2,12 @@
 
 import numpy as np
 
-from threedigrid.admin import constants
 from threedigrid.admin.nodes.subsets import NODE_TYPE__IN_SUBSETS
 from threedigrid.admin.prepare_utils import (
     add_or_update_datasets,
     db_objects_to_numpy_array_dict,
 )
+from threedigrid.admin.utils import create_dataset
 
 
 def as_numpy_array(array):
@@ -19,23 +19,7 @@ def as_numpy_array(array):
 class PrepareNodes:
     @staticmethod
     def get_node_pks(mapping1d, id_mapper):
-        # pk template
-        type_code = constants.TYPE_CODE_MAP["v2_connection_nodes"]
-
-        content_pk = np.zeros(mapping1d["nend1d"].shape, dtype="i4")
-
-        # with argsort
-        sort_idx = np.argsort(mapping1d["nend1d"])
-        idx = sort_idx[
-            np.searchsorted(
-                mapping1d["nend1d"],
-                id_mapper.id_mapping[id_mapper.obj_slices[type_code]]["seq_id"],
-                sorter=sort_idx,
-            )
-        ]
-
-        content_pk[idx] = id_mapper.id_mapping[id_mapper.obj_slices[type_code]]["pk"]
-        return content_pk
+        return id_mapper.get_pks("v2_connection_nodes", mapping1d["nend1d"][:])
 
     @classmethod
     def prepare_datasource(cls, datasource, mapping1d, id_mapper, has_1d):
@@ -103,8 +87,8 @@ class PrepareCells:
             pixel_coords[2, mask] = ip[3, nodm[mask] - 1, nodk[mask] - 1]
             pixel_coords[3, mask] = jp[3, nodn[mask] - 1, nodk[mask] - 1]
 
-        node_group.create_dataset("pixel_width", data=pixel_width, dtype="int")
-        node_group.create_dataset("pixel_coords", data=pixel_coords, dtype="int")
+        create_dataset(node_group, "pixel_width", dtype="int", data=pixel_width)
+        create_dataset(node_group, "pixel_coords", dtype="int", data=pixel_coords)
 
 
 class PrepareManholes:
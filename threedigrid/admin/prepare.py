@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+import time
 
 import numpy as np
 
@@ -58,8 +59,29 @@ def prepare_lines_onedee(
 
 
 class GridAdminH5Prepare:
+    # The prepare stages in execution order: (name, method name, names of
+    # the stages that have to run first)
+    PREPARE_STAGES = (
+        ("id_mapper", "prepare_id_mapper", ()),
+        ("nodes", "prepare_nodes", ("id_mapper",)),
+        ("lines", "prepare_lines", ("id_mapper", "nodes")),
+        ("onedee_lines", "prepare_onedee_lines", ("lines",)),
+        ("onedee_nodes", "prepare_onedee_nodes", ("nodes",)),
+        ("pumps", "prepare_pumps", ("nodes",)),
+        ("levees", "prepare_levees", ()),
+        ("breaches", "prepare_breaches", ("id_mapper", "lines", "levees")),
+    )
+
     @staticmethod
-    def prepare(h5py_file, threedi_datasource, extra_attrs=None):
+    def prepare(h5py_file, threedi_datasource, extra_attrs=None, stages=None):
+        """
+        :param h5py_file: the gridadmin h5py file to prepare
+        :param threedi_datasource: the datasource with the model objects
+        :param extra_attrs: optional attrs to set on the h5py file like epsg
+            code, model_name, revision_number, revision_hash etc.
+        :param stages: optional names of the stages (see PREPARE_STAGES) to
+            run, their dependencies are included. Defaults to all stages.
+        """
         # Step 1: Set optional extra attrs like epsg code,
         # model_name, revision_number, revision_hash
         # and possible other meta data..
@@ -69,23 +91,47 @@ class GridAdminH5Prepare:
                     value = np.bytes_(value)
                 h5py_file.attrs[key] = value
 
-        # Step 3: prepare the ID mapper
-        IdMapper.prepare_mapper(h5py_file, threedi_datasource)
+        # Step 2: run the (required) stages in dependency order
+        for name, method_name in GridAdminH5Prepare.get_stages(stages):
+            start = time.perf_counter()
+            getattr(GridAdminH5Prepare, method_name)(h5py_file, threedi_datasource)
+            logger.info(
+                "[*] Prepare stage %s took %.3f s", name, time.perf_counter() - start
+            )
 
-        # Step 4: Prepare nodes/lines
-        GridAdminH5Prepare.prepare_nodes(h5py_file, threedi_datasource)
-        GridAdminH5Prepare.prepare_lines(h5py_file, threedi_datasource)
+    @staticmethod
+    def get_stages(names=None):
+        """
+        :param names: names of the stages to run, None means all stages
+        :return: list of (name, method name) of the stages to run, including
+            their dependencies, in execution order
+        """
+        stages = GridAdminH5Prepare.PREPARE_STAGES
+        if names is None:
+            return [(name, method_name) for name, method_name, _ in stages]
+
+        dependencies = {name: depends_on for name, _, depends_on in stages}
+        unknown = set(names) - set(dependencies)
+        if unknown:
+            raise ValueError(
+                "Unknown prepare stage(s): %s" % ", ".join(sorted(unknown))
+            )
 
-        # Step 5: Prepare onedee lines/nodes/pumps
-        GridAdminH5Prepare.prepare_onedee_lines(h5py_file, threedi_datasource)
-        GridAdminH5Prepare.prepare_onedee_nodes(h5py_file, threedi_datasource)
-        GridAdminH5Prepare.prepare_pumps(h5py_file, threedi_datasource)
+        required = set()
+        todo = list(names)
+        while todo:
+            name = todo.pop()
+            if name not in required:
+                required.add(name)
+                todo.extend(dependencies[name])
 
-        # Step 6: prepare levees
-        GridAdminH5Prepare.prepare_levees(h5py_file, threedi_datasource)
+        return [
+            (name, method_name) for name, method_name, _ in stages if name in required
+        ]
 
-        # Step 7: prepare breaches
-        GridAdminH5Prepare.prepare_breaches(h5py_file, threedi_datasource)
+    @staticmethod
+    def prepare_id_mapper(h5py_file, threedi_datasource):
+        IdMapper.prepare_mapper(h5py_file, threedi_datasource)
 
     @staticmethod
     def prepare_levees(h5py_file, threedi_datasource, overwrite=False):
@@ -1,8 +1,16 @@
 # (c) Nelen & Schuurmans.  GPL licensed, see LICENSE.rst.
 
+from operator import attrgetter
+
 import numpy as np
 
-from .utils import PKMapper
+try:
+    import shapely
+    from shapely.geometry.base import BaseGeometry as Geometry
+except ImportError:
+    shapely = None
+
+from .utils import PKMapper, create_dataset
 
 DEFAULT_NULL_VALUE = -9999
 
@@ -12,34 +20,116 @@ FIELD_NULL_VALUES = {
 }
 
 
+def _get_columns(db_objects, field_names):
+    """
+    :param db_objects: sequence of db objects, a dict with a sequence of
+        values per field name or an (executed) SQL cursor
+    :return: dict with a sequence of values per field name
+    """
+    if hasattr(db_objects, "fetchall") and hasattr(db_objects, "description"):
+        names = [x[0] for x in db_objects.description]
+        rows = db_objects.fetchall()
+        db_objects = dict(zip(names, zip(*rows) if rows else [()] * len(names)))
+
+    if isinstance(db_objects, dict):
+        return {field_name: db_objects[field_name] for field_name in field_names}
+
+    db_objects = list(db_objects)
+    return {
+        # Allow to get attrs of child objects by using field__attr
+        field_name: list(map(attrgetter(field_name.replace("__", ".")), db_objects))
+        for field_name in field_names
+    }
+
+
+def _geometries_to_numpy_array(values):
+    """
+    :return: object array with the WKB of every geometry as uint8 array
+    """
+    if (
+        shapely is not None
+        and not shapely.__version__.startswith("1.")
+        and all(x is None or isinstance(x, Geometry) for x in values)
+    ):
+        # shapely 2 encodes all geometries in a single call
+        geometries = np.empty(len(values), dtype=object)
+        geometries[:] = values
+        wkbs = shapely.to_wkb(geometries)
+    else:
+        wkbs = [None if x is None else x.wkb for x in values]
+
+    result = np.full(len(values), DEFAULT_NULL_VALUE, dtype=object)
+    for index, wkb in enumerate(wkbs):
+        if wkb is not None:
+            result[index] = np.frombuffer(bytes(wkb), dtype="uint8")
+    return result
+
+
+def _encode(value):
+    """
+    :return: the value as (utf8) bytes
+    """
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf8")
+
+
+def _column_to_numpy_array(values):
+    """
+    :return: numpy array of the values, None values are replaced by
+        DEFAULT_NULL_VALUE and strings are stored as (utf8) fixed-width
+        bytes
+    """
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        if values.dtype.kind == "U":
+            return np.char.encode(values, "utf8")
+        return values
+
+    size = len(values)
+    if size == 0:
+        return np.array([])
+
+    null_mask = np.fromiter((x is None for x in values), dtype=bool, count=size)
+    non_null = [x for x in values if x is not None]
+    if not non_null:
+        return np.full(size, DEFAULT_NULL_VALUE)
+
+    if any(isinstance(x, (str, bytes)) for x in non_null):
+        null_value = DEFAULT_NULL_VALUE
+        if not isinstance(null_value, bytes):
+            null_value = str(null_value).encode("utf8")
+        encoded = [null_value if x is None else _encode(x) for x in values]
+        width = max(max(len(x) for x in encoded), 1)
+        return np.array(encoded, dtype="S{}".format(width))
+
+    column = np.array(non_null)
+    if not null_mask.any():
+        return column
+
+    dtype = np.result_type(column.dtype, np.array(DEFAULT_NULL_VALUE).dtype)
+    result = np.full(size, DEFAULT_NULL_VALUE, dtype=dtype)
+    result[~null_mask] = column
+    return result
+
+
 def db_objects_to_numpy_array_dict(db_objects, field_names):
-    numpy_array_dict = {}
+    """
+    Convert db objects to a dict with a numpy array per field name.
 
-    for field_name in field_names:
-        numpy_array_dict[field_name] = [DEFAULT_NULL_VALUE] * len(db_objects)
-
-    for index, db_object in enumerate(db_objects):
-        for field_name in field_names:
-            if "__" in field_name:
-                # Allow to get attrs of child objects
-                # by using field__attr
-                splitted = field_name.split("__")
-                db_object_attr = getattr(db_object, splitted[0])
-                value = getattr(db_object_attr, splitted[1])
-            else:
-                value = getattr(db_object, field_name)
-
-            if field_name == "the_geom":
-                value = np.fromstring(str(value.wkb), dtype="uint8")
-
-            # Convert unicode to str
-            if isinstance(value, str):
-                value = value.encode("utf8")
-            if value is not None:
-                numpy_array_dict[field_name][index] = value
-
-    for key in numpy_array_dict:
-        numpy_array_dict[key] = np.array(numpy_array_dict[key])
+    :param db_objects: sequence of db objects, a dict with a sequence of
+        values per field name or an (executed) SQL cursor. For db objects
+        ``field__attr`` field names get the attr of a child object.
+    :param field_names: the field names to convert
+    :return: dict with a numpy array per field name
+    """
+    columns = _get_columns(db_objects, field_names)
+
+    numpy_array_dict = {}
+    for field_name, values in columns.items():
+        if field_name == "the_geom":
+            numpy_array_dict[field_name] = _geometries_to_numpy_array(values)
+        else:
+            numpy_array_dict[field_name] = _column_to_numpy_array(values)
 
     return numpy_array_dict
 
@@ -82,7 +172,7 @@ def add_or_update_datasets(
                 elif dataset_name == "shape":
                     dt = "S4"
 
-            h5py_group.create_dataset(dataset_name, data=data, dtype=dt)
+            create_dataset(h5py_group, dataset_name, dtype=dt, data=data)
         else:
             values = h5py_group[dataset_name][:]
             mask = data != null_value
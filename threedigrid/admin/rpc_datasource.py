@@ -1,7 +1,13 @@
+import asyncio
 import re
+import time
+from collections import OrderedDict
 from uuid import uuid4
 
+import numpy as np
+
 from threedigrid.orm.base.datasource import DataSource
+from threedigrid.orm.base.fields import TimeSeriesArrayField
 
 try:
     import asyncio_rpc  # noqa
@@ -18,11 +24,66 @@ from asyncio_rpc.serialization import msgpack
 
 NAMESPACE = "GRIDRESULTADMIN"
 RESULT_EXPIRE_TIME = 30
+REDIS_PORT = 6379
+# Maximum number of calls in flight per (pooled) client
+MAX_CONCURRENT_CALLS = 64
+# Seconds after which an unused pooled client is closed
+CLIENT_IDLE_TIMEOUT = 300
+# Maximum number of pooled clients, the least recently used clients are
+# closed first
+CLIENT_POOL_MAX_SIZE = 16
+
+# Maximum number of results cached per RPCFile
+CACHE_MAX_ITEMS = 256
+# Seconds to cache (changing) simulation results, grid data is static and
+# is cached until it is evicted
+RESULT_CACHE_TTL = 1.0
+
+
+def _set_read_only(value):
+    """
+    Make the numpy arrays in a (shared) call result read-only, so a caller
+    cannot change the result for the other callers.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        if value.dtype != object:
+            return
+        value = value.ravel()
+    elif isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return
+    for item in value:
+        _set_read_only(item)
+
+
+async def _set_properties(ga, props):
+    values = await resolve_all(*[ga.h5py_file.attrs[prop] for prop in props])
+    for prop, value in zip(props, values):
+        setattr(ga, prop, bool(value))
+
+
+async def resolve_all(*futures):
+    """
+    Resolve several futures together.
 
+    The calls are published back to back on one (background processing)
+    client per RPCFile and their results are awaited together, so resolving
+    N futures costs about one round trip instead of N.
 
-async def _set_property(ga, prop):
-    value = await ga.h5py_file.attrs[prop].resolve()
-    setattr(ga, prop, bool(value))
+    Usage::
+
+        coordinates, kcu = await resolve_all(
+            gr.nodes.coordinates, gr.lines.kcu
+        )
+
+    :return: list with the results, in the order of the futures
+    """
+    rpc_files = {id(future.rpc_file): future.rpc_file for future in futures}
+    for rpc_file in rpc_files.values():
+        await rpc_file.serve()
+    return await asyncio.gather(*[future.resolve() for future in futures])
 
 
 class Future:
@@ -34,8 +95,7 @@ class Future:
         """
         Resolve this future
         """
-        client = await self.rpc_file.client
-        return await client.rpc_call(self.rpc_stack)
+        return await self.rpc_file.call(self.rpc_stack)
 
 
 class FutureResult(Future):
@@ -43,8 +103,7 @@ class FutureResult(Future):
         """
         Returns by default only NetCDF results
         """
-        client = await self.rpc_file.client
-        return await client.rpc_call(self.rpc_stack)
+        return await self.rpc_file.call(self.rpc_stack, ttl=RESULT_CACHE_TTL)
 
     async def subscribe(self, only_netcdf_results=False, max_items_per_second=None):
         """
@@ -88,40 +147,292 @@ class RPCAttrs:
         return self.get(key)
 
 
+class PooledClient:
+    """
+    RPCClient that can be shared by several RPCFile instances, with a
+    limit on the number of concurrent calls.
+    """
+
+    def __init__(self, client, max_concurrent_calls=None):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls or MAX_CONCURRENT_CALLS)
+        self._serve_task = None
+        self.last_used = time.monotonic()
+        # Number of calls in flight
+        self.active = 0
+
+    @property
+    def healthy(self):
+        """
+        Whether background processing is running, client.serve() itself
+        resubscribes after connection errors.
+        """
+        return self._serve_task is not None and not self._serve_task.done()
+
+    @property
+    def busy(self):
+        """
+        Whether calls or subscriptions are running on the client
+        """
+        return self.active > 0 or bool(self.client.subscriptions)
+
+    async def serve(self):
+        """
+        Start background processing on the client (once), which allows
+        several calls to be in flight at the same time.
+
+        :return: the client
+        """
+        if not self.healthy:
+            self._serve_task = asyncio.ensure_future(self.client.serve())
+            while not self.client.processing and not self._serve_task.done():
+                await asyncio.sleep(0)
+        return self.client
+
+    async def call(self, rpc_stack):
+        self.active += 1
+        try:
+            async with self.semaphore:
+                return await self.client.rpc_call(rpc_stack)
+        finally:
+            self.active -= 1
+            self.last_used = time.monotonic()
+
+    async def aclose(self):
+        await self.client.close()
+        if self._serve_task is not None:
+            self._serve_task.cancel()
+            await asyncio.gather(self._serve_task, return_exceptions=True)
+            self._serve_task = None
+
+
+class RPCClientPool:
+    """
+    Process wide pool of (served) clients, one per event loop, redis
+    host/port, channel and serialization. RPCFile instances for the same
+    simulation share a client and its redis subscription.
+
+    Clients that are not used for ``idle_timeout`` seconds, or the least
+    recently used clients beyond ``max_size``, are closed unless calls or
+    subscriptions are running on them.
+
+    Close the clients on shutdown with::
+
+        await rpc_datasource.client_pool.aclose()
+    """
+
+    def __init__(self, max_concurrent_calls=None, max_size=None, idle_timeout=None):
+        self.max_concurrent_calls = max_concurrent_calls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        # key -> asyncio.Task creating the PooledClient, least recently
+        # used first
+        self._clients = OrderedDict()
+
+    async def _create(self, host, port, channel, serialization):
+        # asyncio_rpc builds the redis url from the host only
+        comm = await RPCRedisCommLayer.create(
+            uuid4().hex,
+            channel,
+            host="{}:{}".format(host, port),
+            port=port,
+            serialization=serialization,
+        )
+        pooled = PooledClient(RPCClient(comm), self.max_concurrent_calls)
+        await pooled.serve()
+        return pooled
+
+    def _is_usable(self, task):
+        if not task.done():
+            return True
+        return not task.cancelled() and not task.exception() and task.result().healthy
+
+    async def _evict(self, loop, keep):
+        """
+        Close the idle clients of the event loop and the least recently used
+        clients beyond max_size, except the client for key ``keep``.
+        """
+        max_size = self.max_size or CLIENT_POOL_MAX_SIZE
+        idle_timeout = self.idle_timeout
+        if idle_timeout is None:
+            idle_timeout = CLIENT_IDLE_TIMEOUT
+        now = time.monotonic()
+        for key, task in list(self._clients.items()):
+            if key == keep or key[0] is not loop or not task.done():
+                continue
+            if task.cancelled() or task.exception():
+                continue
+            pooled = task.result()
+            if pooled.busy:
+                continue
+            if len(self._clients) > max_size or now - pooled.last_used > idle_timeout:
+                del self._clients[key]
+                await pooled.aclose()
+
+    async def get(self, host, port, channel, serialization):
+        """
+        :return: a healthy PooledClient, created when needed
+        """
+        loop = asyncio.get_running_loop()
+        # Clients are bound to the event loop they were created in
+        for key in [x for x in self._clients if x[0].is_closed()]:
+            del self._clients[key]
+
+        key = (loop, host, port, channel, serialization)
+        task = self._clients.get(key)
+        if task is None or not self._is_usable(task):
+            task = asyncio.ensure_future(
+                self._create(host, port, channel, serialization)
+            )
+            self._clients[key] = task
+        self._clients.move_to_end(key)
+        try:
+            pooled = await asyncio.shield(task)
+        except Exception:
+            if self._clients.get(key) is task:
+                del self._clients[key]
+            raise
+        pooled.last_used = time.monotonic()
+        await self._evict(loop, key)
+        return pooled
+
+    async def aclose(self):
+        """
+        Close all clients created in the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        keys = [x for x in self._clients if x[0] is loop or x[0].is_closed()]
+        tasks = [self._clients.pop(key) for key in keys]
+        for task in tasks:
+            if task.done() and not task.cancelled() and not task.exception():
+                await task.result().aclose()
+            else:
+                task.cancel()
+
+
+client_pool = RPCClientPool()
+
+
 class RPCFile:
     def __init__(self, path, file_modus):
-        match = re.match(r"rpc://(?P<host>\S+)/(?P<channel>\S+)", path)
-
-        # Default value for now
-        self._redis_port = 6379
+        match = re.match(
+            r"rpc://(?P<host>[^/:\s]+)(:(?P<port>\d+))?/(?P<channel>\S+)", path
+        )
 
         if match:
             data = match.groupdict()
             self._redis_host = data["host"]
+            self._redis_port = int(data["port"] or REDIS_PORT)
             self.pubchannel = data["channel"]
         else:
             raise Exception("Could not parse path %s" % path)
 
         self.path = path
         self.file_modus = file_modus
+        # Explicitly set client, by default clients are taken from the pool
         self._client = None
+        self._pooled = None
+        self.pool = client_pool
+        # The serialization of the messages, can be replaced by for example
+        # rpc_serialization.NumpySerialization() before the first call
+        self.serialization = msgpack
+        # key -> (expiry time or None, result)
+        self._cache = OrderedDict()
+        # key -> asyncio.Future of the call in flight
+        self._in_flight = {}
 
     def filepath(self):
         return self.path
 
-    @property
-    async def client(self):
+    async def get_pooled_client(self):
         if self._client is None:
-            subchannel = uuid4().hex
-            comm = await RPCRedisCommLayer.create(
-                subchannel,
-                self.pubchannel,
-                host=self._redis_host,
-                port=self._redis_port,
-                serialization=msgpack,
+            return await self.pool.get(
+                self._redis_host, self._redis_port, self.pubchannel, self.serialization
             )
-            self._client = RPCClient(comm)
-        return self._client
+        if self._pooled is None or self._pooled.client is not self._client:
+            self._pooled = PooledClient(self._client, self.pool.max_concurrent_calls)
+        return self._pooled
+
+    @property
+    async def client(self):
+        return (await self.get_pooled_client()).client
+
+    @staticmethod
+    def get_cache_key(rpc_stack):
+        """
+        :return: the serialized RPCStack without its uid
+        """
+        calls = [(x.func_name, x.func_args, x.func_kwargs) for x in rpc_stack.stack]
+        return msgpack.dumpb((rpc_stack.namespace, calls), do_compress=False)
+
+    async def call(self, rpc_stack, ttl=None):
+        """
+        Execute the rpc_stack, or get its result from the cache. Identical
+        calls that are in flight at the same time are executed once.
+
+        :param rpc_stack: the RPCStack to execute
+        :param ttl: seconds to cache the result, None caches it until it
+            is evicted, 0 disables caching
+        :return: the result of the call. Results are shared by the callers,
+            numpy arrays in them are read-only.
+        """
+        key = self.get_cache_key(rpc_stack)
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires, result = cached
+            if expires is None or expires > time.monotonic():
+                self._cache.move_to_end(key)
+                return result
+            del self._cache[key]
+
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+
+        in_flight = asyncio.get_event_loop().create_future()
+        self._in_flight[key] = in_flight
+        try:
+            pooled = await self.get_pooled_client()
+            result = await pooled.call(rpc_stack)
+        except BaseException as e:
+            in_flight.set_exception(e)
+            # Mark the exception as retrieved, it is raised below
+            in_flight.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+        _set_read_only(result)
+        in_flight.set_result(result)
+        if ttl != 0:
+            expires = None if ttl is None else time.monotonic() + ttl
+            self._cache[key] = (expires, result)
+            while len(self._cache) > CACHE_MAX_ITEMS:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    async def serve(self):
+        """
+        Start background processing on the client (once), which allows
+        several calls to be in flight at the same time.
+
+        :return: the client
+        """
+        return await (await self.get_pooled_client()).serve()
+
+    async def aclose(self):
+        """
+        Clear the cache and close an explicitly set client. Pooled clients
+        are shared and closed with the pool.
+        """
+        self.clear_cache()
+        if self._client is not None:
+            pooled = await self.get_pooled_client()
+            await pooled.aclose()
+            self._client = None
+            self._pooled = None
 
     def get_model_extent(self, target_epsg_code="", bbox=[]):
         stack = [
@@ -290,5 +601,20 @@ class H5RPCResultGroup(H5RPCGroup):
 
         return rpc_actions
 
+    def get_filtered_field_value(
+        self, model, field_name, ts_filter=None, lookup_index=None, subset_index=None
+    ):
+        future = super().get_filtered_field_value(
+            model, field_name, ts_filter, lookup_index, subset_index
+        )
+        try:
+            field = model._meta.get_field(field_name)
+        except AttributeError:
+            return future
+        if isinstance(field, TimeSeriesArrayField):
+            return future
+        # Static grid data (like coordinates) is cached until it is evicted
+        return Future(self.rpc_file, future.rpc_stack)
+
     def attr(self, var_name, attr_name):
         pass
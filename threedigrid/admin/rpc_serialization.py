@@ -0,0 +1,122 @@
+"""
+NumPy aware serialization for the threedigrid RPC namespace.
+
+``asyncio_rpc`` serializes numpy arrays with ``np.save``/``np.load``. This
+module packs them as a small ``(dtype, shape)`` header followed by the raw
+little-endian buffer instead, optionally downcasts float64 arrays to float32
+(for visual clients) and compresses the whole message with lz4 or zstd.
+
+Both ends of the RPC connection need to use the same serialization, for
+example::
+
+    gr = GridH5ResultAdmin("rpc://redis/channel", ...)
+    gr.netcdf_file.serialization = NumpySerialization(float32=True)
+
+Messages that contain arrays packed by the default ``asyncio_rpc``
+serialization are decoded as well.
+"""
+
+import dataclasses
+
+import msgpack
+import numpy as np
+from asyncio_rpc.serialization import msgpack as rpc_msgpack
+from lz4.frame import compress as lz4_compress
+from lz4.frame import decompress as lz4_decompress
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ext_type of asyncio_rpc's DataclassHandler, the packed format is the same
+DATACLASS_EXT_TYPE = 4
+RAW_ARRAY_EXT_TYPE = 20
+
+
+class NumpySerialization:
+    """
+    Serialization with the register/dumpb/loadb interface of
+    ``asyncio_rpc.serialization.msgpack``
+    """
+
+    def __init__(self, float32=False, compression="lz4"):
+        """
+        :param float32: pack float64 arrays as float32
+        :param compression: None, "lz4" or "zstd" (requires zstandard)
+        """
+        if compression not in (None, "lz4", "zstd"):
+            raise ValueError("Unknown compression {}".format(compression))
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires zstandard to be installed")
+        self.float32 = float32
+        self.compression = compression
+
+    @staticmethod
+    def register(obj_def):
+        rpc_msgpack.register(obj_def)
+
+    def pack_array(self, array):
+        if self.float32 and array.dtype == np.float64:
+            array = array.astype(np.float32)
+        dtype = array.dtype.newbyteorder("<") if array.dtype.byteorder == ">" else None
+        if dtype is not None:
+            array = array.astype(dtype)
+        array = np.ascontiguousarray(array)
+        descr = np.lib.format.dtype_to_descr(array.dtype)
+        return msgpack.packb([descr, list(array.shape), array.tobytes()])
+
+    @staticmethod
+    def unpack_array(data):
+        descr, shape, buffer = msgpack.unpackb(data, raw=False, use_list=False)
+        if isinstance(descr, tuple):
+            # structured dtypes are lists of (name, format) pairs
+            descr = [tuple(x) for x in descr]
+        dtype = np.lib.format.descr_to_dtype(descr)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape).copy()
+
+    def default(self, obj):
+        if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+            return msgpack.ExtType(RAW_ARRAY_EXT_TYPE, self.pack_array(obj))
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            # Same format as asyncio_rpc, but with arrays packed by this class
+            return msgpack.ExtType(
+                DATACLASS_EXT_TYPE,
+                self.dumpb((obj.__class__.__name__, obj.__dict__), do_compress=False),
+            )
+        return rpc_msgpack.default(obj)
+
+    def ext_hook(self, ext_type, data):
+        if ext_type == RAW_ARRAY_EXT_TYPE:
+            return self.unpack_array(data)
+        if ext_type == DATACLASS_EXT_TYPE:
+            classname, values = self.loadb(data, do_decompress=False)
+            return rpc_msgpack.REGISTRY["serializables"][classname](**values)
+        return rpc_msgpack.ext_hook(ext_type, data)
+
+    def compress(self, data):
+        if self.compression == "lz4":
+            return lz4_compress(data)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    def decompress(self, data):
+        if self.compression == "lz4":
+            return lz4_decompress(data)
+        if self.compression == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        return data
+
+    def dumpb(self, instance, do_compress=True):
+        packed = msgpack.packb(instance, default=self.default, use_bin_type=True)
+        if do_compress:
+            return self.compress(packed)
+        return packed
+
+    def loadb(self, packed, do_decompress=True):
+        if packed is None:
+            return None
+        if do_decompress:
+            packed = self.decompress(packed)
+        return msgpack.unpackb(packed, ext_hook=self.ext_hook, raw=False)
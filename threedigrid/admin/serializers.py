@@ -6,6 +6,7 @@ import numpy as np
 
 from threedigrid.admin import constants
 from threedigrid.geo_utils import raise_import_exception, transform_bbox, transform_xys
+from threedigrid.numpy_utils import flatten_ragged_coords, split_ragged_coords
 from threedigrid.orm.base.encoder import NumpyEncoder
 from threedigrid.orm.base.models import Model
 
@@ -19,7 +20,9 @@ logger = logging.getLogger(__name__)
 
 
 class GeoJsonSerializer:
-    def __init__(self, fields, model=None, indent=None, coupled_model=None):
+    def __init__(
+        self, fields, model=None, indent=None, coupled_model=None, chunk_size=None
+    ):
         if geojson is None:
             raise_import_exception("geojson")
         if model:
@@ -31,6 +34,7 @@ class GeoJsonSerializer:
         self._coupled_model = coupled_model
         self._model = model
         self._indent = indent
+        self._chunk_size = chunk_size
 
     def save(self, filename, **kwargs):
         with open(filename, "w") as file:
@@ -50,10 +54,20 @@ class GeoJsonSerializer:
         if self._model.count == 0:
             return []
 
-        # Get the data, skipping the dummy element
-        data = self._model.filter(id__ne=0).to_dict()
-        content_type = self._model.__contenttype__()
-        model_type = type(self._model).__name__
+        # Skip the dummy element
+        model = self._model.filter(id__ne=0)
+        if self._chunk_size is None:
+            chunks = [model]
+        else:
+            chunks = model.iter_chunks(self._chunk_size)
+
+        for chunk in chunks:
+            yield from self._geos_iter(chunk)
+
+    def _geos_iter(self, model):
+        data = model.to_dict()
+        content_type = model.__contenttype__()
+        model_type = type(model).__name__
         if content_type == "lines":
             for i in range(data["id"].shape[-1]):
                 linepoints = np.round(
@@ -94,13 +108,13 @@ class GeoJsonSerializer:
                 yield geojson.Feature(geometry=line, properties=properties)
         elif content_type == "cells":
             if (
-                self._model.reproject_to_epsg is not None
-                and self._model.reproject_to_epsg != self._model.epsg_code
+                model.reproject_to_epsg is not None
+                and model.reproject_to_epsg != model.epsg_code
             ):
                 cell_coords = transform_bbox(
-                    self._model.reproject_to(self._model.epsg_code).cell_coords,
-                    self._model.epsg_code,
-                    self._model.reproject_to_epsg,
+                    model.reproject_to(model.epsg_code).cell_coords,
+                    model.epsg_code,
+                    model.reproject_to_epsg,
                     all_coords=True,
                 )
             else:
@@ -128,22 +142,18 @@ class GeoJsonSerializer:
                 properties = fill_properties(self.fields, data, i, model_type)
                 yield geojson.Feature(geometry=polygon, properties=properties)
         elif content_type == "fragments":
+            x, y, offsets = flatten_ragged_coords(data["coords"])
+            x = np.round(x, constants.LONLAT_DIGITS)
+            y = np.round(y, constants.LONLAT_DIGITS)
+            if (
+                model.reproject_to_epsg is not None
+                and model.reproject_to_epsg != model.epsg_code
+            ):
+                # Pick reproject_to_epsg or original model epsg_code
+                x, y = transform_xys(x, y, model.epsg_code, model.reproject_to_epsg)
+            fragments = split_ragged_coords(x, y, offsets)
             for i in range(data["id"].shape[-1]):
-                coords = np.round(
-                    data["coords"][i].reshape(2, -1).astype("float64"),
-                    constants.LONLAT_DIGITS,
-                )
-                if (
-                    self._model.reproject_to_epsg is not None
-                    and self._model.reproject_to_epsg != self._model.epsg_code
-                ):
-                    # Pick reproject_to_epsg or original model epsg_code
-                    coords = transform_xys(
-                        np.array(coords[0]),
-                        np.array(coords[1]),
-                        self._model.epsg_code,
-                        self._model.reproject_to_epsg,
-                    )
+                coords = fragments[i].reshape(2, -1)
                 polygon = geojson.Polygon(coords.T.tolist())
                 properties = fill_properties(self.fields, data, i, model_type)
                 yield geojson.Feature(geometry=polygon, properties=properties)
@@ -157,7 +167,7 @@ class GeoJsonSerializer:
                 properties = fill_properties(self.fields, data, i, model_type)
                 yield geojson.Feature(geometry=line, properties=properties)
         else:
-            raise ValueError("Unknown content type for %s" % self._model)
+            raise ValueError("Unknown content type for %s" % model)
 
     @property
     def geos(self):
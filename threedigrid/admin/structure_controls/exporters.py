@@ -1,4 +1,7 @@
 import csv
+from typing import Dict, Iterator
+
+import numpy as np
 
 from threedigrid.admin.gridresultadmin import (
     _GridH5NestedStructureControl,
@@ -6,60 +9,66 @@ from threedigrid.admin.gridresultadmin import (
 )
 from threedigrid.admin.structure_controls.models import StructureControlTypes
 
+CSV_COLUMNS = [
+    "control_type",
+    "id",
+    "source_table",
+    "source_table_id",
+    "time",
+    "action_type",
+    "action_value_1",
+    "action_value_2",
+    "is_active",
+]
+
+
+def _to_list(values: np.ndarray) -> list:
+    """Column values as python objects, formatted like their numpy scalars"""
+    values = np.asarray(values)
+    if values.dtype == np.float64:
+        # csv.writer formats floats a lot slower than repr
+        return list(map(repr, values.tolist()))
+    if values.dtype.kind == "f":
+        # python floats of float32 values have more digits than str(np.float32)
+        return values.astype(str).tolist()
+    return values.tolist()
+
+
+def iter_structure_control_actions(
+    structure_control: GridH5StructureControl,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield the control actions as columns (a dict with ``CSV_COLUMNS`` as keys)
+    per control type. Every column is read once and the source tables are
+    looked up vectorized.
+    """
+    for control_type in StructureControlTypes.__members__.values():
+        control_type_data: _GridH5NestedStructureControl = getattr(
+            structure_control, control_type.name
+        )
+        table = control_type_data.table
+        source_table, source_table_id = structure_control.get_source_tables(
+            table["action_type"], table["grid_id"]
+        )
+        yield {
+            "control_type": np.full(len(table["id"]), control_type.value),
+            "id": table["id"],
+            "source_table": source_table,
+            "source_table_id": source_table_id,
+            "time": table["time"],
+            "action_type": table["action_type"],
+            "action_value_1": table["action_value_1"],
+            "action_value_2": table["action_value_2"],
+            "is_active": table["is_active"],
+        }
+
 
 def structure_control_actions_to_csv(
     structure_control: GridH5StructureControl, out_path: str
 ):
     """Set place table, timed, and memory controls after each other in one file."""
-    with open(out_path, "w", newline="") as csvfile:
+    with open(out_path, "w", newline="", buffering=2**20) as csvfile:
         csv_writer = csv.writer(csvfile, delimiter=",")
-        csv_writer.writerow(
-            [
-                "control_type",
-                "id",
-                "source_table",
-                "source_table_id",
-                "time",
-                "action_type",
-                "action_value_1",
-                "action_value_2",
-                "is_active",
-            ]
-        )
-        for control_type in StructureControlTypes.__members__.values():
-            control_type_data: _GridH5NestedStructureControl = getattr(
-                structure_control, control_type.name
-            )
-            for (
-                id,
-                grid_id,
-                time,
-                action_type,
-                action_value_1,
-                action_value_2,
-                is_active,
-            ) in zip(
-                control_type_data.id,
-                control_type_data.grid_id,
-                control_type_data.time,
-                control_type_data.action_type,
-                control_type_data.action_value_1,
-                control_type_data.action_value_2,
-                control_type_data.is_active,
-            ):
-                source_table, source_table_id = structure_control.get_source_table(
-                    action_type, grid_id
-                )
-                csv_writer.writerow(
-                    [
-                        control_type.value,
-                        id,
-                        source_table,
-                        source_table_id,
-                        time,
-                        action_type,
-                        action_value_1,
-                        action_value_2,
-                        is_active,
-                    ]
-                )
+        csv_writer.writerow(CSV_COLUMNS)
+        for columns in iter_structure_control_actions(structure_control):
+            csv_writer.writerows(zip(*[_to_list(columns[x]) for x in CSV_COLUMNS]))
@@ -4,8 +4,16 @@
 import logging
 from itertools import tee
 
+import h5py
 import numpy as np
 
+from threedigrid.admin import constants
+
+try:
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
 logger = logging.getLogger(__name__)
 
 BBOX_LEFT = 0
@@ -215,6 +223,91 @@ def get_or_create_group(grid_file, group_name):
     return gr
 
 
+def get_dataset_layout(shape, dtype, compression="default"):
+    """
+    Get the layout (chunking and filters) for a new dataset.
+
+    Datasets are stored contiguous, unless compression is configured:
+    compressed datasets larger than DATASET_MIN_CHUNKED_BYTES are chunked
+    along the last axis, which is the element axis of all gridadmin
+    datasets, so that id-range reads only decompress the chunks they need.
+
+    :param shape: shape of the dataset
+    :param dtype: dtype of the dataset
+    :param compression: None, "gzip", "lzf", "lz4" or "zstd", the latter
+        two require hdf5plugin. Defaults to constants.DATASET_COMPRESSION.
+    :return: dict with keyword arguments for h5py create_dataset
+    """
+    if compression == "default":
+        compression = constants.DATASET_COMPRESSION
+    layout = {"track_order": False}
+    dtype = np.dtype(dtype)
+    if (
+        compression is None
+        or not shape
+        or h5py.check_vlen_dtype(dtype) is not None
+        or dtype.hasobject
+        or int(np.prod(shape)) * dtype.itemsize < constants.DATASET_MIN_CHUNKED_BYTES
+    ):
+        return layout
+
+    row_bytes = int(np.prod(shape[:-1])) * dtype.itemsize
+    chunk_length = max(1, constants.DATASET_CHUNK_BYTES // max(row_bytes, 1))
+    layout["chunks"] = tuple(shape[:-1]) + (min(shape[-1], chunk_length),)
+
+    if compression in ("lz4", "zstd"):
+        if hdf5plugin is None:
+            raise ValueError(
+                "Compression {} requires hdf5plugin to be installed".format(compression)
+            )
+        layout.update(hdf5plugin.LZ4() if compression == "lz4" else hdf5plugin.Zstd())
+    elif compression == "gzip":
+        layout["compression"] = "gzip"
+        layout["compression_opts"] = constants.DATASET_COMPRESSION_OPTS
+    else:
+        layout["compression"] = compression
+    layout["shuffle"] = dtype.itemsize > 1
+
+    return layout
+
+
+def create_dataset(
+    h5py_group,
+    name,
+    shape=None,
+    dtype=None,
+    data=None,
+    compression="default",
+):
+    """
+    Create a dataset in h5py_group with the layout of get_dataset_layout.
+
+    :param h5py_group: the h5py group (or file) to create the dataset in
+    :param name: name of the dataset
+    :param shape: shape of the dataset, defaults to the shape of data
+    :param dtype: dtype of the dataset, defaults to the dtype of data
+    :param data: optional data to fill the dataset with
+    :param compression: see get_dataset_layout
+    :return: the h5py dataset
+    """
+    if data is not None:
+        data = np.asarray(data)
+        if shape is None:
+            shape = data.shape
+        if dtype is None:
+            dtype = data.dtype
+    if dtype is None:
+        dtype = "f4"
+
+    return h5py_group.create_dataset(
+        name,
+        shape=shape,
+        dtype=dtype,
+        data=data,
+        **get_dataset_layout(shape, dtype, compression),
+    )
+
+
 def _get_storage_area(storage_area):
     """
 
@@ -27,7 +27,11 @@ try:
 except ImportError:
     shapely = None
 
-from threedigrid.numpy_utils import select_lines_by_bbox
+from threedigrid.numpy_utils import (
+    flatten_ragged_coords,
+    select_lines_by_bbox,
+    split_ragged_coords,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +79,21 @@ def transform_xys(x_array, y_array, source_epsg, target_epsg):
     return np.array(reprojected)
 
 
+def transform_ragged_coords(geometries, source_epsg, target_epsg):
+    """
+    Transform ragged geometries (like line_geometries) from source_epsg to
+    target_epsg with a single transformer call.
+
+    :param geometries: sequence (or object array) with per geometry a flat
+        coordinate array [x1, x2, ..., y1, y2, ...]
+    :return: object array with the transformed geometries in the same layout
+    """
+    x, y, offsets = flatten_ragged_coords(geometries)
+    if x.size:
+        x, y = get_transformer(source_epsg, target_epsg).transform(x, y)
+    return split_ragged_coords(x, y, offsets)
+
+
 def get_spatial_reference(epsg_code):
     """
     :param epsg_code: Spatial Reference System Identifier (SRID)
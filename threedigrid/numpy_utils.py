@@ -11,6 +11,9 @@ BBOX_TOP = 1
 BBOX_RIGHT = 2
 BBOX_BOTTOM = 3
 
+# Number of pixels rasterize_boxes burns at once
+RASTERIZE_BLOCK_SIZE = 2**20
+
 
 def angle_in_degrees(x0, y0, x1, y1):
     """
@@ -309,3 +312,381 @@ def get_smallest_uint_dtype(maxval):
         if maxval <= np.iinfo(dt).max:
             return dt
     raise ValueError("Value of %s exceeds all possible maximum dtype values." % maxval)
+
+
+def _iter_box_lattices(i0, j0, w, h, index):
+    """
+    Group boxes on their lattice: boxes of the same size whose corners have
+    the same remainder (for instance all cells of one refinement level).
+
+    :param i0, j0, w, h: int arrays with the lower corner and size of boxes
+    :param index: the indexes of the boxes to group
+
+    :yield: box_index, size_i, size_j, origin_i, origin_j and the coarse
+        array with per lattice position the (largest) box index, or -1
+    """
+    lattices = np.stack(
+        [w[index], h[index], i0[index] % w[index], j0[index] % h[index]]
+    )
+    order = np.lexsort(lattices)
+    lattices = lattices[:, order]
+    index = index[order]
+    starts = np.flatnonzero(
+        np.concatenate([[True], np.any(lattices[:, 1:] != lattices[:, :-1], axis=0)])
+    )
+    ends = np.append(starts[1:], index.size)
+
+    for start, end in zip(starts, ends):
+        box_index = index[start:end]
+        size_i, size_j = w[box_index[0]], h[box_index[0]]
+        m = i0[box_index] // size_i
+        n = j0[box_index] // size_j
+        coarse = np.full((n.max() - n.min() + 1, m.max() - m.min() + 1), -1)
+        np.maximum.at(coarse, (n - n.min(), m - m.min()), box_index)
+        # the pixel of the lower corner of coarse[0, 0]
+        origin_i = m.min() * size_i + i0[box_index[0]] % size_i
+        origin_j = n.min() * size_j + j0[box_index[0]] % size_j
+        yield box_index, size_i, size_j, origin_i, origin_j, coarse
+
+
+def rasterize_boxes(boxes, values, shape, offset=(0, 0), out=None):
+    """
+    Burn axis-aligned boxes (like cells) into a 2D array.
+
+    Boxes of the same size whose corners are on the same regular lattice
+    (for instance all cells of one refinement level) are burned at once, by
+    filling a coarse array with one element per box and expanding it to
+    pixels. Where boxes overlap the value of the last box wins.
+
+    :param boxes: (4, n) array with per box the pixel bounds i0, j0, i1, j1,
+        with i along the columns, j along the rows and i1, j1 exclusive
+    :param values: n values to burn
+    :param shape: (height, width) of the result
+    :param offset: (i, j) pixel of the first element of the result
+    :param out: optional array of the given shape to write the result into,
+        it is reset to 0 first
+
+    :return: array with the values, 0 where no box covers a pixel
+    """
+    values = np.asarray(values)
+    height, width = shape
+    if out is None:
+        out = np.zeros(shape, dtype=values.dtype)
+    else:
+        out[...] = 0
+
+    i0, j0, i1, j1 = (np.asarray(x, dtype=np.int64) for x in boxes[:4])
+    w = i1 - i0
+    h = j1 - j0
+    offset_i, offset_j = offset
+    in_window = (
+        (w > 0)
+        & (h > 0)
+        & (i1 > offset_i)
+        & (i0 < offset_i + width)
+        & (j1 > offset_j)
+        & (j0 < offset_j + height)
+    )
+    index = np.flatnonzero(in_window)
+    if index.size == 0:
+        return out
+
+    columns = np.arange(offset_i, offset_i + width)
+    rows = np.arange(offset_j, offset_j + height)
+    lattices = []
+    for _, size_i, size_j, origin_i, origin_j, coarse in _iter_box_lattices(
+        i0, j0, w, h, index
+    ):
+        column_m = (columns - origin_i) // size_i
+        valid_columns = np.flatnonzero((column_m >= 0) & (column_m < coarse.shape[1]))
+        if valid_columns.size == 0:
+            continue
+        column_slice = slice(valid_columns[0], valid_columns[-1] + 1)
+        row_n = (rows - origin_j) // size_j
+        lattices.append((coarse, row_n, column_slice, column_m[column_slice]))
+
+    # Burn the boxes in blocks of rows, so the temporary arrays are bounded
+    # by RASTERIZE_BLOCK_SIZE pixels instead of the size of the result
+    block_height = max(1, RASTERIZE_BLOCK_SIZE // max(width, 1))
+    for block_start in range(0, height, block_height):
+        block = slice(block_start, min(block_start + block_height, height))
+        # per pixel the index of the last box covering it
+        last = None
+        for coarse, row_n, column_slice, column_m in lattices:
+            block_n = row_n[block]
+            valid_rows = np.flatnonzero((block_n >= 0) & (block_n < coarse.shape[0]))
+            if valid_rows.size == 0:
+                continue
+            if last is None:
+                last = np.full((block_n.size, width), -1, dtype=np.int64)
+            row_slice = slice(valid_rows[0], valid_rows[-1] + 1)
+            window = last[row_slice, column_slice]
+            np.maximum(
+                window, coarse[block_n[row_slice, None], column_m[None, :]], out=window
+            )
+        if last is None:
+            continue
+        covered = last >= 0
+        out[block][covered] = values[last[covered]]
+    return out
+
+
+def get_boxes_at_points(boxes, i, j):
+    """
+    Find the box (like a cell) containing each point, with one lookup per
+    lattice of boxes instead of a scan over all boxes per point.
+
+    Boxes include their lower bounds: a point on the edge between two boxes
+    is in the box with the larger i (or j). Points on the upper edge of a
+    box without a neighbour are in that box.
+
+    :param boxes: (4, n) int array with per box the pixel bounds i0, j0,
+        i1, j1 (i1, j1 exclusive)
+    :param i: the (float) i coordinates of the points in pixels
+    :param j: the (float) j coordinates of the points in pixels
+
+    :return: per point the index of the box containing it, -1 if none
+    """
+    i = np.asarray(i, dtype=np.float64)
+    j = np.asarray(j, dtype=np.float64)
+    result = np.full(i.shape, -1, dtype=np.int64)
+
+    i0, j0, i1, j1 = (np.asarray(x, dtype=np.int64) for x in boxes[:4])
+    w = i1 - i0
+    h = j1 - j0
+    index = np.flatnonzero((w > 0) & (h > 0))
+    if index.size == 0 or i.size == 0:
+        return result
+
+    lattices = list(_iter_box_lattices(i0, j0, w, h, index))
+    # first look up the points with lower bounds included, then retry the
+    # points not found yet with the upper bounds of i and/or j included
+    for upper_i, upper_j in (
+        (False, False),
+        (True, False),
+        (False, True),
+        (True, True),
+    ):
+        for _, size_i, size_j, origin_i, origin_j, coarse in lattices:
+            todo = np.flatnonzero(result == -1)
+            if todo.size == 0:
+                return result
+            u = (i[todo] - origin_i) / size_i
+            v = (j[todo] - origin_j) / size_j
+            m = (np.ceil(u) - 1 if upper_i else np.floor(u)).astype(np.int64)
+            n = (np.ceil(v) - 1 if upper_j else np.floor(v)).astype(np.int64)
+            inside = (m >= 0) & (m < coarse.shape[1]) & (n >= 0) & (n < coarse.shape[0])
+            result[todo[inside]] = coarse[n[inside], m[inside]]
+
+    return result
+
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+
+
+def flatten_ragged_coords(geometries):
+    """
+    Flatten ragged geometries (like line_geometries) into one coordinate
+    buffer with offsets.
+
+    :param geometries: sequence (or object array) with per geometry a flat
+        coordinate array [x1, x2, ..., y1, y2, ...]
+
+    :return: x, y, offsets: the coordinates of geometry i are
+        x[offsets[i]:offsets[i + 1]] and y[offsets[i]:offsets[i + 1]]
+
+    Example:
+    >>> flatten_ragged_coords([np.array([0., 1., 5., 6.]), np.array([2., 7.])])
+    (array([0., 1., 2.]), array([5., 6., 7.]), array([0, 2, 3]))
+    """
+    sizes = np.fromiter(map(len, geometries), dtype=np.int64, count=len(geometries))
+    sizes //= 2
+    offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.array([], dtype=np.float64), np.array([], np.float64), offsets
+
+    flat = np.concatenate(list(geometries)).astype(np.float64, copy=False)
+    # Per geometry the flat array holds all x values followed by all y values
+    x_index = np.arange(offsets[-1]) + np.repeat(offsets[:-1], sizes)
+    return flat[x_index], flat[x_index + np.repeat(sizes, sizes)], offsets
+
+
+def split_ragged_coords(x, y, offsets):
+    """
+    Inverse of ``flatten_ragged_coords``: split one coordinate buffer back into
+    ragged geometries.
+
+    :param x, y: the coordinates of all geometries after each other
+    :param offsets: the coordinates of geometry i are
+        x[offsets[i]:offsets[i + 1]] and y[offsets[i]:offsets[i + 1]]
+
+    :return: object array with per geometry a flat coordinate array
+        [x1, x2, ..., y1, y2, ...]. The arrays are views on one buffer.
+
+    Example:
+    >>> split_ragged_coords(np.array([0., 1., 2.]), np.array([5., 6., 7.]), [0, 2, 3])
+    array([array([0., 1., 5., 6.]), array([2., 7.])], dtype=object)
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    sizes = np.diff(offsets)
+    flat = np.empty(2 * offsets[-1], dtype=np.result_type(x, y))
+    x_index = np.arange(offsets[-1]) + np.repeat(offsets[:-1], sizes)
+    flat[x_index] = x
+    flat[x_index + np.repeat(sizes, sizes)] = y
+
+    bounds = (2 * offsets).tolist()
+    result = np.empty(sizes.size, dtype=object)
+    # Assign one by one: numpy would turn equally sized arrays into a 2D array
+    for i, view in enumerate(map(flat.__getitem__, map(slice, bounds, bounds[1:]))):
+        result[i] = view
+    return result
+
+
+def _to_wkb_array(header, x, y, offsets):
+    """
+    Combine a (structured) header per geometry and the coordinates of the
+    geometries into an object array with a WKB bytes object per geometry.
+
+    :param header: structured array (without padding) holding the WKB
+        header of each geometry.
+    :param x, y, offsets: the coordinates of geometry i are
+        x[offsets[i]:offsets[i + 1]] and y[offsets[i]:offsets[i + 1]]
+    """
+    header_size = header.dtype.itemsize
+    sizes = np.diff(offsets)
+
+    coords = np.empty((x.size, 2), dtype="<f8")
+    coords[:, 0] = x
+    coords[:, 1] = y
+
+    # Insert the header bytes before the coordinate bytes of every geometry
+    buffer = np.insert(
+        coords.view(np.uint8).ravel(),
+        np.repeat(16 * offsets[:-1], header_size),
+        header.view(np.uint8).ravel(),
+    )
+
+    byte_offsets = np.zeros(sizes.size + 1, dtype=np.int64)
+    np.cumsum(header_size + 16 * sizes, out=byte_offsets[1:])
+
+    data = buffer.tobytes()
+    result = np.empty(sizes.size, dtype=object)
+    result[:] = [
+        data[start:end]
+        for start, end in zip(byte_offsets[:-1].tolist(), byte_offsets[1:].tolist())
+    ]
+    return result
+
+
+def _wkb_header(count, geometry_type, *counts):
+    """
+    Returns a little endian WKB header (byte order, geometry type and the
+    optional ring/point counts) for ``count`` geometries.
+    """
+    dtype = [("byte_order", "u1"), ("geometry_type", "<u4")]
+    dtype += [("count_{}".format(i), "<u4") for i in range(len(counts))]
+    header = np.empty(count, dtype=dtype)
+    header["byte_order"] = 1  # little endian
+    header["geometry_type"] = geometry_type
+    for i, value in enumerate(counts):
+        header["count_{}".format(i)] = value
+    return header
+
+
+def points_to_wkb_array(points):
+    """
+    Encode points as WKB
+
+    :param points: np.array [[x1, x2, x3...], [y1, y2, y3...]]
+    :return: object array with the WKB (bytes) of every point
+
+    Example:
+    >>> points_to_wkb_array(np.array([[1.0], [2.0]]))[0].hex()
+    '0101000000000000000000f03f0000000000000040'
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(2, -1)
+    count = points.shape[1]
+    return _to_wkb_array(
+        _wkb_header(count, WKB_POINT),
+        points[0],
+        points[1],
+        np.arange(count + 1),
+    )
+
+
+def lines_to_wkb_array(lines):
+    """
+    Encode 2-point lines as WKB LineStrings
+
+    :param lines: np.array
+                x1_array=lines[0], y1_array=lines[1],
+                x2_array=lines[2], y2_array=lines[3]
+    :return: object array with the WKB (bytes) of every line
+    """
+    lines = np.asarray(lines, dtype=np.float64).reshape(4, -1)
+    count = lines.shape[1]
+    return _to_wkb_array(
+        _wkb_header(count, WKB_LINESTRING, 2),
+        np.stack((lines[0], lines[2]), axis=1).ravel(),
+        np.stack((lines[1], lines[3]), axis=1).ravel(),
+        np.arange(0, 2 * count + 1, 2),
+    )
+
+
+def bboxes_to_wkb_array(bboxes):
+    """
+    Encode bboxes as WKB Polygons with the (closed) ring:
+    (x1, y1), (x2, y1), (x2, y2), (x1, y2), (x1, y1)
+
+    :param bboxes: np.array
+                x1_array=bboxes[0], y1_array=bboxes[1],
+                x2_array=bboxes[2], y2_array=bboxes[3]
+    :return: object array with the WKB (bytes) of every bbox
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(4, -1)
+    count = bboxes.shape[1]
+    x1, y1, x2, y2 = bboxes
+    return _to_wkb_array(
+        _wkb_header(count, WKB_POLYGON, 1, 5),
+        np.stack((x1, x2, x2, x1, x1), axis=1).ravel(),
+        np.stack((y1, y1, y2, y2, y1), axis=1).ravel(),
+        np.arange(0, 5 * count + 1, 5),
+    )
+
+
+def multilines_to_wkb_array(geometries):
+    """
+    Encode ragged line geometries (like line_geometries) as WKB LineStrings
+
+    :param geometries: sequence (or object array) with per geometry a flat
+        coordinate array [x1, x2, ..., y1, y2, ...]
+    :return: object array with the WKB (bytes) of every geometry
+    """
+    x, y, offsets = flatten_ragged_coords(geometries)
+    return _to_wkb_array(
+        _wkb_header(offsets.size - 1, WKB_LINESTRING, np.diff(offsets)),
+        x,
+        y,
+        offsets,
+    )
+
+
+def polygons_to_wkb_array(geometries):
+    """
+    Encode ragged polygon geometries (like cell_geometries) as WKB Polygons
+    with a single ring.
+
+    :param geometries: sequence (or object array) with per geometry a flat
+        coordinate array [x1, x2, ..., y1, y2, ...] of the ring
+    :return: object array with the WKB (bytes) of every geometry
+    """
+    x, y, offsets = flatten_ragged_coords(geometries)
+    return _to_wkb_array(
+        _wkb_header(offsets.size - 1, WKB_POLYGON, 1, np.diff(offsets)),
+        x,
+        y,
+        offsets,
+    )
@@ -73,6 +73,29 @@ class BaseOgrExporter(BaseExporterObject):
             raise DriverNotSupportedError("Requires GDAL >= 2.0(dev)")
         self.driver = ogr.GetDriverByName(str(driver_name))
 
+    @staticmethod
+    def iter_data(data_source, model, data, chunk_size=None):
+        """
+        Yield the data to export. If chunk_size is given the (filtered)
+        model is read in chunks of chunk_size elements, every chunk is
+        written in its own transaction (if the data source supports it).
+
+        :param data_source: the ogr data source to write to
+        :param model: the model instance to export
+        :param data: dict of the model data, used if chunk_size is None
+        """
+        if chunk_size is None:
+            yield data
+            return
+
+        transactions = data_source.TestCapability(ogr.ODsCTransactions)
+        for chunk in model.iter_chunks(chunk_size):
+            if transactions:
+                data_source.StartTransaction()
+            yield chunk.data
+            if transactions:
+                data_source.CommitTransaction()
+
     @property
     def driver_name(self):
         if self.driver:
@@ -187,6 +187,24 @@ class SliceFilter(BaseFilter):
         return {"slice": [self._slice.start, self._slice.stop, self._slice.step]}
 
 
+class IndexFilter(BaseFilter):
+    """
+    Index filter, selects the elements at the given (sorted) indexes
+    """
+
+    def __init__(self, indexes):
+        self._indexes = indexes
+
+    def filter(self, nparray_dict):
+        return self._indexes
+
+    def get_field_name(self):
+        return None
+
+    def __repr__(self):
+        return "IndexFilter({})".format(self._indexes)
+
+
 FILTER_MAP = {
     "eq": EqualsFilter,
     "ne": NotEqualsFilter,
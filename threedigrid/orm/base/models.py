@@ -16,7 +16,7 @@ from threedigrid.orm.base.fields import (
     TimeSeriesArrayField,
     TimeSeriesCompositeArrayField,
 )
-from threedigrid.orm.base.filters import get_filter, SliceFilter
+from threedigrid.orm.base.filters import get_filter, IndexFilter, SliceFilter
 from threedigrid.orm.base.options import Options
 
 logger = logging.getLogger(__name__)
@@ -38,6 +38,18 @@ def pairwise(iterable):
     return zip(a, b)
 
 
+def _column_to_list(value):
+    """
+    Convert a column to a list with one python object per element.
+
+    One dimensional columns give python scalars, multi-dimensional
+    columns (e.g. x, y coordinates) give a tuple per element.
+    """
+    if value.ndim > 1:
+        return list(zip(*value.tolist()))
+    return value.tolist()
+
+
 class Model(metaclass=ABCMeta):
     id = IndexArrayField()
 
@@ -354,6 +366,49 @@ class Model(metaclass=ABCMeta):
 
         return self.__init_class(self.__class__, **new_class_kwargs)
 
+    def iter_chunks(self, chunk_size):
+        """
+        Iterate over the (filtered) elements in chunks of at most
+        ``chunk_size`` elements. Every chunk is a new instance that only
+        reads the index range of its elements from the datasource, which
+        keeps the memory usage bounded for very large models.
+
+        Usage::
+
+            for chunk in cells.filter(node_type__in=[1, 2]).iter_chunks(10000):
+                chunk.data
+        """
+        indexes = self._get_indexes()
+        for start in range(0, len(indexes), chunk_size):
+            yield self._select_indexes(indexes[start : start + chunk_size])
+
+    def _get_indexes(self):
+        """
+        :return: the datasource indexes of the (filtered) elements, as range
+            or sorted array
+        """
+        mask = self.boolean_mask_filter
+        if isinstance(mask, slice):
+            size = self.get_field_value("id").shape[-1]
+            return range(size)[mask]
+        elif mask.dtype == bool:
+            return np.flatnonzero(mask)
+        return mask
+
+    def _select_indexes(self, indexes):
+        """
+        :param indexes: sorted datasource indexes (range or array)
+        :return: a new instance with only the elements at indexes
+        """
+        if isinstance(indexes, range) and indexes.step == 1:
+            slice_filter = SliceFilter(slice(indexes.start, indexes.stop))
+        else:
+            slice_filter = IndexFilter(np.asarray(indexes))
+
+        new_class_kwargs = dict(self.class_kwargs)
+        new_class_kwargs.update({"slice_filters": [slice_filter]})
+        return self.__init_class(self.__class__, **new_class_kwargs)
+
     @property
     def known_subset(self):
         if not hasattr(self, "SUBSETS"):
@@ -447,13 +502,29 @@ class Model(metaclass=ABCMeta):
         """
         return self._datasource.execute_query(self)
 
-    def to_structured_array(self):
-        """
+    def to_structured_array(self, as_records=False, file_name=None):
+        """
+        :param as_records: return a structured array with one record per
+            element instead of a single record holding all columns.
+            Geometry fields are expanded into a column per coordinate
+            (e.g. ``coordinates_x``, ``coordinates_y``), other
+            multi-dimensional fields (like timeseries) become subarray
+            columns. Values that are not stored per element, like the
+            timestamps, are left out.
+        :param file_name: (only with ``as_records``) write the records to
+            a ``.npy`` file and return them memory-mapped, other processes
+            can share them with ``np.load(file_name, mmap_mode="r")``
         :return: the filtered values as a
         structured (named) array
         """
         selection = self.to_dict()
 
+        if as_records:
+            return self._to_record_array(selection, file_name=file_name)
+
+        if file_name is not None:
+            raise ValueError("file_name is only supported with as_records=True")
+
         # Convert the dictionary to structured array
         dtypes = []
         for key, value in selection.items():
@@ -461,40 +532,88 @@ class Model(metaclass=ABCMeta):
 
         return np.array([tuple(selection[x[0]] for x in dtypes)], dtype=dtypes)[0]
 
+    def _to_record_array(self, selection, file_name=None):
+        """
+        Write the columns in selection into a preallocated (optionally
+        memory-mapped) structured array with one record per element.
+        """
+        columns = []
+        for name, value in selection.items():
+            if name not in self._field_names:
+                continue
+            component_names = getattr(self._get_field(name), "component_names", None)
+            if component_names and value.shape[:-1] == (len(component_names),):
+                for component_name, component in zip(component_names, value):
+                    columns.append(("{}_{}".format(name, component_name), component))
+            else:
+                columns.append((name, value))
+
+        sizes = {value.shape[-1] for _, value in columns if value.size}
+        if len(sizes) > 1:
+            raise ValueError(
+                "Fields have different number of elements: {}".format(sizes)
+            )
+        if sizes:
+            size = sizes.pop()
+            # Leave out fields without values, like fields missing in the file.
+            # An empty selection keeps all columns, so the dtype is complete.
+            columns = [(name, value) for name, value in columns if value.size]
+        else:
+            size = 0
+        shape = (size,)
+        dtype = [(name, value.dtype, value.shape[:-1]) for name, value in columns]
+
+        if file_name is not None:
+            records = np.lib.format.open_memmap(
+                file_name, mode="w+", dtype=dtype, shape=shape
+            )
+        else:
+            records = np.empty(shape, dtype=dtype)
+
+        for name, value in columns:
+            # Elements are on the last axis of the columns
+            records[name] = np.moveaxis(value, -1, 0)
+
+        if file_name is not None:
+            records.flush()
+        return records
+
     def to_list(self):
         """
         :return: list of dicts with key's and values
         """
+        return list(self.iter_records())
+
+    def iter_records(self, chunk_size=10000):
+        """
+        Lazily iterate over the (filtered) elements, yielding one dict
+        per element. Multi-dimensional fields (like coordinates or
+        timeseries) are yielded as tuples.
+
+        The values are converted to python objects per chunk of
+        ``chunk_size`` elements, so the full selection is never converted
+        to python objects at once.
+
+        Usage::
 
-        # Filter results and transform the result to
-        # and np.ndarray
+            for record in line_instance.only('id', 'kcu').iter_records():
+                record['kcu']
+        """
         selection = self.to_dict()
-        if len(list(selection.values())) > 1:
-            array = np.array(list(selection.values()))
-        else:
-            array = list(selection.values())[0]
-
-        def optional_zip(array_to_zip):
-            """
-            Optional zip the results of
-            array_to_zip if there are more than one
-            dimensions.
-            """
-            # Transform data to list
-            array_as_list = array_to_zip.tolist()
-            if len(array_to_zip.shape) > 1:
-                # Zip the list if there are more than
-                # one dimensions.
-                array_as_list = zip(*array_as_list)
-            return array_as_list
-
-        # Zip the lists of array_lists (does same as a transpose)
-        data = zip(*[optional_zip(x) for x in array])
-
-        # Create a list of dictionairies of the data by
-        # zipping the selection.keys() (= field_names) for all items
-        # in data
-        return [dict(zip(list(selection.keys()), x)) for x in data]
+        keys = list(selection.keys())
+        if not keys:
+            return
+
+        # The last axis holds the elements, stop at the shortest field
+        size = min(value.shape[-1] if value.ndim else 0 for value in selection.values())
+
+        for start in range(0, size, chunk_size):
+            columns = [
+                _column_to_list(value[..., start : start + chunk_size])
+                for value in selection.values()
+            ]
+            for row in zip(*columns):
+                yield dict(zip(keys, row))
 
     @property
     def boolean_mask_filter(self):
@@ -1,5 +1,7 @@
 # (c) Nelen & Schuurmans.  GPL licensed, see LICENSE.rst.
 
+from collections import OrderedDict
+
 import numpy as np
 
 # optional install results
@@ -9,6 +11,7 @@ except ImportError:
     pass
 
 
+from threedigrid.admin.constants import DEFAULT_CHUNK_TIMESERIES
 from threedigrid.orm.base.fields import (
     TimeSeriesArrayField,
     TimeSeriesCompositeArrayField,
@@ -16,6 +19,16 @@ from threedigrid.orm.base.fields import (
 )
 from threedigrid.orm.base.utils import _flatten_dict_values
 
+# ufuncs used to reduce the time axis per statistic in
+# ResultMixin.get_timeseries_stats, "mean" is the sum divided by
+# the number of timesteps
+TIMESERIES_STATS_UFUNCS = {
+    "min": np.minimum,
+    "max": np.maximum,
+    "sum": np.add,
+    "mean": np.add,
+}
+
 
 class ResultMixin:
     """
@@ -260,6 +273,105 @@ class ResultMixin:
             return self.timeseries_mask
         return self.class_kwargs.get("timeseries_chunk_size")
 
+    def get_timeseries_stats(self, stats, chunk_size=None):
+        """
+        Reduce timeseries fields over the time axis in a single streaming
+        pass, reading at most chunk_size timesteps at once.
+
+        The (timeseries) filter of the model instance is respected, without
+        a timeseries filter the whole time axis is used.
+
+        Example usage::
+
+            >>> gr.nodes.filter(node_type__in=[1, 2]).get_timeseries_stats(
+            ...     {"s1_max": ("s1", "max"), "vol_mean": ("vol", "mean")}
+            ... )
+            OrderedDict([('s1_max', array([...])), ('vol_mean', array([...]))])
+
+        :param stats: dict with {name: (field_name, statistic)}, statistic
+            is one of min, max, sum or mean
+        :param chunk_size: the number of timesteps to read at once, defaults
+            to the timeseries chunk size of the result admin
+        :return: OrderedDict with for every name an array with a value
+            per element
+        """
+        for name, (field_name, stat) in stats.items():
+            if stat not in TIMESERIES_STATS_UFUNCS:
+                raise ValueError(
+                    "Unknown statistic {} for {}, choose from {}".format(
+                        stat, name, ", ".join(TIMESERIES_STATS_UFUNCS)
+                    )
+                )
+            if field_name not in self._field_names:
+                raise ValueError("Unknown field name: {}".format(field_name))
+
+        if chunk_size is None:
+            chunk_size = self.class_kwargs.get(
+                "timeseries_chunk_size", DEFAULT_CHUNK_TIMESERIES
+            ).stop
+
+        result = {}
+        # Group the statistics per field, every field is read once
+        for field_name in dict.fromkeys(x for x, _ in stats.values()):
+            field_stats = [
+                (name, stat)
+                for name, (_field_name, stat) in stats.items()
+                if _field_name == field_name
+            ]
+            indexes = self._get_time_indexes(field_name)
+            if indexes.size == 0:
+                raise ValueError("No timesteps selected for {}".format(field_name))
+
+            for start in range(0, indexes.size, chunk_size):
+                values = getattr(
+                    self._get_timeseries_chunk(indexes[start : start + chunk_size]),
+                    field_name,
+                ).astype(np.float64)
+                for name, stat in field_stats:
+                    ufunc = TIMESERIES_STATS_UFUNCS[stat]
+                    reduced = ufunc.reduce(values, axis=0)
+                    if name in result:
+                        reduced = ufunc(result[name], reduced)
+                    result[name] = reduced
+
+            for name, stat in field_stats:
+                if stat == "mean":
+                    result[name] = result[name] / indexes.size
+
+        return OrderedDict((name, result[name]) for name in stats)
+
+    def _get_time_indexes(self, field_name):
+        """
+        :return: the indexes on the time axis selected by the timeseries
+                 filter, all indexes if no timeseries filter is set
+        """
+        indexes = np.arange(self._datasource["time"][:].size)
+        if self.timeseries_filter is None:
+            return indexes
+        return indexes[self.get_timeseries_mask_filter()]
+
+    def _get_timeseries_chunk(self, indexes):
+        """
+        :return: a new instance filtered on the (sorted) time indexes
+        """
+        if indexes[-1] - indexes[0] + 1 == indexes.size:
+            indexes = slice(indexes[0], indexes[-1] + 1)
+        else:
+            indexes = indexes.tolist()
+
+        new_class_kwargs = dict(self.class_kwargs)
+        new_class_kwargs.update(
+            {
+                "timeseries_filter": {
+                    "start_time": None,
+                    "end_time": None,
+                    "indexes": indexes,
+                },
+                "timeseries_sample": None,
+            }
+        )
+        return self.__class__(datasource=self._datasource, **new_class_kwargs)
+
     @property
     def timestamps(self):
         """
@@ -342,6 +454,17 @@ class AggregateResultMixin(ResultMixin):
             return self.timeseries_mask
         return None
 
+    def _get_time_indexes(self, field_name):
+        """
+        :return: the indexes on the time axis of field_name selected by
+                 the timeseries filter, all indexes if no timeseries
+                 filter is set
+        """
+        indexes = np.arange(self._datasource["time_" + field_name][:].size)
+        if self.timeseries_filter is None:
+            return indexes
+        return indexes[self.get_timeseries_mask_filter()[field_name]]
+
     def timeseries(self, start_time=None, end_time=None, indexes=None):
         """
         Allows filtering on timeseries.
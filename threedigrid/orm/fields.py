@@ -3,18 +3,17 @@
 import numpy as np
 
 from threedigrid.geo_utils import (
-    get_transformer,
     raise_import_exception,
     select_geoms_by_geometry,
     select_lines_by_tile,
     select_points_by_bbox,
     select_points_by_tile,
+    transform_ragged_coords,
     transform_xys,
 )
 from threedigrid.numpy_utils import (
     angle_in_degrees,
     get_bbox_by_point,
-    reshape_flat_array,
     select_lines_by_bbox,
 )
 
@@ -61,6 +60,7 @@ class GeomArrayField(ArrayField):
 
 class PointArrayField(GeomArrayField):
     type = "point"
+    component_names = ("x", "y")
 
     def reproject(self, values, source_epsg, target_epsg):
         """
@@ -112,6 +112,7 @@ class PointArrayField(GeomArrayField):
 
 class LineArrayField(GeomArrayField):
     type = "line"
+    component_names = ("x1", "y1", "x2", "y2")
 
     """
     Field which handles line/bbox geoms values:
@@ -200,19 +201,10 @@ class MultiLineArrayField(GeomArrayField):
 
     def reproject(self, values, source_epsg, target_epsg):
         """
-        Reproject the line/bbox coordinates:
-            x1_array=values[0], y1_array=values[1],
-            x2_array=values[2], y2_array=values[3]
-        from source_epsg to target_epsg.
+        Reproject the line geometries, per line a flat coordinate array
+        [x1, x2, ..., y1, y2, ...], from source_epsg to target_epsg.
         """
-        reshaped_values = list(map(reshape_flat_array, values))
-
-        transformer = get_transformer(source_epsg, target_epsg)
-        transform_values = [
-            np.array(transformer.transform(x[0], x[1])).flatten()
-            for x in reshaped_values
-        ]
-        return np.array(transform_values, dtype=object)
+        return transform_ragged_coords(values, source_epsg, target_epsg)
 
     def _to_shapely_geom(self, values):
         if shapely is None:
@@ -249,7 +241,12 @@ class PolygonArrayField(GeomArrayField):
             x1_array=values[0], y1_array=values[1],
             x2_array=values[2], y2_array=values[3],
         from source_epsg to target_epsg.
+
+        Ragged polygons (an object array with per polygon a flat coordinate
+        array [x1, x2, ..., y1, y2, ...]) are reprojected as a whole.
         """
+        if values.dtype == object:
+            return transform_ragged_coords(values, source_epsg, target_epsg)
         return np.vstack(
             (
                 np.array(transform_xys(values[0], values[1], source_epsg, target_epsg)),
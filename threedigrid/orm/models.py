@@ -92,8 +92,17 @@ class Model(BaseModel):
         layer_name=None,
         field_definitions=None,
         progress_func=None,
+        chunk_size=None,
+        stats=None,
         **kwargs,
     ):
+        """
+        Export the (filtered) model to a geopackage layer
+
+        :param stats: (result models only) dict with timeseries statistics
+            to add as columns, {name: (field_name, statistic)}, e.g.
+            {"s1_max": ("s1", "max")}. See ``get_timeseries_stats``.
+        """
         # By default use class name in lowercase as layer_name
         if layer_name is None:
             layer_name = self.__class__.__name__.lower()
@@ -103,12 +112,22 @@ class Model(BaseModel):
         if field_definitions is None:
             field_definitions = self.gpkg_field_map
 
+        stats_values = None
+        if stats:
+            if not hasattr(self, "get_timeseries_stats"):
+                raise AttributeError(
+                    "Instance {} has no timeseries to compute stats for".format(self)
+                )
+            stats_values = self.get_timeseries_stats(stats)
+
         exporter = GpkgExporter(self)
         exporter.save(
             file_name,
             layer_name=layer_name,
             field_definitions=field_definitions,
             progress_func=progress_func,
+            chunk_size=chunk_size,
+            stats=stats_values,
             **kwargs,
         )
 
@@ -124,8 +143,13 @@ class Model(BaseModel):
 
             indent = kwargs.get("indent", None)
             coupled_model = kwargs.get("coupled_model", None)
+            chunk_size = kwargs.get("chunk_size", None)
             serializer = GeoJsonSerializer(
-                fields=fields, model=self, indent=indent, coupled_model=coupled_model
+                fields=fields,
+                model=self,
+                indent=indent,
+                coupled_model=coupled_model,
+                chunk_size=chunk_size,
             )
             serializer.save(file_name)
 
@@ -140,7 +164,9 @@ class Model(BaseModel):
         if self.reproject_to_epsg:
             epsg_code = self.reproject_to_epsg
 
-        exporter.save(file_name, self.data, epsg_code, **kwargs)
+        # With a chunk_size the exporter reads the data chunk by chunk
+        data = None if kwargs.get("chunk_size") else self.data
+        exporter.save(file_name, data, epsg_code, **kwargs)
 
     def _get_exporter(self, driver_name):
         for exporter in self._exporters: